@@ -0,0 +1,42 @@
+"""
+Remoção de Acentos - Analisador de Artigos v2.0
+Textos e colunas sem acentos, para comparar 'Análise' com 'analise'
+"""
+
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+
+def strip_accents(text):
+    """Texto decomposto (NFKD) sem as marcas combinantes"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=1)
+def _combining_marks():
+    """Regex com as mesmas marcas que unicodedata.combining reconhece"""
+    marks = ''.join(
+        chr(code) for code in range(sys.maxunicode + 1) if unicodedata.combining(chr(code))
+    )
+    return re.compile(f'[{re.escape(marks)}]')
+
+
+def strip_accents_series(values):
+    """
+    Coluna de textos sem acentos, como strip_accents valor a valor
+
+    Só os valores com caracteres fora do ASCII são decompostos.
+    """
+    values = pd.Series(values, dtype=object).astype(str)
+    accented = ~values.str.isascii()
+    if accented.any():
+        values = values.copy()
+        values[accented] = values[accented].str.normalize('NFKD').str.replace(
+            _combining_marks(), '', regex=True
+        )
+    return values
@@ -0,0 +1,522 @@
+"""
+Motor de Análise - Analisador de Artigos v2.0
+Leitura, validação e detecção de duplicados, independente da interface
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from checkpoint import load_checkpoint, read_appended_rows, save_checkpoint
+from columns import (
+    TITLE_KEYWORDS, find_identifier_columns, find_title_and_author_columns, is_academic_column
+)
+from dedupe import build_and_index_keys, build_keys, count_by_tier, dedupe_workers, extend_key_index
+from filters import FilterError
+from loaders import (
+    ENCODINGS, REFERENCE_PARSERS, LoadInfo, available_memory, iter_table_chunks, load_table,
+    read_csv_header
+)
+from bibliometrics import compute_statistics
+from mappings import load_mapping, save_mapping_quietly
+from profiler import infer_columns
+from store import LazyRows, ResultStore, RowTexts
+
+
+PROGRESS_CHUNK_ROWS = 20_000   # Linhas por bloco na prévia da análise com progresso
+PREVIEW_ROWS = 100_000         # Linhas do início do arquivo com resultados parciais
+PAGE_ROWS = 200                # Linhas exibidas antes do fim da análise
+
+
+class AnalysisError(Exception):
+    """Falha de análise com título e mensagem prontos para o usuário"""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+def format_rows(df, title_col, author_col=None, missing_author=None):
+    """Formata as linhas como 'título — autor'"""
+    titles = df[title_col].astype(str).str.strip()
+    if not author_col:
+        return titles.tolist()
+
+    authors = df[author_col]
+    if missing_author is not None:
+        authors = authors.fillna(missing_author)
+    present = authors.notna()
+    formatted = titles.where(~present, titles + " — " + authors.astype(str).str.strip())
+    return formatted.tolist()
+
+
+class FormattedRows(LazyRows):
+    """
+    Lista 'título — autor' de uma tabela, formatada sob demanda
+
+    Guarda só as colunas de título e autor (sem cópia); as strings são
+    montadas por format_rows apenas para os itens, fatias ou blocos pedidos.
+    """
+
+    def __init__(self, df, title_col, author_col=None, positions=None, missing_author=None):
+        super().__init__(positions, missing_author)
+        self._frame = df[[col for col in (title_col, author_col) if col]]
+        self.title_col = title_col
+        self.author_col = author_col
+
+    def _length(self):
+        return len(self._frame)
+
+    def _format(self, rows):
+        block = self._frame.iloc[rows]
+        return format_rows(block, self.title_col, self.author_col, self.missing_author)
+
+
+class AnalysisResult:
+    """
+    Resultado de uma análise: dados, colunas detectadas e duplicados
+
+    texts e statistics aceitam os textos das linhas (RowTexts) e as
+    estatísticas já calculadas (de uma sessão salva ou de um estágio
+    memorizado). As listas exibidas e exportadas vêm de store(). untitled
+    guarda as linhas sem título, que ficam fora da detecção mas voltam na
+    tabela limpa (resolve).
+    """
+
+    def __init__(self, df, title_col, author_col, doi_col, isbn_col,
+                 keys, codes, uniques, counts, load_info=None, row_count=None,
+                 texts=None, statistics=None, untitled=None):
+        self.df = df
+        self.untitled = df.iloc[:0] if untitled is None else untitled
+        self.title_col = title_col
+        self.author_col = author_col
+        self.doi_col = doi_col
+        self.isbn_col = isbn_col
+        self.keys = keys
+        self.codes = codes
+        self.uniques = uniques
+        self.counts = counts
+        self.load_info = load_info
+        self.row_count = len(df) if row_count is None else row_count
+        self.duplicated = pd.Series(counts[codes] > 1, index=df.index)
+        self._texts = texts
+        self._statistics = statistics
+        self._store = None
+
+    @property
+    def total_count(self):
+        return len(self.df)
+
+    @property
+    def untitled_count(self):
+        """Linhas sem título, fora da detecção de duplicados"""
+        return len(self.untitled)
+
+    @property
+    def duplicate_count(self):
+        return int(self.duplicated.sum())
+
+    @property
+    def tiers(self):
+        """Duplicados encontrados por camada (doi, isbn, texto)"""
+        return count_by_tier(self.keys, self.duplicated)
+
+    @property
+    def has_statistics(self):
+        return self._statistics is not None
+
+    def statistics(self):
+        """Estatísticas bibliométricas, calculadas na primeira chamada e guardadas"""
+        if self._statistics is None:
+            self._statistics = compute_statistics(self.df, self.author_col)
+        return self._statistics
+
+    def texts(self):
+        """Títulos e autores de cada linha, montados na primeira chamada e guardados"""
+        if self._texts is None:
+            self._texts = RowTexts(self.df, self.title_col, self.author_col)
+        return self._texts
+
+    def store(self):
+        """Resultado compacto (ResultStore), montado na primeira chamada e guardado"""
+        if self._store is None:
+            self._store = ResultStore.from_result(self, self.texts())
+        return self._store
+
+    def all_titles(self):
+        """Lista completa, formatada sob demanda"""
+        return self.store().all_titles()
+
+    def duplicate_titles(self):
+        """Lista apenas dos registros duplicados, formatada sob demanda"""
+        return self.store().duplicate_titles()
+
+    def checkpoint_state(self, saved=(0, 0, 0)):
+        """
+        Estado para retomar a análise após acréscimos no arquivo
+
+        saved traz quantas linhas, linhas sem título e chaves distintas o
+        checkpoint já tem: só as seguintes vão na parte nova. As chaves por
+        linha não são guardadas; são refeitas a partir dos códigos.
+        """
+        rows, untitled, uniques = saved
+        return {
+            'row_count': self.row_count,
+            'columns': [col for col in self.df.columns],
+            'roles': (self.title_col, self.author_col, self.doi_col, self.isbn_col),
+            'counts': self.counts,
+            'part': {
+                'df': self.df.iloc[rows:],
+                'untitled': self.untitled.iloc[untitled:],
+                'codes': np.asarray(self.codes[rows:]),
+                'uniques': np.asarray(self.uniques[uniques:], dtype=object),
+            },
+        }
+
+
+class AnalysisProgress:
+    """Situação parcial de uma análise em blocos, para exibição progressiva"""
+
+    def __init__(self, title_col, author_col, page, page_duplicated, rows, duplicate_count):
+        self.title_col = title_col
+        self.author_col = author_col
+        self.page = page
+        self.page_duplicated = page_duplicated
+        self.rows = rows
+        self.duplicate_count = duplicate_count
+
+
+def is_valid_academic_content(df):
+    """Verifica se a tabela contém conteúdo acadêmico válido"""
+    if df.empty:
+        return False
+
+    if not any(is_academic_column(col) for col in df.columns):
+        return False
+
+    # Verifica se há dados válidos
+    for col in df.columns:
+        if any(keyword in str(col).lower() for keyword in TITLE_KEYWORDS):
+            sample_data = df[col].dropna().head(10)
+            if len(sample_data) > 0:
+                avg_length = sample_data.astype(str).str.len().mean()
+                if avg_length > 10:
+                    return True
+
+    return False
+
+
+def detect_columns(df):
+    """
+    Valida a tabela e detecta as colunas usadas na análise
+
+    Retorna (título, autor, doi, isbn); levanta AnalysisError se a tabela
+    não parece uma lista acadêmica ou não tem coluna de títulos. Quando os
+    nomes das colunas não bastam (arquivo sem cabeçalho, 'TI' e 'AU'), os
+    papéis vêm do perfil do conteúdo de uma amostra das linhas.
+
+    Um cabeçalho já visto usa o mapeamento salvo (mappings), sem repetir a
+    detecção. Nada é salvo aqui: leituras parciais (prévia, comparação)
+    também detectam; remember_columns salva depois da análise completa.
+    """
+    if not df.empty:
+        mapped = load_mapping(df.columns)
+        if mapped is not None:
+            return mapped
+    return _detect_roles(df)
+
+
+def remember_columns(columns, roles):
+    """
+    Salva os papéis de um layout novo ao fim de uma análise completa
+
+    Só papéis achados pelos nomes das colunas são salvos: um palpite do
+    perfil do conteúdo (arquivo sem cabeçalho, 'TI' e 'AU') não vira regra
+    para as próximas listas com o mesmo cabeçalho.
+    """
+    if tuple(roles) == _roles_from_names(columns):
+        save_mapping_quietly(columns, roles)
+
+
+def _roles_from_names(columns):
+    """Papéis (título, autor, doi, isbn) pelos nomes das colunas"""
+    title_col, author_col = find_title_and_author_columns(columns)
+    doi_col, isbn_col = find_identifier_columns(columns)
+    return title_col, author_col, doi_col, isbn_col
+
+
+def _detect_roles(df):
+    """Detecção pelos nomes das colunas e, se não bastarem, pelo conteúdo"""
+    if not is_valid_academic_content(df):
+        if not df.empty:
+            title_col, author_col, doi_col, isbn_col, _ = infer_columns(df)
+            if title_col is not None:
+                return title_col, author_col, doi_col, isbn_col
+        raise AnalysisError(
+            "Arquivo Inválido",
+            "O arquivo não parece conter uma lista válida de artigos ou livros acadêmicos.\n\n"
+            "Verifique se o arquivo possui colunas como 'title', 'autor', etc."
+        )
+
+    roles = _roles_from_names(df.columns)
+    if not roles[0]:
+        raise AnalysisError("Erro", "Não foi possível identificar uma coluna de títulos.")
+    return roles
+
+
+def no_match_error(row_filter):
+    """Erro de uma leitura em que nenhuma linha atendeu ao filtro"""
+    return AnalysisError(
+        "Filtro", f"Nenhum registro do arquivo atende ao filtro ({row_filter.describe()})."
+    )
+
+
+def read_table(file_path, sheet=None, row_filter=None, data=None, columns=None):
+    """
+    Carrega a tabela aplicando o filtro de leitura, com erros para o usuário
+
+    Filtro com coluna ausente no arquivo ou que exclui todas as linhas
+    levanta AnalysisError. columns restringe a leitura de um CSV.
+    """
+    try:
+        df, load_info = load_table(
+            file_path, sheet=sheet, data=data, row_filter=row_filter, columns=columns
+        )
+    except FilterError as e:
+        raise AnalysisError("Filtro", str(e))
+    if row_filter and df.empty and load_info.rows_read:
+        raise no_match_error(row_filter)
+    return df, load_info
+
+
+def read_mapped_table(file_path, sheet=None, row_filter=None, data=None):
+    """
+    Carrega a tabela lendo só as colunas mapeadas, quando o layout é conhecido
+
+    Para um CSV cujo cabeçalho já tem mapeamento salvo, lê apenas as
+    colunas de título, autor, DOI e ISBN (e as do filtro), sem converter
+    as demais (resumos, palavras-chave, referências). Retorna (tabela,
+    LoadInfo, papéis); em layouts novos e nos outros formatos, lê a
+    tabela inteira e os papéis ficam None.
+    """
+    header = None
+    if Path(file_path).suffix.lower() == '.csv':
+        header = read_csv_header(file_path if data is None else data)
+    roles = load_mapping(header) if header else None
+    if roles is None:
+        return read_table(file_path, sheet, row_filter, data) + (None,)
+
+    columns = [col for col in roles if col]
+    if row_filter:
+        try:
+            columns += [col for col, _ in row_filter.checks(header) if col not in columns]
+        except FilterError as e:
+            raise AnalysisError("Filtro", str(e))
+    df, load_info = read_table(file_path, sheet, row_filter, data, columns)
+    load_info.reason = (
+        f"{load_info.reason}; {len(columns)} de {len(header)} colunas, layout com mapeamento salvo"
+    )
+    return df, load_info, roles
+
+
+def split_untitled(df, title_col):
+    """Separa as linhas sem título das demais; retorna (sem título, com título)"""
+    missing = df[title_col].isna()
+    return df[missing], df[~missing]
+
+
+def analyze_dataframe(df, load_info=None, normalize_author=True, workers=None, roles=None):
+    """
+    Valida a tabela, detecta as colunas e identifica duplicados
+
+    workers define os processos da detecção; None usa todos os núcleos em
+    tabelas grandes. O resultado é o mesmo com qualquer número de processos.
+    roles (título, autor, doi, isbn) dispensa a detecção.
+    """
+    detected = roles is None or df.empty
+    if detected:
+        roles = detect_columns(df)
+    title_col, author_col, doi_col, isbn_col = roles
+
+    # Com filtro de leitura, as linhas do arquivo incluem as excluídas
+    row_count = len(df) if load_info is None or load_info.rows_read is None else load_info.rows_read
+    # Linhas sem título ficam fora da detecção, mas não são descartadas
+    untitled, df = split_untitled(df, title_col)
+
+    keys, codes, uniques, counts = build_and_index_keys(
+        df, title_col, author_col, doi_col, isbn_col, normalize_author,
+        dedupe_workers(len(df), workers)
+    )
+    if detected:
+        remember_columns(df.columns, roles)
+    return AnalysisResult(
+        df, title_col, author_col, doi_col, isbn_col,
+        keys, codes, uniques, counts, load_info, row_count, untitled=untitled
+    )
+
+
+def _resume_from_checkpoint(file_path, options, row_filter=None):
+    """
+    Retoma a análise processando só as linhas acrescentadas ao arquivo
+
+    Retorna (resultado, tamanhos já salvos) ou None se não há checkpoint
+    válido; os tamanhos (linhas, linhas sem título, chaves distintas) são
+    None quando nada foi acrescentado.
+    """
+    checkpoint = load_checkpoint(file_path, options)
+    if checkpoint is None:
+        return None
+
+    meta, state = checkpoint
+    title_col, author_col, doi_col, isbn_col = state['roles']
+
+    tail = read_appended_rows(file_path, meta, state['columns'])
+    start = state['row_count']
+    tail.index = pd.RangeIndex(start, start + len(tail))
+    row_count = start + len(tail)
+    new_rows = len(tail)
+    if row_filter:
+        tail = row_filter.apply(tail)
+    tail_untitled, tail = split_untitled(tail, title_col)
+
+    tail_keys = build_keys(
+        tail, title_col, author_col, doi_col, isbn_col, options['normalize_author']
+    )
+    codes, uniques, counts = extend_key_index(
+        state['codes'], state['uniques'], state['counts'], tail_keys
+    )
+
+    saved = (len(state['df']), len(state['untitled']), len(state['uniques']))
+    df = pd.concat([state['df'], tail]) if len(tail) else state['df']
+    keys = pd.Series(np.asarray(uniques, dtype=object)[codes], index=df.index, dtype=object)
+    untitled = state['untitled']
+    if len(tail_untitled):
+        untitled = pd.concat([untitled, tail_untitled])
+
+    info = LoadInfo(
+        'incremental', f"{new_rows:,} linhas novas desde a última análise",
+        os.path.getsize(file_path), available_memory(), os.cpu_count() or 1,
+        meta['encoding']
+    )
+    result = AnalysisResult(
+        df, title_col, author_col, doi_col, isbn_col,
+        keys, codes, uniques, counts, info, row_count, untitled=untitled
+    )
+    return result, saved if meta['appended_bytes'] > 0 else None
+
+
+def analyze_path(file_path, sheet=None, normalize_author=True, incremental=False, workers=None,
+                 on_progress=None, row_filter=None, only_mapped=False):
+    """
+    Lê e analisa um arquivo
+
+    Com incremental, arquivos CSV que apenas cresceram desde a última
+    análise têm só as linhas novas lidas e comparadas com o índice salvo.
+    Com on_progress, o início de arquivos CSV, BibTeX e RIS é lido antes
+    em blocos e a função recebe um AnalysisProgress após cada um; depois o
+    arquivo é lido e analisado como sem progresso. row_filter
+    (filters.RowFilter) descarta linhas durante a leitura: as excluídas
+    não entram na tabela nem na detecção de duplicados. Com only_mapped,
+    CSVs de layout conhecido têm só as colunas mapeadas lidas (a tabela
+    do resultado não traz as demais); não vale com incremental, cujo
+    checkpoint guarda a tabela inteira.
+    """
+    use_checkpoint = incremental and Path(file_path).suffix.lower() == '.csv'
+    options = {'normalize_author': normalize_author}
+    if row_filter:
+        # Checkpoints de filtros diferentes não se misturam
+        options['filtro'] = row_filter.describe()
+
+    if use_checkpoint:
+        resumed = _resume_from_checkpoint(file_path, options, row_filter)
+        if resumed is not None:
+            result, saved = resumed
+            if saved is not None:
+                _save_checkpoint_quietly(file_path, result, options, saved)
+            return result
+
+    suffix = Path(file_path).suffix.lower()
+    if on_progress is not None and (suffix == '.csv' or suffix in REFERENCE_PARSERS):
+        _preview_with_progress(file_path, normalize_author, on_progress, row_filter)
+
+    if only_mapped and not use_checkpoint:
+        df, load_info, roles = read_mapped_table(file_path, sheet, row_filter)
+        result = analyze_dataframe(df, load_info, normalize_author, workers, roles)
+    else:
+        df, load_info = read_table(file_path, sheet, row_filter)
+        result = analyze_dataframe(df, load_info, normalize_author, workers)
+
+    if use_checkpoint and load_info.encoding:
+        _save_checkpoint_quietly(file_path, result, options)
+    return result
+
+
+def _preview_chunks(file_path, encoding, normalize_author, on_progress, row_filter=None):
+    """
+    Resultados parciais do início do arquivo, informados após cada bloco
+
+    O índice de chaves cresce a cada bloco (extend_key_index), então as
+    contagens parciais valem para tudo o que foi lido. Para em PREVIEW_ROWS
+    linhas: o resultado final vem da leitura completa, com a escolha do
+    leitor e a detecção em vários processos.
+    """
+    codes = np.empty(0, dtype=np.intp)
+    uniques = pd.Index([], dtype=object)
+    counts = np.empty(0, dtype=np.int64)
+    roles = page = None
+    row_count = 0
+
+    for chunk in iter_table_chunks(file_path, encoding, PROGRESS_CHUNK_ROWS, row_filter):
+        row_count += chunk.attrs.get('rows_read', len(chunk))
+        if not chunk.empty:
+            if roles is None:
+                roles = detect_columns(chunk)
+            title_col, author_col, doi_col, isbn_col = roles
+
+            chunk = chunk.dropna(subset=[title_col])
+            keys = build_keys(chunk, title_col, author_col, doi_col, isbn_col, normalize_author)
+            codes, uniques, counts = extend_key_index(codes, uniques, counts, keys)
+
+            if page is None:
+                page = format_rows(chunk.head(PAGE_ROWS), title_col, author_col)
+            # Um objeto novo por bloco: a interface lê em outra thread
+            on_progress(AnalysisProgress(
+                title_col, author_col, page, (counts[codes[:len(page)]] > 1).tolist(),
+                len(codes), int(counts[counts > 1].sum())
+            ))
+        if row_count >= PREVIEW_ROWS:
+            return
+
+
+def _preview_with_progress(file_path, normalize_author, on_progress, row_filter=None):
+    """
+    Tenta cada encoding na prévia
+
+    Arquivos que a prévia não consegue ler ficam sem resultados parciais.
+    """
+    for encoding in ENCODINGS:
+        try:
+            return _preview_chunks(file_path, encoding, normalize_author, on_progress, row_filter)
+        except UnicodeDecodeError:
+            continue
+        except Exception:
+            # A prévia é opcional; o erro aparece na leitura completa
+            return
+
+
+def _save_checkpoint_quietly(file_path, result, options, saved=None):
+    """
+    Grava o checkpoint; uma falha aqui não deve invalidar a análise
+
+    Com saved (de uma retomada), só as linhas novas são acrescentadas.
+    """
+    try:
+        save_checkpoint(
+            file_path, result.checkpoint_state(saved or (0, 0, 0)), result.load_info.encoding,
+            options, append=saved is not None
+        )
+    except OSError:
+        pass
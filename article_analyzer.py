@@ -5,11 +5,25 @@ Interface moderna e funcional para análise de listas acadêmicas
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
 import os
+import queue
 import sys
+import threading
 from pathlib import Path
 
+from analysis import AnalysisError, analyze_path, is_valid_academic_content
+from bibliometrics import SORT_ORDERS, describe_statistics
+from columns import find_title_and_author_columns
+import exporters
+from filters import FilterError, parse_filter
+from loaders import EXCEL_SUFFIXES, list_excel_sheets
+from mappings import SOURCE_USER, save_mapping_quietly
+from preview import describe_preview, quick_preview
+from resolve import resolve_to_file
+from search import ResultSearch
+from session import SESSION_SUFFIX, SessionError, load_session, save_session
+from stages import AUTO, StageGraph
+
 
 class ModernStyle:
     """Configurações de estilo moderno para a interface"""
@@ -100,6 +114,58 @@ class ModernStyle:
         )
 
 
+PROGRESS_POLL_MS = 100   # Intervalo de atualização dos resultados parciais
+SEARCH_DEBOUNCE_MS = 150 # Espera após a última tecla antes de buscar
+AUTHOR_AUTO_LABEL = "(detectada)"
+AUTHOR_NONE_LABEL = "(nenhuma)"
+DISPLAY_CHUNK_LINES = 500 # Linhas acrescentadas ao texto dos resultados por vez
+DISPLAY_PRELOAD = 0.9     # Fração rolada a partir da qual o próximo trecho é acrescentado
+
+
+class LazyDocument:
+    """
+    Texto dos resultados montado por trechos
+
+    Guarda o texto fixo (cabeçalhos, resumos) e as listas sob demanda com a
+    numeração de cada linha; lines() formata só o trecho pedido, e a
+    interface acrescenta os trechos conforme o usuário rola a lista.
+    """
+    
+    def __init__(self):
+        self.parts = []       # (linhas de texto, lista, números)
+        self.line_count = 0
+    
+    def add_text(self, text):
+        lines = text.splitlines(keepends=True)
+        self.parts.append((lines, None, None))
+        self.line_count += len(lines)
+    
+    def add_rows(self, rows, numbers=None):
+        """Linhas 'n. título'; numbers troca a numeração 1, 2, 3... (ex.: na busca)"""
+        if numbers is None:
+            numbers = range(1, len(rows) + 1)
+        self.parts.append((None, rows, numbers))
+        self.line_count += len(rows)
+    
+    def lines(self, start, stop):
+        """Texto das linhas entre start e stop"""
+        text = []
+        offset = 0
+        for lines, rows, numbers in self.parts:
+            length = len(lines) if rows is None else len(rows)
+            low, high = max(start - offset, 0), min(stop - offset, length)
+            if low < high:
+                if rows is None:
+                    text.extend(lines[low:high])
+                else:
+                    text.extend(
+                        f"{number:4d}. {title}\n"
+                        for number, title in zip(numbers[low:high], rows[low:high])
+                    )
+            offset += length
+        return "".join(text)
+
+
 class ArticleAnalyzer:
     def __init__(self, root):
         self.root = root
@@ -141,10 +207,26 @@ class ArticleAnalyzer:
     
     def setup_variables(self):
         """Inicializa as variáveis da aplicação"""
-        self.df = None
-        self.all_titles = []
-        self.duplicates = []
+        self.result = None
+        self.store = None
         self.file_path = tk.StringVar()
+        self.sheet_name = tk.StringVar()
+        self.analysis_queue = None
+        self.search_index = None
+        self.search_queue = None
+        self.preview_queue = None
+        self.search_after_id = None
+        self.search_var = tk.StringVar()
+        self.stats_order = tk.StringVar(value='contagem')
+        self.normalize_author = tk.BooleanVar(value=True)
+        self.author_choice = tk.StringVar(value=AUTHOR_AUTO_LABEL)
+        self.filter_text = tk.StringVar()
+        self.stage_graph = StageGraph()
+        self.analysis_source = None
+        self.stats_rendered = None
+        self.document = None
+        self.document_shown = 0
+        self.more_lines_id = None
         
     def apply_modern_style(self):
         """Aplica o estilo moderno"""
@@ -193,7 +275,7 @@ class ArticleAnalyzer:
         # Subtítulo
         subtitle_label = ttk.Label(
             header_frame,
-            text="Análise profissional de listas acadêmicas em formato CSV",
+            text="Análise profissional de listas acadêmicas (CSV, Excel, BibTeX e RIS)",
             style='Modern.TLabel'
         )
         subtitle_label.grid(row=1, column=0, pady=(5, 0))
@@ -202,7 +284,7 @@ class ArticleAnalyzer:
         """Cria a seção de seleção de arquivo"""
         file_frame = ttk.LabelFrame(
             parent,
-            text="📁 Selecionar Arquivo CSV",
+            text="📁 Selecionar Arquivo",
             style='Modern.TLabelframe',
             padding=15
         )
@@ -233,14 +315,94 @@ class ArticleAnalyzer:
         )
         browse_btn.grid(row=0, column=2)
         
-        # Botão analisar
-        analyze_btn = ttk.Button(
+        # Seleção de planilha (apenas arquivos Excel)
+        ttk.Label(
+            file_frame,
+            text="Planilha:",
+            style='Modern.TLabel'
+        ).grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.sheet_combo = ttk.Combobox(
+            file_frame,
+            textvariable=self.sheet_name,
+            state=tk.DISABLED
+        )
+        self.sheet_combo.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(0, 10), pady=(10, 0))
+        
+        # Opções de comparação; mudá-las após a análise refaz só os
+        # estágios afetados
+        ttk.Label(
+            file_frame,
+            text="Autores:",
+            style='Modern.TLabel'
+        ).grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.author_combo = ttk.Combobox(
+            file_frame,
+            textvariable=self.author_choice,
+            values=[AUTHOR_AUTO_LABEL],
+            state=tk.DISABLED
+        )
+        self.author_combo.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(0, 10), pady=(10, 0))
+        self.author_combo.bind('<<ComboboxSelected>>', self.on_options_changed)
+        
+        self.normalize_check = ttk.Checkbutton(
             file_frame,
+            text="Normalizar nomes",
+            variable=self.normalize_author,
+            command=self.on_options_changed
+        )
+        self.normalize_check.grid(row=2, column=2, sticky=tk.W, pady=(10, 0))
+        
+        # Filtro aplicado na leitura (ex.: ano:2015-2024 tipo:artigo idioma:en);
+        # Enter após a análise relê o arquivo com o novo filtro
+        ttk.Label(
+            file_frame,
+            text="Filtro:",
+            style='Modern.TLabel'
+        ).grid(row=3, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.filter_entry = ttk.Entry(
+            file_frame,
+            textvariable=self.filter_text,
+            style='Modern.TEntry'
+        )
+        self.filter_entry.grid(row=3, column=1, sticky=(tk.W, tk.E), padx=(0, 10), pady=(10, 0))
+        self.filter_entry.bind('<Return>', self.on_options_changed)
+        
+        ttk.Label(
+            file_frame,
+            text="ano:2015-2024 tipo:artigo idioma:en",
+            style='Modern.TLabel'
+        ).grid(row=3, column=2, sticky=tk.W, pady=(10, 0))
+        
+        # Botões de prévia e análise
+        actions_frame = ttk.Frame(file_frame)
+        actions_frame.grid(row=4, column=0, columnspan=3, pady=(15, 0))
+        
+        self.preview_btn = ttk.Button(
+            actions_frame,
+            text="⚡ Prévia Rápida",
+            command=self.preview_file,
+            style='Modern.TButton'
+        )
+        self.preview_btn.grid(row=0, column=0, padx=(0, 10))
+        
+        self.analyze_btn = ttk.Button(
+            actions_frame,
             text="🔍 Analisar Arquivo",
             command=self.analyze_file,
             style='Primary.TButton'
         )
-        analyze_btn.grid(row=1, column=0, columnspan=3, pady=(15, 0))
+        self.analyze_btn.grid(row=0, column=1, padx=(0, 10))
+        
+        self.open_session_btn = ttk.Button(
+            actions_frame,
+            text="📂 Abrir Sessão",
+            command=self.open_session,
+            style='Modern.TButton'
+        )
+        self.open_session_btn.grid(row=0, column=2)
         
     def create_results_area(self, parent):
         """Cria a área de resultados"""
@@ -254,9 +416,49 @@ class ArticleAnalyzer:
         results_frame.columnconfigure(0, weight=1)
         results_frame.rowconfigure(0, weight=1)
         
+        # Abas: lista de títulos e estatísticas
+        self.results_notebook = ttk.Notebook(results_frame)
+        self.results_notebook.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.results_notebook.bind('<<NotebookTabChanged>>', self.on_results_tab_changed)
+        
+        list_tab = ttk.Frame(self.results_notebook, padding=10)
+        list_tab.columnconfigure(0, weight=1)
+        list_tab.rowconfigure(1, weight=1)
+        self.results_notebook.add(list_tab, text="📚 Lista")
+        
+        self.stats_tab = ttk.Frame(self.results_notebook, padding=10)
+        self.results_notebook.add(self.stats_tab, text="📈 Estatísticas")
+        self.create_statistics_tab(self.stats_tab)
+        
+        # Campo de busca
+        search_frame = ttk.Frame(list_tab)
+        search_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        search_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(
+            search_frame,
+            text="Buscar:",
+            style='Modern.TLabel'
+        ).grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        
+        self.search_entry = ttk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            font=('Segoe UI', 10),
+            state=tk.DISABLED
+        )
+        self.search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        self.search_var.trace_add('write', self.on_search_changed)
+        
+        ttk.Label(
+            search_frame,
+            text="ex.: redes neurais  autor:silva  ano:2018-2020",
+            style='Modern.TLabel'
+        ).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        
         # Text widget com scrollbar
-        text_frame = ttk.Frame(results_frame)
-        text_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        text_frame = ttk.Frame(list_tab)
+        text_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         text_frame.columnconfigure(0, weight=1)
         text_frame.rowconfigure(0, weight=1)
         
@@ -273,16 +475,59 @@ class ArticleAnalyzer:
         )
         self.results_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.results_text.yview)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.results_text.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar; a rolagem também pede as próximas linhas da lista
+        self.results_scrollbar = ttk.Scrollbar(
+            text_frame, orient=tk.VERTICAL, command=self.results_text.yview
+        )
+        self.results_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.results_text.configure(yscrollcommand=self.on_results_scroll)
+        
+    def create_statistics_tab(self, parent):
+        """Cria a aba de estatísticas bibliométricas"""
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(1, weight=1)
+        
+        order_frame = ttk.Frame(parent)
+        order_frame.grid(row=0, column=0, sticky=tk.W, pady=(0, 10))
+        
+        ttk.Label(
+            order_frame,
+            text="Ordenar:",
+            style='Modern.TLabel'
+        ).grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        
+        for column, (order, label) in enumerate(SORT_ORDERS.items(), 1):
+            ttk.Radiobutton(
+                order_frame,
+                text=label,
+                value=order,
+                variable=self.stats_order,
+                command=self.render_statistics
+            ).grid(row=0, column=column, sticky=tk.W, padx=(0, 10))
+        
+        self.stats_text = tk.Text(
+            parent,
+            font=('Consolas', 10),
+            wrap=tk.NONE,
+            bg='white',
+            fg=ModernStyle.COLORS['text_primary'],
+            relief='flat',
+            borderwidth=2,
+            padx=15,
+            pady=15
+        )
+        self.stats_text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.stats_text.yview)
+        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.stats_text.configure(yscrollcommand=scrollbar.set)
+        self.render_statistics()
         
     def create_export_buttons(self, parent):
         """Cria os botões de exportação"""
         export_frame = ttk.Frame(parent)
         export_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
-        export_frame.columnconfigure((0, 1), weight=1)
+        export_frame.columnconfigure((0, 1, 2, 3), weight=1)
         
         # Botão exportar todos
         self.export_all_btn = ttk.Button(
@@ -302,7 +547,27 @@ class ArticleAnalyzer:
             state=tk.DISABLED,
             style='Modern.TButton'
         )
-        self.export_duplicates_btn.grid(row=0, column=1, padx=(10, 0), sticky=(tk.W, tk.E))
+        self.export_duplicates_btn.grid(row=0, column=1, padx=(10, 10), sticky=(tk.W, tk.E))
+        
+        # Botão exportar a tabela sem duplicados
+        self.export_cleaned_btn = ttk.Button(
+            export_frame,
+            text="🧹 Exportar Lista Limpa",
+            command=self.export_cleaned,
+            state=tk.DISABLED,
+            style='Modern.TButton'
+        )
+        self.export_cleaned_btn.grid(row=0, column=2, padx=(10, 10), sticky=(tk.W, tk.E))
+        
+        # Botão salvar sessão
+        self.save_session_btn = ttk.Button(
+            export_frame,
+            text="💾 Salvar Sessão",
+            command=self.save_session,
+            state=tk.DISABLED,
+            style='Modern.TButton'
+        )
+        self.save_session_btn.grid(row=0, column=3, padx=(10, 0), sticky=(tk.W, tk.E))
         
     def create_status_bar(self, parent):
         """Cria a barra de status"""
@@ -324,69 +589,95 @@ class ArticleAnalyzer:
     def browse_file(self):
         """Abre dialog para seleção de arquivo"""
         file_path = filedialog.askopenfilename(
-            title="Selecionar arquivo CSV",
+            title="Selecionar arquivo",
             filetypes=[
+                ("Listas acadêmicas", "*.csv *.bib *.ris *.xlsx"),
                 ("Arquivos CSV", "*.csv"),
+                ("Planilhas Excel", "*.xlsx"),
+                ("BibTeX", "*.bib"),
+                ("RIS", "*.ris"),
                 ("Todos os arquivos", "*.*")
             ]
         )
         if file_path:
             self.file_path.set(file_path)
+            self.load_sheet_names(file_path)
             self.update_status(f"Arquivo selecionado: {Path(file_path).name}")
     
-    def is_valid_academic_content(self, df):
-        """Verifica se o CSV contém conteúdo acadêmico válido"""
-        if df.empty:
-            return False
-            
-        academic_keywords = [
-            'title', 'titulo', 'título', 'article', 'artigo', 'book', 'livro',
-            'paper', 'journal', 'author', 'autor', 'publication', 'publicação',
-            'doi', 'isbn', 'volume', 'issue', 'year', 'ano', 'name', 'nome'
-        ]
-        
-        columns_text = ' '.join(df.columns).lower()
-        has_academic_columns = any(keyword in columns_text for keyword in academic_keywords)
-        
-        if not has_academic_columns:
-            return False
-            
-        # Verifica se há dados válidos
-        for col in df.columns:
-            if any(keyword in col.lower() for keyword in ['title', 'titulo', 'título', 'nome', 'name']):
-                sample_data = df[col].dropna().head(10)
-                if len(sample_data) > 0:
-                    avg_length = sample_data.str.len().mean()
-                    if avg_length > 10:
-                        return True
+    def load_sheet_names(self, file_path):
+        """Preenche a lista de planilhas quando o arquivo é Excel"""
+        sheets = []
+        if Path(file_path).suffix.lower() in EXCEL_SUFFIXES:
+            try:
+                sheets = list_excel_sheets(file_path)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao abrir planilha: {str(e)}")
         
-        return False
+        self.sheet_combo.config(values=sheets, state='readonly' if sheets else tk.DISABLED)
+        self.sheet_name.set(sheets[0] if sheets else "")
+    
+    def is_valid_academic_content(self, df):
+        """Verifica se o arquivo contém conteúdo acadêmico válido"""
+        return is_valid_academic_content(df)
     
     def find_title_and_author_columns(self, df):
         """Identifica colunas de título e autor"""
-        title_col = None
-        author_col = None
-        
-        # Procura coluna de título
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if any(keyword in col_lower for keyword in ['title', 'titulo', 'título', 'nome', 'name']):
-                title_col = col
-                break
+        return find_title_and_author_columns(df.columns)
+    
+    def preview_file(self):
+        """Estima os registros repetidos sem executar a análise completa"""
+        file_path = self.file_path.get()
+        if not file_path:
+            messagebox.showerror("Erro", "Por favor, selecione um arquivo.")
+            return
+        if not os.path.exists(file_path):
+            messagebox.showerror("Erro", "Arquivo não encontrado.")
+            return
+        if self.preview_queue is not None:
+            return
         
-        # Procura coluna de autor
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if any(keyword in col_lower for keyword in ['author', 'autor', 'autores', 'authors']):
-                author_col = col
-                break
+        # A prévia percorre o arquivo inteiro: roda em segundo plano, sem
+        # bloquear a interface nem descartar a análise já exibida
+        self.update_status("Estimando duplicados...")
+        self.preview_btn.config(state=tk.DISABLED)
+        self.preview_queue = queue.Queue()
+        worker = threading.Thread(
+            target=self.run_preview, args=(file_path, self.preview_queue), daemon=True
+        )
+        worker.start()
+        self.root.after(PROGRESS_POLL_MS, self.poll_preview)
+    
+    def run_preview(self, file_path, results):
+        """Calcula a prévia fora da thread da interface"""
+        try:
+            results.put(('concluido', quick_preview(file_path)))
+        except AnalysisError as e:
+            results.put(('erro', (e.title, e.message)))
+        except Exception as e:
+            results.put(('erro', ("Erro", f"Erro ao processar arquivo: {str(e)}")))
+    
+    def poll_preview(self):
+        """Exibe a prévia quando ela fica pronta"""
+        try:
+            kind, payload = self.preview_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(PROGRESS_POLL_MS, self.poll_preview)
+            return
         
-        return title_col, author_col
+        self.preview_queue = None
+        if self.analysis_queue is None:
+            self.preview_btn.config(state=tk.NORMAL)
+        if kind == 'erro':
+            self.update_status("Falha na prévia")
+            messagebox.showerror(*payload)
+            return
+        self.update_status("Prévia concluída")
+        messagebox.showinfo("Prévia Rápida", describe_preview(payload))
     
     def analyze_file(self):
-        """Analisa o arquivo CSV selecionado"""
+        """Analisa o arquivo selecionado"""
         if not self.file_path.get():
-            messagebox.showerror("Erro", "Por favor, selecione um arquivo CSV.")
+            messagebox.showerror("Erro", "Por favor, selecione um arquivo.")
             return
         
         file_path = self.file_path.get()
@@ -394,92 +685,428 @@ class ArticleAnalyzer:
             messagebox.showerror("Erro", "Arquivo não encontrado.")
             return
         
+        if self.analysis_queue is not None:
+            return
+        
+        row_filter = self.read_filter()
+        if row_filter is False:
+            return
+        
         self.update_status("Analisando arquivo...")
+        self.set_busy(True)
+        self.clear_results_text()
+        
+        # Nova análise: intermediários de outro arquivo não servem mais
+        self.stage_graph.clear()
+        self.author_choice.set(AUTHOR_AUTO_LABEL)
+        self.analysis_source = None
+        
+        # A análise roda em segundo plano; a interface recebe os resultados
+        # parciais pela fila e exibe a primeira página logo no primeiro bloco
+        self.analysis_queue = queue.Queue()
+        worker = threading.Thread(
+            target=self.run_analysis,
+            args=(file_path, self.sheet_name.get() or None, self.normalize_author.get(),
+                  row_filter, self.analysis_queue),
+            daemon=True
+        )
+        worker.start()
+        self.root.after(PROGRESS_POLL_MS, self.poll_analysis)
+    
+    def read_filter(self):
+        """Filtro digitado (None se vazio); False, após avisar, se for inválido"""
+        try:
+            return parse_filter(self.filter_text.get())
+        except FilterError as e:
+            messagebox.showerror("Filtro", str(e))
+            return False
+    
+    def open_session(self):
+        """Reabre uma análise salva, sem reler o arquivo original"""
+        if self.analysis_queue is not None:
+            return
+        
+        folder = filedialog.askdirectory(title="Abrir sessão salva (pasta .sessao)")
+        if not folder:
+            return
         
+        self.update_status("Abrindo sessão...")
+        self.set_busy(True)
+        self.clear_results_text()
+        
+        # Mesmo caminho da análise: a sessão é lida em segundo plano e o
+        # resultado chega pela fila
+        self.analysis_queue = queue.Queue()
+        worker = threading.Thread(
+            target=self.run_open_session,
+            args=(folder, self.analysis_queue),
+            daemon=True
+        )
+        worker.start()
+        self.root.after(PROGRESS_POLL_MS, self.poll_analysis)
+    
+    def run_open_session(self, folder, results):
+        """Lê a sessão fora da thread da interface"""
         try:
-            # Lê o arquivo CSV
-            self.df = pd.read_csv(file_path, encoding='utf-8')
-            
-        except UnicodeDecodeError:
+            result, manifest = load_session(folder)
+        except SessionError as e:
+            results.put(('erro', ("Sessão Inválida", str(e))))
+            return
+        except Exception as e:
+            results.put(('erro', ("Erro", f"Erro ao abrir sessão: {str(e)}")))
+            return
+        
+        # Sessões antigas podem não ter as estatísticas guardadas
+        result.statistics()
+        result.store()
+        results.put(('sessao', (result, manifest['arquivo'])))
+    
+    def save_session(self):
+        """Grava a análise atual para reabri-la depois"""
+        if self.result is None:
+            messagebox.showwarning("Aviso", "Não há análise para salvar.")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Salvar sessão",
+            initialfile=Path(self.file_path.get() or "analise").name + SESSION_SUFFIX,
+            filetypes=[("Sessões do analisador", f"*{SESSION_SUFFIX}")]
+        )
+        
+        if file_path:
             try:
-                # Tenta com encoding diferente
-                self.df = pd.read_csv(file_path, encoding='latin1')
+                folder = save_session(self.result, file_path, source_path=self.file_path.get() or None)
+                
+                messagebox.showinfo(
+                    "Sessão Salva", 
+                    f"Sessão salva com sucesso!\n\n"
+                    f"Pasta: {folder.name}\n"
+                    f"Total de registros: {self.result.total_count}"
+                )
+                
             except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao ler arquivo: {str(e)}")
-                return
+                messagebox.showerror("Erro", f"Erro ao salvar sessão: {str(e)}")
+    
+    def run_analysis(self, file_path, sheet, normalize_author, row_filter, results):
+        """Executa a análise fora da thread da interface"""
+        try:
+            # Lê (CSV, BibTeX, RIS ou Excel) e analisa; CSVs que só cresceram
+            # desde a última análise têm apenas as linhas novas processadas
+            result = analyze_path(
+                file_path, sheet=sheet, normalize_author=normalize_author, incremental=True,
+                on_progress=lambda progress: results.put(('progresso', progress)),
+                row_filter=row_filter
+            )
+            # Agregados e resultado compacto calculados aqui ficam guardados
+            # no resultado; a interface só formata o texto
+            result.statistics()
+            result.store()
+            # A análise vira o ponto de partida do grafo de estágios
+            self.stage_graph.seed(result, file_path, sheet, normalize_author, row_filter)
+            
+        except AnalysisError as e:
+            results.put(('erro', (e.title, e.message)))
+            return
+            
+        except UnicodeDecodeError as e:
+            results.put(('erro', ("Erro", f"Erro ao ler arquivo: {str(e)}")))
+            return
                 
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao processar arquivo: {str(e)}")
+            results.put(('erro', ("Erro", f"Erro ao processar arquivo: {str(e)}")))
             return
         
-        # Valida conteúdo
-        if not self.is_valid_academic_content(self.df):
-            messagebox.showerror(
-                "Arquivo Inválido", 
-                "O arquivo não parece conter uma lista válida de artigos ou livros acadêmicos.\n\n"
-                "Verifique se o arquivo possui colunas como 'title', 'autor', etc."
-            )
+        results.put(('concluido', (result, (file_path, sheet))))
+    
+    def on_options_changed(self, *args):
+        """Refaz a análise atual com as novas opções, só nos estágios afetados"""
+        if self.analysis_source is None or self.analysis_queue is not None:
+            # Sem análise do arquivo (ou com uma em andamento), a opção vale
+            # para a próxima análise
             return
         
-        # Identifica colunas
-        title_col, author_col = self.find_title_and_author_columns(self.df)
+        row_filter = self.read_filter()
+        if row_filter is False:
+            return
         
-        if not title_col:
-            messagebox.showerror("Erro", "Não foi possível identificar uma coluna de títulos.")
+        choice = self.author_choice.get()
+        author_col = {AUTHOR_AUTO_LABEL: AUTO, AUTHOR_NONE_LABEL: None}.get(choice, choice)
+        file_path, sheet = self.analysis_source
+        
+        self.update_status("Atualizando a análise com as novas opções...")
+        self.set_busy(True)
+        self.analysis_queue = queue.Queue()
+        worker = threading.Thread(
+            target=self.run_stages,
+            args=(file_path, sheet, self.normalize_author.get(), author_col, row_filter,
+                  self.analysis_queue),
+            daemon=True
+        )
+        worker.start()
+        self.root.after(PROGRESS_POLL_MS, self.poll_analysis)
+    
+    def run_stages(self, file_path, sheet, normalize_author, author_col, row_filter, results):
+        """Executa os estágios afetados pela mudança de opções"""
+        try:
+            result = self.stage_graph.run(file_path, sheet, normalize_author, author_col, row_filter)
+            result.store()
+            if author_col != AUTO:
+                # A coluna escolhida vale para as próximas listas com este cabeçalho
+                save_mapping_quietly(
+                    result.df.columns,
+                    (result.title_col, result.author_col, result.doi_col, result.isbn_col),
+                    SOURCE_USER
+                )
+            
+        except AnalysisError as e:
+            results.put(('erro', (e.title, e.message)))
+            return
+                
+        except Exception as e:
+            results.put(('erro', ("Erro", f"Erro ao processar arquivo: {str(e)}")))
             return
         
-        # Processa dados
-        self.process_data(title_col, author_col)
+        results.put(('concluido', (result, (file_path, sheet))))
+    
+    def poll_analysis(self):
+        """Atualiza a tela com o que a análise em segundo plano já produziu"""
+        progress = None
+        while True:
+            try:
+                kind, payload = self.analysis_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'progresso':
+                progress = payload
+                continue
+            
+            self.analysis_queue = None
+            if kind == 'erro':
+                self.set_busy(False)
+                self.update_status("Falha na análise")
+                messagebox.showerror(*payload)
+                return
+            
+            if kind == 'sessao':
+                payload, source_path = payload
+                if source_path:
+                    self.file_path.set(source_path)
+                # Sem o grafo de estágios, as opções valem para a próxima análise
+                self.analysis_source = None
+            else:
+                payload, self.analysis_source = payload
+                self.update_author_choices(payload)
+            self.set_busy(False)
+            
+            # Processa dados
+            self.result = payload
+            self.process_data(self.result)
+            
+            # Habilita botões de exportação
+            self.export_all_btn.config(state=tk.NORMAL)
+            self.export_duplicates_btn.config(state=tk.NORMAL)
+            self.export_cleaned_btn.config(state=tk.NORMAL)
+            self.save_session_btn.config(state=tk.NORMAL)
+            
+            self.update_status("Análise concluída com sucesso!")
+            self.render_statistics()
+            self.build_search_index(self.result)
+            return
         
-        # Habilita botões de exportação
-        self.export_all_btn.config(state=tk.NORMAL)
-        self.export_duplicates_btn.config(state=tk.NORMAL)
+        if progress is not None:
+            self.display_progress(progress)
+        self.root.after(PROGRESS_POLL_MS, self.poll_analysis)
+    
+    def update_author_choices(self, result):
+        """Oferece as colunas da tabela como alternativa à coluna de autores detectada"""
+        columns = [str(col) for col in result.df.columns if col != result.title_col]
+        self.author_combo.config(values=[AUTHOR_AUTO_LABEL, AUTHOR_NONE_LABEL] + columns)
+    
+    def build_search_index(self, result):
+        """Monta o índice de busca em segundo plano"""
+        self.search_queue = queue.Queue()
+        titles = self.store.all_titles()
+        worker = threading.Thread(
+            target=lambda results: results.put(ResultSearch(result, titles)),
+            args=(self.search_queue,),
+            daemon=True
+        )
+        worker.start()
+        self.root.after(PROGRESS_POLL_MS, self.poll_search_index)
+    
+    def poll_search_index(self):
+        """Habilita a busca quando o índice fica pronto"""
+        if self.search_queue is None:
+            return
+        try:
+            index = self.search_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(PROGRESS_POLL_MS, self.poll_search_index)
+            return
         
-        self.update_status("Análise concluída com sucesso!")
+        self.search_queue = None
+        # Índice de uma análise anterior: descartado
+        if (self.analysis_queue is not None or self.store is None
+                or index.titles is not self.store.all_titles()):
+            return
+        self.search_index = index
+        self.search_entry.config(state=tk.NORMAL)
+        if self.search_var.get().strip():
+            self.apply_search()
+    
+    def on_search_changed(self, *args):
+        """Agenda a busca para quando o usuário parar de digitar"""
+        if self.search_index is None:
+            return
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+    
+    def apply_search(self):
+        """Filtra a lista completa e a de duplicados pela consulta"""
+        self.search_after_id = None
+        rows = self.search_index.search(self.search_var.get())
+        if rows is None:
+            self.display_results()
+            return
         
-    def process_data(self, title_col, author_col):
-        """Processa os dados do CSV"""
-        # Remove linhas vazias
-        self.df = self.df.dropna(subset=[title_col])
+        all_rows, duplicate_rows = self.search_index.split(rows)
+        self.display_search_results(self.search_var.get().strip(), all_rows, duplicate_rows)
+    
+    def display_search_results(self, query, all_rows, duplicate_rows):
+        """Exibe as linhas encontradas nas duas listas"""
+        all_titles = self.store.all_titles()
+        duplicates = self.store.duplicate_titles()
+        document = LazyDocument()
         
-        total_count = len(self.df)
+        result_text = "═" * 70 + "\n"
+        result_text += f"🔎 BUSCA: {query}\n"
+        result_text += "═" * 70 + "\n\n"
         
-        # Prepara lista completa
-        self.all_titles = []
-        for _, row in self.df.iterrows():
-            title = str(row[title_col]).strip()
-            if author_col and pd.notna(row[author_col]):
-                author = str(row[author_col]).strip()
-                self.all_titles.append(f"{title} — {author}")
-            else:
-                self.all_titles.append(title)
-        
-        # Identifica duplicados
-        if author_col:
-            # Combina título e autor para detecção de duplicados
-            self.df['combined'] = (
-                self.df[title_col].astype(str).str.strip() + " | " + 
-                self.df[author_col].astype(str).str.strip()
-            )
-            duplicated_mask = self.df.duplicated(subset=['combined'], keep=False)
-            duplicates_df = self.df[duplicated_mask]
-            
-            self.duplicates = []
-            for _, row in duplicates_df.iterrows():
-                title = str(row[title_col]).strip()
-                author = str(row[author_col]).strip() if pd.notna(row[author_col]) else "Autor não informado"
-                self.duplicates.append(f"{title} — {author}")
-        else:
-            duplicated_mask = self.df.duplicated(subset=[title_col], keep=False)
-            duplicates_df = self.df[duplicated_mask]
-            self.duplicates = [str(title).strip() for title in duplicates_df[title_col]]
+        result_text += f"📚 LISTA COMPLETA: {len(all_rows):,} de {len(all_titles):,} registros\n"
+        result_text += "─" * 40 + "\n"
+        document.add_text(result_text)
+        document.add_rows(all_titles.subset(all_rows), all_rows + 1)
+        
+        result_text = f"\n🔍 DUPLICADOS: {len(duplicate_rows):,} de {len(duplicates):,} registros\n"
+        result_text += "─" * 40 + "\n"
+        document.add_text(result_text)
+        document.add_rows(duplicates.subset(duplicate_rows), duplicate_rows + 1)
         
-        # Exibe resultados
-        self.display_results(total_count, len(self.duplicates), title_col, author_col)
+        self.show_document(document)
     
-    def display_results(self, total_count, duplicate_count, title_col, author_col):
-        """Exibe os resultados da análise"""
+    def clear_results_text(self):
+        """Limpa o texto dos resultados e descarta as linhas ainda não exibidas"""
+        self.document = None
+        self.document_shown = 0
         self.results_text.delete(1.0, tk.END)
+    
+    def show_document(self, document):
+        """Exibe o início do documento; o restante entra conforme a rolagem"""
+        self.clear_results_text()
+        self.document = document
+        self.show_more_lines()
+    
+    def show_more_lines(self):
+        """Acrescenta o próximo trecho do documento ao texto"""
+        self.more_lines_id = None
+        document = self.document
+        if document is None or self.document_shown >= document.line_count:
+            return
+        stop = min(self.document_shown + DISPLAY_CHUNK_LINES, document.line_count)
+        self.results_text.insert(tk.END, document.lines(self.document_shown, stop))
+        self.document_shown = stop
+    
+    def on_results_scroll(self, first, last):
+        """Atualiza a barra e, perto do fim do texto, pede o próximo trecho"""
+        self.results_scrollbar.set(first, last)
+        if (self.document is not None and self.document_shown < self.document.line_count
+                and float(last) >= DISPLAY_PRELOAD and self.more_lines_id is None):
+            self.more_lines_id = self.root.after_idle(self.show_more_lines)
+    
+    def set_busy(self, busy):
+        """Bloqueia os botões enquanto uma análise está em andamento"""
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.analyze_btn.config(state=state)
+        self.preview_btn.config(state=tk.DISABLED if self.preview_queue is not None else state)
+        self.open_session_btn.config(state=state)
+        self.normalize_check.config(state=state)
+        self.filter_entry.config(state=state)
+        self.author_combo.config(
+            state='readonly' if not busy and self.analysis_source else tk.DISABLED
+        )
+        if busy:
+            self.export_all_btn.config(state=tk.DISABLED)
+            self.export_duplicates_btn.config(state=tk.DISABLED)
+            self.export_cleaned_btn.config(state=tk.DISABLED)
+            self.save_session_btn.config(state=tk.DISABLED)
+            self.search_entry.config(state=tk.DISABLED)
+            self.search_index = None
+            self.result = None
+            self.render_statistics()
+    
+    def on_results_tab_changed(self, event=None):
+        """Exibe as estatísticas ao abrir a aba, se ainda não estiverem na tela"""
+        if self.results_notebook.select() == str(self.stats_tab):
+            self.render_statistics()
+    
+    def render_statistics(self):
+        """Escreve as estatísticas guardadas no resultado, na ordem escolhida"""
+        state = (id(self.result), self.stats_order.get())
+        if state == self.stats_rendered:
+            return
+        self.stats_rendered = state
+        
+        self.stats_text.delete(1.0, tk.END)
+        if self.result is None:
+            self.stats_text.insert(1.0, "As estatísticas aparecem aqui após a análise.\n")
+            return
+        
+        stats = self.result.statistics()
+        result_text = "📈 ESTATÍSTICAS BIBLIOMÉTRICAS\n"
+        result_text += "═" * 70 + "\n\n"
+        result_text += describe_statistics(stats, order=self.stats_order.get()) + "\n"
+        self.stats_text.insert(1.0, result_text)
+    
+    def display_progress(self, progress):
+        """Exibe a primeira página e os totais parciais enquanto a análise continua"""
+        self.clear_results_text()
+        
+        result_text = "═" * 70 + "\n"
+        result_text += "⏳ ANÁLISE EM ANDAMENTO\n"
+        result_text += "═" * 70 + "\n\n"
+        
+        result_text += f"• Registros lidos até agora: {progress.rows:,}\n"
+        result_text += f"• Duplicados encontrados até agora: {progress.duplicate_count:,}\n"
+        result_text += f"• Coluna de títulos: '{progress.title_col}'\n"
+        if progress.author_col:
+            result_text += f"• Coluna de autores: '{progress.author_col}'\n"
+        
+        result_text += "\n📚 PRIMEIROS REGISTROS (🔁 = duplicado já encontrado)\n"
+        result_text += "─" * 40 + "\n"
+        for i, (title, duplicated) in enumerate(zip(progress.page, progress.page_duplicated), 1):
+            marker = "🔁" if duplicated else "  "
+            result_text += f"{i:4d}. {marker} {title}\n"
+        
+        self.results_text.insert(1.0, result_text)
+        self.update_status(f"Analisando arquivo... {progress.rows:,} registros lidos")
+        
+    def process_data(self, result):
+        """Guarda o resultado compacto, usado na exibição e nas exportações"""
+        self.store = result.store()
+        self.display_results()
+    
+    def display_results(self):
+        """
+        Exibe os resultados da análise
+        
+        As listas entram no texto por trechos (LazyDocument): só as linhas
+        que o usuário rola até a tela são formatadas.
+        """
+        store = self.store
+        total_count, duplicate_count = store.total_count, store.duplicate_count
+        document = LazyDocument()
         
         # Cabeçalho estilizado
         result_text = "═" * 70 + "\n"
@@ -496,31 +1123,46 @@ class ArticleAnalyzer:
         if duplicate_count > 0:
             percentage = (duplicate_count / total_count) * 100
             result_text += f"• Taxa de duplicação: {percentage:.1f}%\n"
+            largest = store.largest_groups(1)[0]
+            result_text += (
+                f"• Grupos de duplicados: {store.duplicate_group_count:,} "
+                f"(maior com {largest.size:,} registros)\n"
+            )
         
-        result_text += f"• Coluna de títulos: '{title_col}'\n"
-        if author_col:
-            result_text += f"• Coluna de autores: '{author_col}'\n"
+        result_text += f"• Coluna de títulos: '{store.title_col}'\n"
+        if store.author_col:
+            result_text += f"• Coluna de autores: '{store.author_col}'\n"
+        if store.doi_col:
+            result_text += f"• Coluna de DOI: '{store.doi_col}'\n"
+        if store.isbn_col:
+            result_text += f"• Coluna de ISBN: '{store.isbn_col}'\n"
+        if duplicate_count > 0 and (store.doi_col or store.isbn_col):
+            tiers = store.tiers
+            result_text += (
+                f"• Duplicados por DOI: {tiers['doi']:,} | por ISBN: {tiers['isbn']:,} | "
+                f"por título/autor: {tiers['texto']:,}\n"
+            )
+        if store.load_info:
+            result_text += f"• Motor de leitura: {store.load_info.describe()}\n"
         
         result_text += "\n" + "═" * 70 + "\n\n"
         
         # Lista completa
         result_text += "📚 LISTA COMPLETA DE TÍTULOS\n"
         result_text += "─" * 40 + "\n"
+        document.add_text(result_text)
+        document.add_rows(store.all_titles())
         
-        for i, title in enumerate(self.all_titles, 1):
-            result_text += f"{i:4d}. {title}\n"
-        
-        result_text += f"\n✅ Total listado: {len(self.all_titles):,} registros\n\n"
+        result_text = f"\n✅ Total listado: {total_count:,} registros\n\n"
         
         # Duplicados (se houver)
         if duplicate_count > 0:
             result_text += "🔍 REGISTROS DUPLICADOS IDENTIFICADOS\n"
             result_text += "─" * 40 + "\n"
+            document.add_text(result_text)
+            document.add_rows(store.duplicate_titles())
             
-            for i, duplicate in enumerate(self.duplicates, 1):
-                result_text += f"{i:4d}. {duplicate}\n"
-            
-            result_text += f"\n⚠️  Total de duplicados: {len(self.duplicates):,} registros\n"
+            result_text = f"\n⚠️  Total de duplicados: {duplicate_count:,} registros\n"
             result_text += "\n💡 RECOMENDAÇÃO: Revise os duplicados antes de prosseguir\n"
         else:
             result_text += "✅ NENHUM DUPLICADO ENCONTRADO\n"
@@ -529,12 +1171,13 @@ class ArticleAnalyzer:
         
         result_text += "\n" + "═" * 70 + "\n"
         result_text += "📤 Use os botões abaixo para exportar os resultados\n"
+        document.add_text(result_text)
         
-        self.results_text.insert(1.0, result_text)
+        self.show_document(document)
     
     def export_all_titles(self):
         """Exporta todos os títulos para CSV"""
-        if not self.all_titles:
+        if self.store is None or not self.store.total_count:
             messagebox.showwarning("Aviso", "Não há dados para exportar.")
             return
         
@@ -546,22 +1189,13 @@ class ArticleAnalyzer:
         
         if file_path:
             try:
-                export_data = []
-                for i, title in enumerate(self.all_titles, 1):
-                    export_data.append({"Número": i, "Título Completo": title})
-                
-                # Adiciona resumo
-                export_data.append({"Número": "", "Título Completo": ""})
-                export_data.append({"Número": "RESUMO:", "Título Completo": f"Total de {len(self.all_titles)} registros"})
-                
-                df_export = pd.DataFrame(export_data)
-                df_export.to_csv(file_path, index=False, encoding='utf-8-sig')
+                exporters.export_all_titles(self.store.all_titles(), file_path)
                 
                 messagebox.showinfo(
                     "Exportação Concluída", 
                     f"Lista completa exportada com sucesso!\n\n"
                     f"Arquivo: {Path(file_path).name}\n"
-                    f"Total de registros: {len(self.all_titles)}"
+                    f"Total de registros: {self.store.total_count}"
                 )
                 
             except Exception as e:
@@ -569,7 +1203,7 @@ class ArticleAnalyzer:
     
     def export_duplicates(self):
         """Exporta apenas os duplicados para CSV"""
-        if not self.duplicates:
+        if self.store is None or not self.store.duplicate_count:
             messagebox.showinfo("Informação", "Não há registros duplicados para exportar.")
             return
         
@@ -581,22 +1215,42 @@ class ArticleAnalyzer:
         
         if file_path:
             try:
-                export_data = []
-                for i, duplicate in enumerate(self.duplicates, 1):
-                    export_data.append({"Número": i, "Registro Duplicado": duplicate})
+                exporters.export_duplicates(self.store.duplicate_titles(), file_path)
                 
-                # Adiciona resumo
-                export_data.append({"Número": "", "Registro Duplicado": ""})
-                export_data.append({"Número": "RESUMO:", "Registro Duplicado": f"Total de {len(self.duplicates)} duplicados"})
+                messagebox.showinfo(
+                    "Exportação Concluída", 
+                    f"Lista de duplicados exportada com sucesso!\n\n"
+                    f"Arquivo: {Path(file_path).name}\n"
+                    f"Total de duplicados: {self.store.duplicate_count}"
+                )
                 
-                df_export = pd.DataFrame(export_data)
-                df_export.to_csv(file_path, index=False, encoding='utf-8-sig')
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao exportar arquivo: {str(e)}")
+    
+    def export_cleaned(self):
+        """Exporta a tabela original com uma linha por grupo de duplicados"""
+        if self.result is None:
+            messagebox.showwarning("Aviso", "Não há dados para exportar.")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Salvar lista limpa",
+            defaultextension=".csv",
+            filetypes=[("Arquivos CSV", "*.csv")]
+        )
+        
+        if file_path:
+            try:
+                before, after = resolve_to_file(self.result, file_path)
+                untitled = self.result.untitled_count
                 
                 messagebox.showinfo(
                     "Exportação Concluída", 
-                    f"Lista de duplicados exportada com sucesso!\n\n"
+                    f"Lista limpa exportada com sucesso!\n\n"
                     f"Arquivo: {Path(file_path).name}\n"
-                    f"Total de duplicados: {len(self.duplicates)}"
+                    f"Total de registros: {after}\n"
+                    f"Duplicados removidos: {before - after}"
+                    + (f"\nSem título (mantidos sem comparação): {untitled}" if untitled else "")
                 )
                 
             except Exception as e:
@@ -0,0 +1,193 @@
+"""
+Normalização de Autores - Analisador de Artigos v2.0
+Forma canônica de listas de autores, independente de ordem e formatação
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from accents import strip_accents
+
+
+# Partículas que fazem parte do sobrenome ("da Silva", "van der Berg")
+SURNAME_PARTICLES = {
+    'da', 'das', 'de', 'del', 'della', 'der', 'di', 'do', 'dos', 'du',
+    'la', 'le', 'van', 'von', 'y'
+}
+# Conjunções que ligam dois sobrenomes ("Silva e Souza", "Ortega y Gasset")
+SURNAME_CONJUNCTIONS = {'e', 'y'}
+AUTHOR_CACHE_SIZE = 200_000
+
+_LIST_SEPARATORS = re.compile(r'\s*;\s*|\s+(?:and|&)\s+', re.IGNORECASE)
+# 'e' também liga sobrenomes ("Maria Silva e Souza"); separa só nomes completos
+_CONJUNCTION = re.compile(r'\s+e\s+', re.IGNORECASE)
+_NAME_TOKENS = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+
+
+def _fold(text):
+    """Remove acentos e converte para minúsculas"""
+    return strip_accents(text).lower()
+
+
+def _looks_like_initials(text):
+    """Indica se o trecho contém só iniciais ou prenomes ('J. A.', 'Joao')"""
+    tokens = _NAME_TOKENS.findall(text)
+    return 0 < len(tokens) <= 3
+
+
+def _is_full_name(text):
+    """Indica se o trecho tem ao menos sobrenome e prenome (dois tokens)"""
+    return len(_NAME_TOKENS.findall(text)) >= 2
+
+
+def _split_conjunction(part):
+    """Divide no 'e' só quando os dois lados são nomes completos"""
+    names = []
+    for piece in _CONJUNCTION.split(part):
+        if names and _is_full_name(names[-1]) and _is_full_name(piece):
+            names.append(piece)
+        elif names:
+            names[-1] = f"{names[-1]} e {piece}"
+        else:
+            names.append(piece)
+    return names
+
+
+def _is_vancouver(tokens):
+    """
+    Indica se o nome termina em iniciais coladas ('Smith J', 'van der Berg JA')
+
+    Uma só maiúscula é sempre inicial. Duas ou três ('LI', 'JA') também
+    podem ser um sobrenome em caixa alta ('Joao LI'), então só contam como
+    iniciais depois de um sobrenome de dois tokens ou mais.
+    """
+    if len(tokens) < 2:
+        return False
+    initials = tokens[-1]
+    if len(initials) > 3 or not initials.isupper():
+        return False
+    return len(initials) == 1 or len(tokens) >= 3
+
+
+def parse_author_name(name):
+    """
+    Separa um nome em (sobrenome, inicial do prenome)
+
+    Aceita 'Silva, J. A.', 'J. A. Silva' e 'SILVA, Joao'; todos resultam
+    em ('silva', 'j'). Retorna None quando não há nome reconhecível.
+    """
+    original = _NAME_TOKENS.findall(name)
+    name = _fold(name.strip())
+    if ',' not in name and _is_vancouver(original):
+        # Estilo Vancouver: 'Smith JA'
+        tokens = _NAME_TOKENS.findall(name)
+        return ' '.join(tokens[:-1]), tokens[-1][0]
+
+    if ',' in name:
+        surname_part, _, given_part = name.partition(',')
+        surname = _NAME_TOKENS.findall(surname_part)
+        given = _NAME_TOKENS.findall(given_part)
+    else:
+        tokens = _NAME_TOKENS.findall(name)
+        if not tokens:
+            return None
+        # Sobrenome é o último token, com as partículas que o antecedem
+        start = len(tokens) - 1
+        while start > 0:
+            if start > 2 and tokens[start - 1] in SURNAME_CONJUNCTIONS:
+                start -= 2
+            elif tokens[start - 1] in SURNAME_PARTICLES:
+                start -= 1
+            else:
+                break
+        surname, given = tokens[start:], tokens[:start]
+
+    if not surname:
+        return None
+    return ' '.join(surname), given[0][0] if given else ''
+
+
+def split_author_list(raw):
+    """Divide uma lista de autores em nomes individuais"""
+    parts = [
+        name for part in _LIST_SEPARATORS.split(raw) if part.strip()
+        for name in _split_conjunction(part)
+    ]
+    if len(parts) != 1 or ',' not in raw:
+        return parts
+
+    if raw.count(',') == 1:
+        # "Silva, J." é um nome invertido; "J. Silva, M. Souza" são dois nomes
+        before, after = raw.split(',')
+        initials = [
+            token for token in _NAME_TOKENS.findall(before)
+            if len(token) == 1 and token.lower() not in SURNAME_CONJUNCTIONS
+        ]
+        if initials and after.strip():
+            return [before, after]
+        return parts
+
+    # Sem ';' nem 'and': "Silva, J., Souza, M." ou "J. Silva, M. Souza"
+    pieces = [piece.strip() for piece in raw.split(',') if piece.strip()]
+    if len(pieces) % 2 == 0 and all(_looks_like_initials(p) for p in pieces[1::2]):
+        return [f"{pieces[i]}, {pieces[i + 1]}" for i in range(0, len(pieces), 2)]
+    return pieces
+
+
+def explode_author_lists(lists):
+    """
+    Autores de cada lista distinta, um por linha
+
+    Retorna um DataFrame com a posição da lista em lists ('lista'), o nome
+    como escrito ('nome') e a forma 'sobrenome inicial' ('chave'). Um
+    autor repetido na mesma lista aparece uma vez; trechos sem nome
+    reconhecível são descartados.
+    """
+    names = pd.Series([split_author_list(str(text)) for text in lists], dtype=object).explode()
+    names = names.dropna().str.strip()
+    names = names[names != '']
+
+    canonical = {}
+    for name in names.unique():
+        parsed = parse_author_name(name)
+        canonical[name] = ' '.join(filter(None, parsed)) if parsed else None
+
+    frame = pd.DataFrame({
+        'lista': names.index.to_numpy(),
+        'nome': names.to_numpy(),
+        'chave': names.map(canonical).to_numpy(),
+    }).dropna(subset=['chave'])
+    return frame.drop_duplicates(['lista', 'chave'], ignore_index=True)
+
+
+@lru_cache(maxsize=AUTHOR_CACHE_SIZE)
+def normalize_author_list(raw):
+    """
+    Forma canônica de uma lista de autores: 'sobrenome inicial' ordenados
+
+    Memoizada por texto bruto, pois os mesmos valores se repetem muito.
+    """
+    names = set()
+    for part in split_author_list(raw):
+        parsed = parse_author_name(part)
+        if parsed:
+            names.add(' '.join(filter(None, parsed)))
+    return '; '.join(sorted(names))
+
+
+def normalize_authors(series):
+    """
+    Normaliza uma coluna de autores
+
+    Cada texto distinto é processado uma única vez; o resultado é
+    redistribuído às linhas pelos códigos do factorize.
+    """
+    codes, uniques = pd.factorize(series)
+    # O último elemento vazio atende aos valores ausentes (código -1)
+    normalized = np.array(
+        [normalize_author_list(str(value)) for value in uniques] + [''], dtype=object
+    )
+    return pd.Series(normalized[codes], index=series.index, dtype=object)
@@ -0,0 +1,151 @@
+"""
+Estatísticas Bibliométricas - Analisador de Artigos v2.0
+Registros por autor, ano, periódico e fonte, agregados uma vez por análise
+"""
+
+import pandas as pd
+
+from authors import explode_author_lists
+from columns import find_journal_and_source_columns, find_year_column
+
+
+STATS_TOP_N = 20   # Itens exibidos por dimensão
+SORT_ORDERS = {
+    'contagem': "mais frequentes primeiro",
+    'nome': "ordem alfabética (anos em ordem cronológica)",
+}
+DIMENSIONS = {
+    'autor': "Autores",
+    'ano': "Anos",
+    'periodico': "Periódicos",
+    'fonte': "Fontes",
+}
+
+
+def _value_counts(series):
+    """Registros por valor, sem vazios, do mais para o menos frequente"""
+    values = series.dropna().astype(str).str.strip()
+    return values[values != ''].value_counts()
+
+
+def year_counts(series):
+    """Registros por ano, com o ano extraído de textos como '2020-05' ou '2020.0'"""
+    years = series.dropna().astype(str).str.extract(r'(\d{4})', expand=False)
+    return years.dropna().value_counts()
+
+
+def author_counts(series):
+    """
+    Registros por autor, separando as listas de autores de cada linha
+
+    Cada lista distinta é dividida uma única vez e pesa o número de linhas
+    em que aparece. Grafias do mesmo nome ('Silva, J.' e 'J. Silva')
+    contam juntas e são exibidas na grafia da lista mais frequente.
+    """
+    lists = _value_counts(series)
+    if lists.empty:
+        return pd.Series(dtype='int64')
+
+    frame = explode_author_lists(lists.index)
+    frame['registros'] = lists.to_numpy()[frame['lista'].to_numpy()]
+
+    grouped = frame.groupby('chave', sort=False).agg(
+        nome=('nome', 'first'), registros=('registros', 'sum')
+    )
+    counts = pd.Series(grouped['registros'].to_numpy(), index=grouped['nome'].to_numpy())
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+class BibliometricStats:
+    """
+    Contagens por dimensão de uma análise
+
+    Os agregados são calculados no construtor; top() apenas recorta e
+    ordena as séries prontas, então trocar a ordem ou reexibir não refaz
+    as contagens.
+    """
+
+    def __init__(self, counts, columns, total):
+        self.counts = counts
+        self.columns = columns
+        self.total = total
+
+    @property
+    def dimensions(self):
+        """Dimensões com dados, na ordem de exibição"""
+        return [dim for dim in DIMENSIONS if dim in self.counts]
+
+    def top(self, dimension, n=STATS_TOP_N, order='contagem'):
+        """Os n itens mais frequentes como lista de (valor, registros)"""
+        top = self.counts[dimension].head(n)
+        if order == 'nome':
+            top = top.sort_index(kind='stable')
+        return list(zip(top.index, top.to_numpy().tolist()))
+
+    def distinct(self, dimension):
+        """Quantidade de valores distintos na dimensão"""
+        return len(self.counts[dimension])
+
+    def to_dict(self):
+        """Contagens como dados JSON (valor, registros), na ordem das séries"""
+        return {
+            'colunas': self.columns,
+            'total': self.total,
+            'contagens': {
+                dim: [[str(value), int(count)] for value, count in series.items()]
+                for dim, series in self.counts.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstrói as estatísticas gravadas por to_dict"""
+        counts = {
+            dim: pd.Series(
+                [count for _, count in pairs], index=[value for value, _ in pairs], dtype='int64'
+            )
+            for dim, pairs in data['contagens'].items()
+        }
+        return cls(counts, data['colunas'], data['total'])
+
+
+def compute_statistics(df, author_col=None):
+    """Agrega as colunas de autor, ano, periódico e fonte presentes na tabela"""
+    year_col = find_year_column(df.columns)
+    journal_col, source_col = find_journal_and_source_columns(df.columns)
+
+    columns = {
+        'autor': author_col,
+        'ano': year_col,
+        'periodico': journal_col,
+        'fonte': source_col,
+    }
+    aggregators = {
+        'autor': author_counts,
+        'ano': year_counts,
+        'periodico': _value_counts,
+        'fonte': _value_counts,
+    }
+    counts = {
+        dim: aggregators[dim](df[col]) for dim, col in columns.items() if col is not None
+    }
+    return BibliometricStats(counts, {dim: columns[dim] for dim in counts}, len(df))
+
+
+def describe_statistics(stats, n=STATS_TOP_N, order='contagem'):
+    """Texto das estatísticas para o usuário"""
+    if not stats.dimensions:
+        return "Nenhuma coluna de autor, ano, periódico ou fonte foi encontrada."
+
+    lines = []
+    for dim in stats.dimensions:
+        lines.append(
+            f"{DIMENSIONS[dim]} (coluna '{stats.columns[dim]}', "
+            f"{stats.distinct(dim):,} distintos)"
+        )
+        lines.append("─" * 40)
+        for value, count in stats.top(dim, n, order):
+            share = count / stats.total if stats.total else 0.0
+            lines.append(f"{count:8,}  {share:6.1%}  {value}")
+        lines.append("")
+    return "\n".join(lines).rstrip()
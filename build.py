@@ -42,7 +42,7 @@ def install_dependencies():
     """Instala dependências necessárias"""
     print("\n📦 Instalando dependências...")
     
-    dependencies = ['pandas', 'pyinstaller']
+    dependencies = ['pandas', 'openpyxl', 'pyinstaller']
     
     for dep in dependencies:
         try:
@@ -0,0 +1,194 @@
+"""
+Checkpoints de Análise - Analisador de Artigos v2.0
+Permite reanalisar apenas as linhas acrescentadas ao final de um CSV
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.errors import EmptyDataError
+
+from loaders import csv_layout
+from storage import app_data_dir
+
+
+CHECKPOINT_VERSION = 3
+HEAD_BYTES = 64 * 1024     # Início do arquivo: detecta reescrita completa
+TAIL_BYTES = 4 * 1024      # Trecho antes do offset: detecta edição no final
+MANIFEST_NAME = 'manifesto.json'
+
+
+def checkpoint_folder(file_path):
+    """Pasta dos checkpoints de um arquivo (manifesto, partes e contagens)"""
+    digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+    return app_data_dir('checkpoints', digest)
+
+
+def _digest(handle, start, length):
+    """Hash de um trecho do arquivo"""
+    handle.seek(start)
+    return hashlib.sha1(handle.read(length)).hexdigest()
+
+
+def _file_marks(handle, offset):
+    """Hashes do início do arquivo e do trecho que termina no offset"""
+    tail_start = max(0, offset - TAIL_BYTES)
+    return {
+        'head': _digest(handle, 0, min(HEAD_BYTES, offset)),
+        'tail': _digest(handle, tail_start, offset - tail_start),
+    }
+
+
+def _read_manifest(folder):
+    try:
+        with open(folder / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(file_path, state, encoding, options, append=False):
+    """
+    Grava o estado da análise e o offset até onde o arquivo foi lido
+
+    O estado traz só o que mudou: state['part'] tem as linhas, os códigos e
+    as chaves distintas novas, gravados em uma parte própria; as partes
+    anteriores continuam como estão. Com append, a parte se soma às do
+    checkpoint atual; sem ele, substitui todas. As contagens (uma por
+    chave distinta) são regravadas inteiras. Só grava quando o arquivo
+    termina em quebra de linha, para que o próximo trecho acrescentado
+    comece sempre em uma linha nova.
+    """
+    folder = checkpoint_folder(file_path)
+
+    with open(file_path, 'rb') as handle:
+        offset = handle.seek(0, os.SEEK_END)
+        if offset == 0:
+            return False
+        handle.seek(offset - 1)
+        if handle.read(1) != b'\n':
+            return False
+        marks = _file_marks(handle, offset)
+
+    current = _read_manifest(folder)
+    if current is not None and current.get('version') != CHECKPOINT_VERSION:
+        current = None
+    if append and current is None:
+        return False
+    generation = current['geracao'] + 1 if current else 1
+    parts = current['partes'] if append else []
+
+    # Arquivos novos têm nomes novos e o manifesto entra por último: uma
+    # interrupção no meio deixa o checkpoint anterior inteiro
+    part_name = f'parte_{generation}.pkl'
+    counts_name = f'contagens_{generation}.npy'
+    _replace_with(folder / part_name, lambda path: pd.to_pickle(state['part'], path))
+    _replace_with(folder / counts_name, lambda path: _save_array(path, state['counts']))
+
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'file': os.path.abspath(file_path),
+        'offset': offset,
+        'row_count': state['row_count'],
+        'encoding': encoding,
+        'options': options,
+        'columns': state['columns'],
+        'roles': state['roles'],
+        'geracao': generation,
+        'partes': parts + [part_name],
+        'contagens': counts_name,
+        **marks,
+    }
+    _replace_with(folder / MANIFEST_NAME,
+                  lambda path: path.write_text(json.dumps(meta), encoding='utf-8'))
+
+    # Partes e contagens que o novo manifesto não usa mais
+    keep = set(meta['partes']) | {counts_name, MANIFEST_NAME}
+    for path in folder.iterdir():
+        if path.name not in keep and not path.name.endswith('.tmp'):
+            path.unlink(missing_ok=True)
+    return True
+
+
+def _save_array(path, values):
+    with open(path, 'wb') as f:
+        np.save(f, np.asarray(values))
+
+
+def _replace_with(path, write):
+    """Grava em um arquivo temporário e o troca pelo definitivo de uma vez"""
+    temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def _load_parts(folder, meta):
+    """Junta as partes gravadas em tabela, linhas sem título, códigos e chaves"""
+    parts = [pd.read_pickle(folder / name) for name in meta['partes']]
+    return {
+        'df': pd.concat([part['df'] for part in parts]),
+        'untitled': pd.concat([part['untitled'] for part in parts]),
+        'codes': np.concatenate([part['codes'] for part in parts]),
+        'uniques': pd.Index(np.concatenate([part['uniques'] for part in parts]), dtype=object),
+        'counts': np.load(folder / meta['contagens'], allow_pickle=False),
+    }
+
+
+def load_checkpoint(file_path, options):
+    """
+    Retorna (manifesto, estado) se o arquivo só cresceu desde o checkpoint
+
+    Retorna None quando não há checkpoint, as opções mudaram, o conteúdo
+    já lido foi alterado ou as partes não correspondem ao manifesto.
+    """
+    folder = checkpoint_folder(file_path)
+    meta = _read_manifest(folder)
+    if meta is None:
+        return None
+    if meta.get('version') != CHECKPOINT_VERSION or meta.get('options') != options:
+        return None
+
+    offset = meta['offset']
+    with open(file_path, 'rb') as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size < offset or _file_marks(handle, offset) != {'head': meta['head'], 'tail': meta['tail']}:
+            return None
+
+    meta['appended_bytes'] = size - offset
+    try:
+        state = _load_parts(folder, meta)
+    except Exception:
+        return None
+    # Partes incompletas contariam duplicados errados
+    if len(state['codes']) != len(state['df']) or len(state['counts']) != len(state['uniques']) \
+            or int(state['counts'].sum()) != len(state['codes']):
+        return None
+    state['row_count'] = meta['row_count']
+    state['columns'] = meta['columns']
+    state['roles'] = tuple(meta['roles'])
+    return meta, state
+
+
+def read_appended_rows(file_path, meta, columns):
+    """
+    Lê apenas as linhas acrescentadas depois do offset do checkpoint
+
+    DOI e ISBN são lidos como texto, como na leitura completa (csv_layout).
+    """
+    if meta['appended_bytes'] == 0:
+        return pd.DataFrame(columns=columns)
+
+    dtype = csv_layout(file_path, meta['encoding']).get('dtype')
+    with open(file_path, 'rb') as handle:
+        handle.seek(meta['offset'])
+        try:
+            return pd.read_csv(handle, header=None, names=columns, encoding=meta['encoding'],
+                               dtype=dtype)
+        except EmptyDataError:
+            return pd.DataFrame(columns=columns)
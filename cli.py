@@ -0,0 +1,378 @@
+"""
+Linha de Comando - Analisador de Artigos v2.0
+Modos sem interface gráfica do analisador
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+
+
+def filter_argument(text):
+    """Converte --filter em RowFilter, com a mensagem do erro no uso inválido"""
+    from filters import FilterError, parse_filter
+
+    try:
+        return parse_filter(text)
+    except FilterError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def memory_argument(text):
+    """Converte --max-memory em bytes, com a mensagem do erro no uso inválido"""
+    from external import parse_memory
+
+    try:
+        size = parse_memory(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"Tamanho de memória inválido: {text}")
+    return size
+
+
+def cmd_watch(args):
+    """Monitora uma pasta e analisa os arquivos colocados nela"""
+    from watcher import FolderWatcher
+
+    watcher = FolderWatcher(
+        args.folder,
+        workers=args.workers,
+        settle_seconds=args.settle,
+        poll_interval=args.interval,
+        use_events=not args.polling,
+        incremental=args.incremental
+    )
+    try:
+        watcher.run_forever()
+    except KeyboardInterrupt:
+        watcher.stop()
+    return 0
+
+
+def cmd_serve(args):
+    """Executa o serviço HTTP local de análise"""
+    from service import serve
+
+    try:
+        serve(args.host, args.port, args.workers, args.queue_size, args.work_dir, args.job_ttl)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_analyze(args):
+    """Analisa um único arquivo, usando vários processos em arquivos grandes"""
+    from analysis import AnalysisError, analyze_path
+    from exporters import write_results_beside
+    from external import analyze_external, supports_external
+    from loaders import available_memory, exceeds_memory, memory_budget
+    from session import SessionError, save_session
+
+    free_memory = available_memory()
+    try:
+        if args.max_memory:
+            if args.incremental:
+                print(f"{args.file}: ERRO - --incremental não vale com --max-memory")
+                return 1
+            if not supports_external(args.file):
+                print(f"{args.file}: ERRO - --max-memory aceita apenas CSV, BibTeX e RIS")
+                return 1
+            summary = analyze_external(
+                args.file, args.max_memory, spill_dir=args.spill_dir,
+                row_filter=args.filter
+            )
+        elif not (args.save_session or args.incremental) and supports_external(args.file) and \
+                exceeds_memory(os.path.getsize(args.file), free_memory):
+            # A tabela inteira não cabe: partições em disco com o orçamento da memória livre
+            budget = memory_budget(free_memory)
+            print(f"{args.file}: maior que a memória livre, usando partições em disco "
+                  f"({budget // (1024 * 1024)} MB)")
+            summary = analyze_external(
+                args.file, budget, spill_dir=args.spill_dir, row_filter=args.filter
+            )
+        else:
+            # A sessão guarda a tabela inteira; sem ela, bastam as colunas mapeadas
+            result = analyze_path(
+                args.file, sheet=args.sheet, workers=args.workers, row_filter=args.filter,
+                only_mapped=not args.save_session, incremental=args.incremental
+            )
+            summary = write_results_beside(args.file, result)
+            if args.save_session:
+                options = {'filtro': args.filter.describe()} if args.filter else None
+                folder = save_session(
+                    result, args.save_session, source_path=args.file, options=options
+                )
+                print(f"Sessão salva em {folder}")
+    except AnalysisError as e:
+        print(f"{args.file}: ERRO - {e.message}")
+        return 1
+    except SessionError as e:
+        print(f"{args.file}: ERRO - {e}")
+        return 1
+    print(f"{args.file}: {summary['total']} registros, {summary['duplicados']} duplicados")
+    return 0
+
+
+def cmd_session(args):
+    """Mostra o resumo de uma sessão salva"""
+    from session import SessionError, describe_session, read_manifest
+
+    try:
+        manifest = read_manifest(args.path)
+    except SessionError as e:
+        print(f"ERRO - {e}")
+        return 1
+    print(describe_session(manifest))
+    return 0
+
+
+def cmd_mappings(args):
+    """Lista ou apaga os mapeamentos de colunas salvos"""
+    from mappings import clear_mappings, describe_mappings, forget_mapping
+
+    if args.forget:
+        columns = forget_mapping(args.forget)
+        if columns is None:
+            print(f"{args.forget}: nenhum layout, ou mais de um, com esta assinatura.")
+            return 1
+        print(f"Layout apagado: {', '.join(columns)}")
+    elif args.clear:
+        print(f"{clear_mappings()} mapeamentos apagados.")
+    else:
+        print(describe_mappings())
+    return 0
+
+
+def cmd_preview(args):
+    """Estimativa rápida de únicos e taxa de repetição"""
+    from analysis import AnalysisError
+    from preview import describe_preview, quick_preview
+
+    try:
+        preview = quick_preview(args.file, max_rows=args.max_rows)
+    except AnalysisError as e:
+        print(f"{args.file}: ERRO - {e.message}")
+        return 1
+    print(describe_preview(preview))
+    return 0
+
+
+def cmd_stats(args):
+    """Registros por autor, ano, periódico e fonte"""
+    from analysis import AnalysisError, analyze_path
+    from bibliometrics import describe_statistics
+
+    try:
+        result = analyze_path(args.file, sheet=args.sheet, row_filter=args.filter)
+    except AnalysisError as e:
+        print(f"{args.file}: ERRO - {e.message}")
+        return 1
+    print(describe_statistics(result.statistics(), n=args.top, order=args.order))
+    return 0
+
+
+def cmd_coauthors(args):
+    """Rede de coautoria: resumo na tela e lista de arestas em CSV"""
+    from analysis import AnalysisError, analyze_path
+    from coauthors import coauthor_network, describe_network
+    from exporters import COAUTHOR_SUFFIX, output_path
+
+    try:
+        result = analyze_path(args.file, sheet=args.sheet, row_filter=args.filter)
+        network = coauthor_network(result)
+    except AnalysisError as e:
+        print(f"{args.file}: ERRO - {e.message}")
+        return 1
+    except ValueError as e:
+        print(f"{args.file}: ERRO - {e}")
+        return 1
+
+    target = args.output or output_path(args.file, COAUTHOR_SUFFIX)
+    network.edges().to_csv(target, index=False, encoding='utf-8')
+    print(describe_network(network, n=args.top))
+    print(f"\nArestas gravadas em {target}")
+    return 0
+
+
+def cmd_compare(args):
+    """Compara duas listas: só em A, só em B e em ambas"""
+    from analysis import AnalysisError
+    from compare import compare_files, describe_comparison
+
+    try:
+        summary = compare_files(
+            args.list_a, args.list_b, output_dir=args.output_dir,
+            sheet_a=args.sheet_a, sheet_b=args.sheet_b
+        )
+    except AnalysisError as e:
+        print(f"ERRO - {e.message}")
+        return 1
+    print(describe_comparison(summary))
+    return 0
+
+
+def cmd_resolve(args):
+    """Grava a tabela sem duplicados, uma linha canônica por grupo"""
+    from analysis import AnalysisError, analyze_path
+    from exporters import RESOLVED_SUFFIX, output_path
+    from resolve import parse_rules, resolve_to_file
+
+    try:
+        rules = parse_rules(args.rules)
+        result = analyze_path(args.file, sheet=args.sheet, row_filter=args.filter)
+    except ValueError as e:
+        print(f"ERRO - {e}")
+        return 1
+    except AnalysisError as e:
+        print(f"{args.file}: ERRO - {e.message}")
+        return 1
+
+    target = args.output or output_path(args.file, RESOLVED_SUFFIX)
+    before, after = resolve_to_file(result, target, rules, merge_fields=not args.no_merge)
+    summary = f"{before - after} duplicados removidos"
+    if result.untitled_count:
+        summary += f"; {result.untitled_count} sem título mantidos sem comparação"
+    print(f"{target}: {after} registros ({summary})")
+    return 0
+
+
+def cmd_batch(args):
+    """Analisa uma lista de arquivos e pastas de uma vez"""
+    from pipeline import run_pipeline
+
+    results = run_pipeline(args.paths, workers=args.workers)
+    failures = 0
+    for path, summary, error in results:
+        if error:
+            failures += 1
+            print(f"{path}: ERRO - {error}")
+        else:
+            print(f"{path}: {summary['total']} registros, {summary['duplicados']} duplicados")
+    return 1 if failures else 0
+
+
+def build_parser():
+    """Monta o parser de argumentos com um subcomando por modo"""
+    parser = argparse.ArgumentParser(
+        prog='analisador',
+        description="Analisador de Artigos e Livros - modos sem interface"
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help="mostra mensagens de depuração")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    watch = commands.add_parser('watch', help="analisa automaticamente os arquivos de uma pasta")
+    watch.add_argument('folder', help="pasta monitorada")
+    watch.add_argument('--workers', type=int, default=None, help="processos de análise (padrão: núcleos)")
+    watch.add_argument('--settle', type=float, default=2.0,
+                       help="segundos sem mudança para considerar o arquivo completo")
+    watch.add_argument('--interval', type=float, default=1.0, help="intervalo de verificação em segundos")
+    watch.add_argument('--polling', action='store_true', help="força varredura periódica em vez de eventos")
+    watch.add_argument('--incremental', action='store_true',
+                       help="guarda checkpoints: CSVs que só crescem têm apenas as linhas novas lidas")
+    watch.set_defaults(func=cmd_watch)
+
+    serve_cmd = commands.add_parser('serve', help="serviço HTTP local com fila de análises")
+    serve_cmd.add_argument('--host', default='127.0.0.1', help="endereço de escuta (padrão: 127.0.0.1)")
+    serve_cmd.add_argument('--port', type=int, default=8765, help="porta (padrão: 8765)")
+    serve_cmd.add_argument('--workers', type=int, default=None, help="processos de análise (padrão: núcleos)")
+    serve_cmd.add_argument('--queue-size', type=int, default=64, help="tarefas simultâneas aceitas")
+    serve_cmd.add_argument('--work-dir', default=None, help="pasta para arquivos das tarefas")
+    serve_cmd.add_argument('--job-ttl', type=int, default=3600,
+                           help="segundos que uma tarefa concluída e seus arquivos são mantidos")
+    serve_cmd.set_defaults(func=cmd_serve)
+
+    analyze = commands.add_parser('analyze', help="analisa um arquivo e grava os resultados ao lado dele")
+    analyze.add_argument('file', help="arquivo a analisar")
+    analyze.add_argument('--sheet', default=None, help="aba da planilha Excel")
+    analyze.add_argument('--workers', type=int, default=None,
+                         help="processos na detecção de duplicados (padrão: núcleos em arquivos grandes)")
+    analyze.add_argument('--max-memory', type=memory_argument, default=None,
+                         help="limite de memória (ex.: 2G); listas maiores usam partições em disco")
+    analyze.add_argument('--spill-dir', default=None, help="pasta temporária das partições")
+    analyze.add_argument('--incremental', action='store_true',
+                         help="guarda um checkpoint: da próxima vez, só as linhas novas do CSV são lidas")
+    analyze.add_argument('--save-session', default=None,
+                         help="grava a análise em uma pasta .sessao, reaberta sem reler o arquivo")
+    analyze.add_argument('--filter', type=filter_argument, default=None,
+                         help="só registros que atendem ao filtro (ex.: 'ano:2015-2024 tipo:artigo idioma:en')")
+    analyze.set_defaults(func=cmd_analyze)
+
+    session = commands.add_parser('session', help="mostra o resumo de uma sessão salva")
+    session.add_argument('path', help="pasta .sessao")
+    session.set_defaults(func=cmd_session)
+
+    mappings = commands.add_parser('mappings', help="mapeamentos de colunas salvos por layout de cabeçalho")
+    mappings.add_argument('--clear', action='store_true', help="apaga todos os mapeamentos")
+    mappings.add_argument('--forget', metavar='ASSINATURA',
+                          help="apaga só o layout com esta assinatura (início mostrado na lista)")
+    mappings.set_defaults(func=cmd_mappings)
+
+    preview = commands.add_parser('preview', help="estimativa rápida de duplicados com memória fixa")
+    preview.add_argument('file', help="arquivo CSV, BibTeX ou RIS")
+    preview.add_argument('--max-rows', type=int, default=None, help="lê apenas as primeiras N linhas")
+    preview.set_defaults(func=cmd_preview)
+
+    stats = commands.add_parser('stats', help="registros por autor, ano, periódico e fonte")
+    stats.add_argument('file', help="arquivo a analisar")
+    stats.add_argument('--top', type=int, default=20, help="itens por dimensão (padrão: 20)")
+    stats.add_argument('--order', choices=('contagem', 'nome'), default='contagem',
+                       help="ordem dos itens: contagem ou nome")
+    stats.add_argument('--sheet', default=None, help="aba da planilha Excel")
+    stats.add_argument('--filter', type=filter_argument, default=None,
+                       help="só registros que atendem ao filtro (ex.: 'ano:2015-2024 tipo:artigo idioma:en')")
+    stats.set_defaults(func=cmd_stats)
+
+    coauthors = commands.add_parser('coauthors', help="rede de coautoria e lista de arestas")
+    coauthors.add_argument('file', help="arquivo a analisar")
+    coauthors.add_argument('--top', type=int, default=10, help="autores e pares exibidos (padrão: 10)")
+    coauthors.add_argument('--output', default=None, help="arquivo de arestas (padrão: ARQUIVO.coautoria.csv)")
+    coauthors.add_argument('--sheet', default=None, help="aba da planilha Excel")
+    coauthors.add_argument('--filter', type=filter_argument, default=None,
+                           help="só registros que atendem ao filtro (ex.: 'ano:2015-2024 tipo:artigo idioma:en')")
+    coauthors.set_defaults(func=cmd_coauthors)
+
+    compare = commands.add_parser('compare', help="compara duas listas (só em A, só em B, em ambas)")
+    compare.add_argument('list_a', help="lista de referência (A)")
+    compare.add_argument('list_b', help="lista comparada (B)")
+    compare.add_argument('--output-dir', default=None, help="pasta dos resultados (padrão: pasta de B)")
+    compare.add_argument('--sheet-a', default=None, help="aba da planilha Excel de A")
+    compare.add_argument('--sheet-b', default=None, help="aba da planilha Excel de B")
+    compare.set_defaults(func=cmd_compare)
+
+    resolve = commands.add_parser('resolve', help="grava a lista sem duplicados, com todas as colunas")
+    resolve.add_argument('file', help="arquivo a limpar")
+    resolve.add_argument('--rules', default='doi,completo,primeiro',
+                         help="prioridade da linha mantida: primeiro, completo, doi, recente "
+                              "(padrão: doi,completo,primeiro)")
+    resolve.add_argument('--no-merge', action='store_true',
+                         help="não completa campos vazios com os das linhas descartadas")
+    resolve.add_argument('--output', default=None, help="arquivo de saída (padrão: ARQUIVO.limpo.csv)")
+    resolve.add_argument('--sheet', default=None, help="aba da planilha Excel")
+    resolve.add_argument('--filter', type=filter_argument, default=None,
+                         help="só registros que atendem ao filtro (ex.: 'ano:2015-2024 tipo:artigo idioma:en')")
+    resolve.set_defaults(func=cmd_resolve)
+
+    batch = commands.add_parser('batch', help="analisa arquivos e pastas de uma vez (aceita .gz, .bz2, .xz)")
+    batch.add_argument('paths', nargs='+', help="arquivos ou pastas")
+    batch.add_argument('--workers', type=int, default=None, help="processos de análise (padrão: núcleos)")
+    batch.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s %(levelname)s %(message)s'
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Rede de Coautoria - Analisador de Artigos v2.0
+Coautorias, autores mais conectados e componentes a partir de matrizes esparsas
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+except ImportError:
+    sparse = None
+
+from authors import explode_author_lists
+
+
+NETWORK_TOP_N = 10   # Autores e pares exibidos no resumo
+
+
+class AuthorIncidence:
+    """
+    Matriz esparsa lista de autores x autor, em formato de coordenadas
+
+    As linhas são as listas de autores distintas, cada uma com o número de
+    artigos em que aparece (weights); assim 1M de artigos com listas
+    repetidas viram bem menos linhas. As colunas são os autores pela forma
+    'sobrenome inicial', exibidos na grafia encontrada primeiro.
+    """
+
+    def __init__(self, series):
+        lists = series.dropna().astype(str).str.strip()
+        lists = lists[lists != ''].value_counts()
+        frame = explode_author_lists(lists.index)
+
+        author_codes, _ = pd.factorize(frame['chave'])
+        first = pd.Series(author_codes).drop_duplicates()
+        self.labels = frame['nome'].to_numpy()[first.index.to_numpy()]
+        self.list_ids = frame['lista'].to_numpy()
+        self.author_ids = author_codes
+        self.weights = lists.to_numpy().astype(np.int64)
+        self.paper_count = int(self.weights.sum())
+
+    @property
+    def author_count(self):
+        return len(self.labels)
+
+    def papers_per_author(self):
+        """Artigos de cada autor"""
+        return np.bincount(
+            self.author_ids, weights=self.weights[self.list_ids], minlength=self.author_count
+        ).astype(np.int64)
+
+    def coauthor_pairs(self):
+        """
+        Pares de coautores (a < b) e o número de artigos em comum
+
+        Com scipy, é o triângulo superior de Bᵀ·W·B, com B a incidência e W
+        os pesos das listas. Sem scipy, os pares de cada lista são gerados
+        de forma vetorizada e somados pela chave a * autores + b; em
+        nenhum dos casos há matriz densa.
+        """
+        if sparse is not None:
+            incidence = sparse.csr_matrix(
+                (np.ones(len(self.list_ids), dtype=np.int64), (self.list_ids, self.author_ids)),
+                shape=(len(self.weights), self.author_count)
+            )
+            product = incidence.T @ sparse.diags(self.weights) @ incidence
+            pairs = sparse.triu(product, k=1).tocoo()
+            return pairs.row.astype(np.int64), pairs.col.astype(np.int64), pairs.data.astype(np.int64)
+        return self._coauthor_pairs_numpy()
+
+    def _coauthor_pairs_numpy(self):
+        order = np.argsort(self.list_ids, kind='stable')
+        lists = self.list_ids[order]
+        authors = self.author_ids[order].astype(np.int64)
+
+        # Cada entrada forma par com as entradas seguintes da mesma lista
+        sizes = np.bincount(lists, minlength=len(self.weights))
+        ends = np.cumsum(sizes)[lists]
+        followers = ends - np.arange(len(lists)) - 1
+        total = int(followers.sum())
+        if not total:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+
+        left = np.repeat(np.arange(len(lists)), followers)
+        offsets = np.cumsum(followers) - followers
+        right = left + 1 + np.arange(total) - np.repeat(offsets, followers)
+
+        a, b = authors[left], authors[right]
+        keys = np.minimum(a, b) * self.author_count + np.maximum(a, b)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=self.weights[lists[left]]).astype(np.int64)
+        return unique_keys // self.author_count, unique_keys % self.author_count, counts
+
+
+def component_labels(node_count, a, b):
+    """
+    Componente conexo de cada autor
+
+    Com scipy usa csgraph; sem ele, cada aresta liga as raízes das suas
+    pontas à menor delas e os caminhos são encurtados até estabilizar.
+    """
+    if sparse is not None:
+        graph = sparse.coo_matrix(
+            (np.ones(len(a), dtype=np.int8), (a, b)), shape=(node_count, node_count)
+        )
+        _, labels = connected_components(graph, directed=False)
+        return labels
+
+    parent = np.arange(node_count)
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        if np.array_equal(root_a, root_b):
+            break
+        low = np.minimum(root_a, root_b)
+        np.minimum.at(parent, root_a, low)
+        np.minimum.at(parent, root_b, low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    return pd.factorize(parent)[0]
+
+
+class CoauthorNetwork:
+    """Rede de coautoria: arestas, grau de cada autor e componentes"""
+
+    def __init__(self, incidence):
+        self.labels = incidence.labels
+        self.paper_count = incidence.paper_count
+        self.papers = incidence.papers_per_author()
+        self.a, self.b, self.weights = incidence.coauthor_pairs()
+
+        count = incidence.author_count
+        self.degree = np.bincount(np.concatenate([self.a, self.b]), minlength=count)
+        self.collaborations = (
+            np.bincount(self.a, weights=self.weights, minlength=count)
+            + np.bincount(self.b, weights=self.weights, minlength=count)
+        ).astype(np.int64)
+        self.components = component_labels(count, self.a, self.b)
+
+    @property
+    def author_count(self):
+        return len(self.labels)
+
+    @property
+    def edge_count(self):
+        return len(self.a)
+
+    def component_sizes(self):
+        """Tamanho de cada componente, do maior para o menor"""
+        return np.sort(np.bincount(self.components))[::-1]
+
+    def edges(self):
+        """Lista de arestas (autor_a, autor_b, artigos), das mais fortes para as mais fracas"""
+        order = np.lexsort((self.b, self.a, -self.weights))
+        return pd.DataFrame({
+            'autor_a': self.labels[self.a[order]],
+            'autor_b': self.labels[self.b[order]],
+            'artigos': self.weights[order],
+        })
+
+    def top_authors(self, n=NETWORK_TOP_N):
+        """Autores com mais coautores distintos: (nome, coautores, artigos)"""
+        order = np.lexsort((-self.papers, -self.degree))[:n]
+        return [
+            (self.labels[i], int(self.degree[i]), int(self.papers[i])) for i in order
+        ]
+
+    def top_pairs(self, n=NETWORK_TOP_N):
+        """Pares com mais artigos em comum: (autor_a, autor_b, artigos)"""
+        return list(self.edges().head(n).itertuples(index=False, name=None))
+
+    def summary(self):
+        sizes = self.component_sizes()
+        return {
+            'artigos': self.paper_count,
+            'autores': self.author_count,
+            'coautorias': self.edge_count,
+            'componentes': len(sizes),
+            'maior_componente': int(sizes[0]) if len(sizes) else 0,
+            'autores_isolados': int((self.degree == 0).sum()),
+        }
+
+
+def coauthor_network(result):
+    """
+    Rede de coautoria de uma análise
+
+    Cada grupo de duplicados conta como um artigo só, para que registros
+    repetidos não inflem as coautorias.
+    """
+    if not result.author_col:
+        raise ValueError("A lista não tem coluna de autores.")
+    first = ~pd.Series(result.codes).duplicated().to_numpy()
+    return CoauthorNetwork(AuthorIncidence(result.df[result.author_col][first]))
+
+
+def describe_network(network, n=NETWORK_TOP_N):
+    """Texto do resumo da rede para o usuário"""
+    summary = network.summary()
+    lines = [
+        f"Artigos com autores: {summary['artigos']:,}",
+        f"Autores: {summary['autores']:,} ({summary['autores_isolados']:,} sem coautores)",
+        f"Pares de coautores: {summary['coautorias']:,}",
+        f"Componentes conexos: {summary['componentes']:,} "
+        f"(maior com {summary['maior_componente']:,} autores)",
+        "",
+        "Autores mais conectados (coautores distintos / artigos):",
+    ]
+    for name, degree, papers in network.top_authors(n):
+        lines.append(f"{degree:8,} / {papers:<6,} {name}")
+    lines.append("")
+    lines.append("Pares com mais artigos em comum:")
+    for author_a, author_b, papers in network.top_pairs(n):
+        lines.append(f"{papers:8,}  {author_a} — {author_b}")
+    return "\n".join(lines)
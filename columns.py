@@ -0,0 +1,73 @@
+"""
+Detecção de Colunas - Analisador de Artigos v2.0
+Palavras-chave e heurísticas para identificar colunas acadêmicas
+"""
+
+# Palavras-chave por papel da coluna
+TITLE_KEYWORDS = ['title', 'titulo', 'título', 'nome', 'name']
+AUTHOR_KEYWORDS = ['author', 'autor', 'autores', 'authors']
+DOI_KEYWORDS = ['doi']
+ISBN_KEYWORDS = ['isbn']
+YEAR_KEYWORDS = ['year', 'ano']
+JOURNAL_KEYWORDS = ['journal', 'revista', 'periódico', 'periodico', 'source title', 'publication title']
+SOURCE_KEYWORDS = ['source', 'fonte', 'database', 'base de dados']
+TYPE_KEYWORDS = ['document type', 'tipo de documento', 'type', 'tipo']
+LANGUAGE_KEYWORDS = ['language', 'idioma', 'língua', 'lingua']
+ACADEMIC_KEYWORDS = [
+    'title', 'titulo', 'título', 'article', 'artigo', 'book', 'livro',
+    'paper', 'journal', 'author', 'autor', 'publication', 'publicação',
+    'doi', 'isbn', 'volume', 'issue', 'year', 'ano', 'name', 'nome'
+]
+
+
+def _matches(column, keywords):
+    """Indica se o nome da coluna contém alguma das palavras-chave"""
+    col_lower = str(column).lower().strip()
+    return any(keyword in col_lower for keyword in keywords)
+
+
+def is_academic_column(column):
+    """Indica se a coluna parece ter conteúdo acadêmico pelo cabeçalho"""
+    return _matches(column, ACADEMIC_KEYWORDS)
+
+
+def find_title_and_author_columns(columns):
+    """Identifica as colunas de título e autor a partir dos nomes"""
+    title_col = next((col for col in columns if _matches(col, TITLE_KEYWORDS)), None)
+    author_col = next((col for col in columns if _matches(col, AUTHOR_KEYWORDS)), None)
+    return title_col, author_col
+
+
+def find_identifier_columns(columns):
+    """Identifica as colunas de DOI e ISBN a partir dos nomes"""
+    doi_col = next((col for col in columns if _matches(col, DOI_KEYWORDS)), None)
+    isbn_col = next((col for col in columns if _matches(col, ISBN_KEYWORDS)), None)
+    return doi_col, isbn_col
+
+
+def find_year_column(columns):
+    """Identifica a coluna de ano de publicação a partir dos nomes"""
+    return next((col for col in columns if _matches(col, YEAR_KEYWORDS)), None)
+
+
+def find_journal_and_source_columns(columns):
+    """
+    Identifica as colunas de periódico e de fonte (base de dados) a partir dos nomes
+
+    'Source title' é periódico; a fonte é outra coluna com 'source' no nome.
+    """
+    journal_col = next((col for col in columns if _matches(col, JOURNAL_KEYWORDS)), None)
+    source_col = next(
+        (col for col in columns if col != journal_col and _matches(col, SOURCE_KEYWORDS)), None
+    )
+    return journal_col, source_col
+
+
+def find_type_column(columns):
+    """Identifica a coluna de tipo de documento (artigo, livro...) a partir dos nomes"""
+    return next((col for col in columns if _matches(col, TYPE_KEYWORDS)), None)
+
+
+def find_language_column(columns):
+    """Identifica a coluna de idioma a partir dos nomes"""
+    return next((col for col in columns if _matches(col, LANGUAGE_KEYWORDS)), None)
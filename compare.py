@@ -0,0 +1,111 @@
+"""
+Comparação de Listas - Analisador de Artigos v2.0
+Registros só na lista A, só na lista B e em ambas, por junção de chaves normalizadas
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from analysis import FormattedRows, detect_columns
+from dedupe import build_keys
+from exporters import (
+    BOTH_COLUMN, BOTH_SUFFIX, COMPARISON_SUFFIX, ONLY_A_COLUMN, ONLY_A_SUFFIX,
+    ONLY_B_COLUMN, ONLY_B_SUFFIX, export_titles, output_path, write_json
+)
+from loaders import load_table
+
+
+class ComparisonSide:
+    """Uma das listas comparadas, com suas colunas e chaves de comparação"""
+
+    def __init__(self, file_path, sheet=None):
+        df, self.load_info = load_table(file_path, sheet=sheet)
+        self.file_path = file_path
+        self.roles = detect_columns(df)
+        self.df = df.dropna(subset=[self.roles[0]])
+        self.keys = None
+
+    def build_keys(self, use_doi, use_isbn, normalize_author):
+        """Monta as chaves usando só os identificadores presentes nas duas listas"""
+        title_col, author_col, doi_col, isbn_col = self.roles
+        self.keys = build_keys(
+            self.df, title_col, author_col,
+            doi_col if use_doi else None, isbn_col if use_isbn else None,
+            normalize_author
+        )
+
+    def matches(self, other):
+        """
+        Máscara das linhas cuja chave também existe na outra lista
+
+        Junção por hash: as chaves distintas da outra lista formam uma
+        tabela consultada uma vez por linha, em tempo linear.
+        """
+        return self.keys.isin(other.keys.unique()).to_numpy()
+
+
+def comparison_prefix(path_a, path_b, output_dir=None):
+    """Caminho base dos arquivos da comparação ('a.csv__b.csv' na pasta de B)"""
+    folder = Path(output_dir) if output_dir else Path(path_b).parent
+    return folder / f"{Path(path_a).name}__{Path(path_b).name}"
+
+
+def export_rows(side, mask, file_path, column):
+    """Grava em blocos as linhas marcadas, sem montar a lista inteira na memória"""
+    title_col, author_col, _, _ = side.roles
+    rows = FormattedRows(side.df, title_col, author_col, positions=np.flatnonzero(mask))
+    export_titles(rows, file_path, column, f"Total de {len(rows)} registros")
+
+
+def compare_files(path_a, path_b, output_dir=None, normalize_author=True, sheet_a=None,
+                  sheet_b=None):
+    """
+    Compara duas listas e grava os três conjuntos
+
+    'Em ambas' traz as linhas da lista B que já existiam em A; assim os
+    três arquivos respondem 'o que B acrescenta' e 'o que A perdeu'.
+    Retorna o resumo da comparação.
+    """
+    side_a = ComparisonSide(path_a, sheet_a)
+    side_b = ComparisonSide(path_b, sheet_b)
+
+    # Um DOI de A nunca casaria com uma chave de texto de B: a camada só é
+    # usada quando as duas listas têm a coluna
+    use_doi = bool(side_a.roles[2] and side_b.roles[2])
+    use_isbn = bool(side_a.roles[3] and side_b.roles[3])
+    side_a.build_keys(use_doi, use_isbn, normalize_author)
+    side_b.build_keys(use_doi, use_isbn, normalize_author)
+
+    a_in_b = side_a.matches(side_b)
+    b_in_a = side_b.matches(side_a)
+
+    prefix = comparison_prefix(path_a, path_b, output_dir)
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    export_rows(side_a, ~a_in_b, output_path(prefix, ONLY_A_SUFFIX), ONLY_A_COLUMN)
+    export_rows(side_b, ~b_in_a, output_path(prefix, ONLY_B_SUFFIX), ONLY_B_COLUMN)
+    export_rows(side_b, b_in_a, output_path(prefix, BOTH_SUFFIX), BOTH_COLUMN)
+
+    summary = {
+        'lista_a': str(path_a),
+        'lista_b': str(path_b),
+        'total_a': len(side_a.df),
+        'total_b': len(side_b.df),
+        'apenas_a': int((~a_in_b).sum()),
+        'apenas_b': int((~b_in_a).sum()),
+        'em_ambas_a': int(a_in_b.sum()),
+        'em_ambas_b': int(b_in_a.sum()),
+    }
+    write_json(output_path(prefix, COMPARISON_SUFFIX), summary)
+    return summary
+
+
+def describe_comparison(summary):
+    """Texto do resumo da comparação para o usuário"""
+    return "\n".join([
+        f"Lista A: {summary['lista_a']} ({summary['total_a']:,} registros)",
+        f"Lista B: {summary['lista_b']} ({summary['total_b']:,} registros)",
+        f"Apenas em A: {summary['apenas_a']:,}",
+        f"Apenas em B (novos): {summary['apenas_b']:,}",
+        f"Em ambas: {summary['em_ambas_b']:,} registros de B ({summary['em_ambas_a']:,} de A)",
+    ])
@@ -0,0 +1,316 @@
+"""
+Detecção de Duplicados - Analisador de Artigos v2.0
+Comparação em camadas: identificadores (DOI/ISBN) primeiro, texto depois
+"""
+
+import numbers
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from authors import normalize_authors
+
+
+# Prefixos das chaves de comparação, um por camada
+DOI_PREFIX = 'doi:'
+ISBN_PREFIX = 'isbn:'
+TEXT_PREFIX = 'txt:'
+
+# Abaixo disso o custo de enviar os dados aos processos supera o ganho
+PARALLEL_MIN_ROWS = 500_000
+
+_DOI_URL = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+_DOI_VALID = re.compile(r'^10\.\d{4,9}/\S+$')
+_ISBN_SEPARATORS = re.compile(r'[\s\-]')
+
+
+def normalize_doi(series):
+    """Normaliza DOIs (sem prefixo de URL, minúsculos); inválidos viram NaN"""
+    values = series.astype('string').str.strip().str.lower()
+    values = values.str.replace(_DOI_URL, '', regex=True)
+    return values.where(values.str.match(_DOI_VALID).fillna(False).astype(bool))
+
+
+def _isbn10_is_valid(isbn):
+    """Verifica o dígito de controle de um ISBN-10"""
+    if not (isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == 'X')):
+        return False
+    digits = [int(c) for c in isbn[:9]] + [10 if isbn[9] == 'X' else int(isbn[9])]
+    return sum((10 - i) * d for i, d in enumerate(digits)) % 11 == 0
+
+
+def _isbn13_check_digit(first12):
+    """Calcula o dígito de controle de um ISBN-13"""
+    total = sum(int(c) * (1 if i % 2 == 0 else 3) for i, c in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def isbn_to_13(value):
+    """
+    Converte um ISBN (10 ou 13 dígitos) para ISBN-13
+
+    Retorna None quando o valor não é um ISBN com dígito de controle válido.
+    Aceita números lidos de planilhas e CSVs com tipo inferido: 9780306406157.0
+    (coluna com células vazias vira float) e ISBN-10 que perdeu o zero à
+    esquerda (306406152).
+    """
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        if value != value or value < 0 or value != int(value):
+            return None
+        value = str(int(value)).zfill(10)
+    isbn = _ISBN_SEPARATORS.sub('', str(value)).upper()
+    if isbn.startswith('ISBN'):
+        isbn = isbn[4:].lstrip(':')
+
+    if len(isbn) == 10:
+        if not _isbn10_is_valid(isbn):
+            return None
+        first12 = '978' + isbn[:9]
+        return first12 + _isbn13_check_digit(first12)
+
+    if len(isbn) == 13 and isbn.isdigit() and isbn[:3] in ('978', '979'):
+        if _isbn13_check_digit(isbn[:12]) != isbn[12]:
+            return None
+        return isbn
+
+    return None
+
+
+def normalize_isbn(series):
+    """Normaliza ISBNs para ISBN-13; inválidos viram NaN"""
+    # ISBNs se repetem muito: converte cada valor distinto uma única vez
+    present = series.dropna()
+    mapping = {value: isbn_to_13(value) for value in present.unique()}
+    return present.map(mapping).reindex(series.index)
+
+
+def join_text(titles, authors=None):
+    """Junta títulos e autores já normalizados na chave textual 'título | autor'"""
+    return titles if authors is None else titles + " | " + authors
+
+
+def text_keys(df, title_col, author_col=None, normalize_author=True):
+    """
+    Chave textual 'título | autor' usada quando não há identificador
+
+    Com normalize_author, autores escritos em ordens ou formatos diferentes
+    ('Silva, J.' e 'J. Silva') geram a mesma chave.
+    """
+    titles = df[title_col].fillna('').astype(str).str.strip()
+    authors = None
+    if author_col:
+        if normalize_author:
+            authors = normalize_authors(df[author_col])
+        else:
+            authors = df[author_col].fillna('').astype(str).str.strip()
+    return join_text(titles, authors)
+
+
+def combine_keys(index, doi=None, isbn=None, text=None):
+    """
+    Regra das camadas a partir das partes já normalizadas
+
+    DOI válido, senão ISBN-13 válido, senão a chave textual. doi e isbn
+    podem cobrir só parte das linhas; text recebe a máscara das linhas
+    sem identificador e devolve a chave textual só delas.
+    """
+    keys = pd.Series(pd.NA, index=index, dtype='object')
+    if doi is not None:
+        present = doi.dropna()
+        keys[present.index] = DOI_PREFIX + present.astype(object)
+    if isbn is not None:
+        present = isbn.dropna()
+        present = present[keys[present.index].isna().to_numpy()]
+        keys[present.index] = ISBN_PREFIX + present.astype(object)
+
+    missing = keys.isna()
+    if missing.any():
+        keys[missing] = TEXT_PREFIX + text(missing)
+    return keys
+
+
+def build_keys(df, title_col, author_col=None, doi_col=None, isbn_col=None,
+               normalize_author=True):
+    """
+    Monta a chave de comparação de cada linha, em camadas
+
+    Linhas com DOI válido usam o DOI; sem DOI, o ISBN-13 válido; sem
+    nenhum identificador, a chave textual de título e autor. Só as linhas
+    que chegam a cada camada têm a parte dela normalizada.
+    """
+    doi = normalize_doi(df[doi_col]) if doi_col else None
+    isbn = None
+    if isbn_col:
+        rows = df.index if doi is None else doi.isna()
+        isbn = normalize_isbn(df.loc[rows, isbn_col])
+    return combine_keys(
+        df.index, doi, isbn,
+        lambda missing: text_keys(df[missing], title_col, author_col, normalize_author)
+    )
+
+
+def index_keys(keys):
+    """
+    Índice de chaves: (códigos por linha, chaves distintas, contagem por código)
+
+    O código de cada linha identifica seu grupo; uma linha é duplicada
+    quando a contagem do seu código é maior que 1.
+    """
+    codes, uniques = pd.factorize(keys)
+    counts = np.bincount(codes, minlength=len(uniques))
+    return codes, uniques, counts
+
+
+def extend_key_index(codes, uniques, counts, new_keys):
+    """Acrescenta novas linhas a um índice de chaves sem reprocessar as antigas"""
+    new_codes = pd.Index(uniques).get_indexer(new_keys)
+    unseen = new_codes == -1
+    if unseen.any():
+        extra_codes, extra_uniques = pd.factorize(new_keys[unseen])
+        new_codes[unseen] = extra_codes + len(uniques)
+        uniques = uniques.append(extra_uniques)
+        counts = np.concatenate([counts, np.zeros(len(extra_uniques), dtype=counts.dtype)])
+    else:
+        counts = counts.copy()
+
+    np.add.at(counts, new_codes, 1)
+    return np.concatenate([codes, new_codes]), uniques, counts
+
+
+def dedupe_workers(row_count, workers=None):
+    """Processos usados na detecção: todos os núcleos para tabelas grandes, senão 1"""
+    if workers is None:
+        workers = (os.cpu_count() or 1) if row_count >= PARALLEL_MIN_ROWS else 1
+    return max(1, min(workers, row_count // 2 or 1))
+
+
+def _row_chunks(length, parts):
+    """Limites (início, fim) de partes contíguas de tamanho aproximado"""
+    bounds = np.linspace(0, length, parts + 1).astype(int)
+    return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def shard_ids(keys, workers):
+    """
+    Partição de cada chave, entre 0 e workers - 1
+
+    Chaves iguais caem sempre na mesma partição. O tipo inteiro é o menor
+    possível: a ordenação estável de inteiros pequenos usa radix sort.
+    """
+    shards = pd.util.hash_pandas_object(keys, index=False).to_numpy() % np.uint64(workers)
+    return shards.astype(np.uint8 if workers <= 256 else np.uint16)
+
+
+def _build_block_keys(df, title_col, author_col, doi_col, isbn_col, normalize_author, workers):
+    """Chaves de um bloco de linhas e a partição de cada uma (executa no pool)"""
+    keys = build_keys(df, title_col, author_col, doi_col, isbn_col, normalize_author)
+    return keys, shard_ids(keys, workers)
+
+
+def build_keys_parallel(df, title_col, author_col=None, doi_col=None, isbn_col=None,
+                        normalize_author=True, executor=None, workers=1):
+    """
+    build_keys em blocos contíguos de linhas, um por processo
+
+    A chave de uma linha depende só dela, então concatenar os blocos na
+    ordem original produz exatamente as mesmas chaves. Retorna as chaves
+    e a partição de cada uma, calculada nos processos junto com elas.
+    """
+    columns = [col for col in (title_col, author_col, doi_col, isbn_col) if col]
+    futures = [
+        executor.submit(
+            _build_block_keys, df[columns].iloc[start:end],
+            title_col, author_col, doi_col, isbn_col, normalize_author, workers
+        )
+        for start, end in _row_chunks(len(df), workers)
+    ]
+    results = [future.result() for future in futures]
+    return (
+        pd.concat([keys for keys, _ in results]),
+        np.concatenate([shards for _, shards in results]),
+    )
+
+
+def _index_shard(values):
+    """
+    Agrupa as chaves de uma partição (executa no pool)
+
+    Retorna os códigos locais, as chaves distintas, a posição (na partição)
+    da primeira ocorrência de cada chave e a contagem de cada uma.
+    """
+    codes, uniques = pd.factorize(values)
+    _, first = np.unique(codes, return_index=True)
+    counts = np.bincount(codes, minlength=len(uniques))
+    return codes, np.asarray(uniques, dtype=object), first, counts
+
+
+def index_keys_parallel(keys, executor, workers, shards=None):
+    """
+    index_keys com as chaves particionadas por hash entre processos
+
+    Chaves iguais sempre caem na mesma partição, então cada processo agrupa
+    a sua de forma independente. Na junção, as chaves distintas são
+    ordenadas pela primeira ocorrência na tabela, a mesma ordem de
+    pd.factorize: códigos, chaves e contagens saem idênticos a index_keys.
+    shards (de shard_ids) evita recalcular o hash das chaves.
+    """
+    values = keys.to_numpy(dtype=object)
+    if shards is None:
+        shards = shard_ids(keys, workers)
+
+    # Uma única ordenação estável separa as partições, mantendo em cada uma
+    # a ordem das linhas na tabela
+    order = np.argsort(shards, kind='stable')
+    bounds = np.searchsorted(shards[order], np.arange(1, workers))
+    futures = [
+        (positions, executor.submit(_index_shard, values[positions]))
+        for positions in np.split(order, bounds) if len(positions)
+    ]
+
+    shard_results = [(positions, future.result()) for positions, future in futures]
+    if not shard_results:
+        return index_keys(keys)
+
+    first = np.concatenate([positions[result[2]] for positions, result in shard_results])
+    order = np.argsort(first, kind='stable')
+    rank = np.empty(len(order), dtype=np.intp)
+    rank[order] = np.arange(len(order))
+
+    codes = np.empty(len(values), dtype=np.intp)
+    offset = 0
+    for positions, (shard_codes, shard_uniques, _, _) in shard_results:
+        codes[positions] = rank[offset + shard_codes]
+        offset += len(shard_uniques)
+
+    uniques = pd.Index(
+        np.concatenate([result[1] for _, result in shard_results]), dtype=object
+    )[order]
+    counts = np.concatenate([result[3] for _, result in shard_results])[order]
+    return codes, uniques, counts
+
+
+def build_and_index_keys(df, title_col, author_col=None, doi_col=None, isbn_col=None,
+                         normalize_author=True, workers=1):
+    """Monta e indexa as chaves, em paralelo quando workers > 1"""
+    if workers <= 1:
+        keys = build_keys(df, title_col, author_col, doi_col, isbn_col, normalize_author)
+        return (keys, *index_keys(keys))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        keys, shards = build_keys_parallel(
+            df, title_col, author_col, doi_col, isbn_col, normalize_author, executor, workers
+        )
+        return (keys, *index_keys_parallel(keys, executor, workers, shards))
+
+
+def count_by_tier(keys, mask):
+    """Conta os duplicados encontrados em cada camada (doi, isbn, texto)"""
+    duplicated = keys[mask]
+    return {
+        'doi': int(duplicated.str.startswith(DOI_PREFIX).sum()),
+        'isbn': int(duplicated.str.startswith(ISBN_PREFIX).sum()),
+        'texto': int(duplicated.str.startswith(TEXT_PREFIX).sum()),
+    }
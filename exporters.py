@@ -0,0 +1,159 @@
+"""
+Exportação de Resultados - Analisador de Artigos v2.0
+Gravação das listas em CSV, compartilhada pela interface e pelos modos sem interface
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+
+EXPORT_BLOCK_ROWS = 100_000   # Linhas formatadas por vez na gravação
+
+ALL_TITLES_COLUMN = "Título Completo"
+DUPLICATES_COLUMN = "Registro Duplicado"
+ONLY_A_COLUMN = "Apenas na Lista A"
+ONLY_B_COLUMN = "Apenas na Lista B"
+BOTH_COLUMN = "Em Ambas as Listas"
+
+# Sufixos dos arquivos gravados ao lado de cada entrada (modo pasta monitorada)
+LIST_SUFFIX = '.lista.csv'
+DUPLICATES_SUFFIX = '.duplicados.csv'
+SUMMARY_SUFFIX = '.resumo.json'
+ERROR_SUFFIX = '.erro.txt'
+
+# Sufixos dos arquivos de uma comparação entre duas listas
+ONLY_A_SUFFIX = '.apenas_a.csv'
+ONLY_B_SUFFIX = '.apenas_b.csv'
+BOTH_SUFFIX = '.em_ambas.csv'
+COMPARISON_SUFFIX = '.comparacao.json'
+
+# Tabela sem duplicados (uma linha por grupo, todas as colunas)
+RESOLVED_SUFFIX = '.limpo.csv'
+
+# Lista de arestas da rede de coautoria
+COAUTHOR_SUFFIX = '.coautoria.csv'
+
+OUTPUT_SUFFIXES = (
+    LIST_SUFFIX, DUPLICATES_SUFFIX, SUMMARY_SUFFIX, ERROR_SUFFIX,
+    ONLY_A_SUFFIX, ONLY_B_SUFFIX, BOTH_SUFFIX, COMPARISON_SUFFIX, RESOLVED_SUFFIX,
+    COAUTHOR_SUFFIX
+)
+
+
+class TitleListWriter:
+    """
+    Grava a lista numerada em partes, sem manter a lista inteira na memória
+
+    O arquivo final é igual ao de export_titles: cabeçalho, linhas
+    numeradas, uma linha vazia e a linha de resumo.
+    """
+
+    def __init__(self, file_path, column):
+        self.column = column
+        self.count = 0
+        self._file = open(file_path, 'w', encoding='utf-8-sig', newline='')
+        self._header = True
+
+    def write(self, titles):
+        """Acrescenta um bloco de títulos já formatados"""
+        if not len(titles) and not self._header:
+            return
+        numbers = range(self.count + 1, self.count + len(titles) + 1)
+        pd.DataFrame({"Número": numbers, self.column: titles}).to_csv(
+            self._file, index=False, header=self._header
+        )
+        self._header = False
+        self.count += len(titles)
+
+    def close(self, summary):
+        """Grava a linha de resumo e fecha o arquivo"""
+        self.write([])
+        pd.DataFrame({"Número": ["", "RESUMO:"], self.column: ["", summary]}).to_csv(
+            self._file, index=False, header=False
+        )
+        self._file.close()
+
+
+def export_titles(titles, file_path, column, summary):
+    """
+    Grava a lista numerada com a linha de resumo no final
+
+    A lista é gravada em fatias; com uma lista sob demanda (store.LazyRows),
+    só uma fatia formatada fica na memória por vez.
+    """
+    writer = TitleListWriter(file_path, column)
+    for start in range(0, len(titles), EXPORT_BLOCK_ROWS):
+        writer.write(titles[start:start + EXPORT_BLOCK_ROWS])
+    writer.close(summary)
+
+
+def export_all_titles(titles, file_path):
+    """Exporta a lista completa"""
+    export_titles(titles, file_path, ALL_TITLES_COLUMN, f"Total de {len(titles)} registros")
+
+
+def export_duplicates(duplicates, file_path):
+    """Exporta apenas os duplicados"""
+    export_titles(duplicates, file_path, DUPLICATES_COLUMN, f"Total de {len(duplicates)} duplicados")
+
+
+def build_summary(total, duplicates, roles, tiers, load_info=None):
+    """Resumo serializável a partir das contagens e das colunas detectadas"""
+    title_col, author_col, doi_col, isbn_col = roles
+    return {
+        'total': total,
+        'duplicados': duplicates,
+        'unicos': total - duplicates,
+        'coluna_titulo': title_col,
+        'coluna_autor': author_col,
+        'coluna_doi': doi_col,
+        'coluna_isbn': isbn_col,
+        'duplicados_por_camada': tiers,
+        'motor': load_info.describe() if load_info else None,
+    }
+
+
+def summarize(result):
+    """Resumo da análise (AnalysisResult ou ResultStore) em formato serializável"""
+    roles = (result.title_col, result.author_col, result.doi_col, result.isbn_col)
+    return build_summary(
+        result.total_count, result.duplicate_count, roles, result.tiers, result.load_info
+    )
+
+
+def write_json(file_path, data):
+    """Grava um resumo em JSON legível"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def write_summary(input_path, summary):
+    """Grava o resumo em JSON ao lado do arquivo de entrada"""
+    write_json(output_path(input_path, SUMMARY_SUFFIX), summary)
+
+
+def output_path(input_path, suffix):
+    """Caminho de saída ao lado do arquivo de entrada"""
+    input_path = Path(input_path)
+    return input_path.with_name(input_path.name + suffix)
+
+
+def is_output_file(path):
+    """Indica se o arquivo foi gerado pelo próprio analisador"""
+    return Path(path).name.endswith(OUTPUT_SUFFIXES)
+
+
+def write_outputs_beside(input_path, store):
+    """Grava lista, duplicados e resumo de um ResultStore ao lado do arquivo de entrada"""
+    summary = summarize(store)
+    export_all_titles(store.all_titles(), output_path(input_path, LIST_SUFFIX))
+    export_duplicates(store.duplicate_titles(), output_path(input_path, DUPLICATES_SUFFIX))
+    write_summary(input_path, summary)
+    return summary
+
+
+def write_results_beside(input_path, result):
+    """Grava lista, duplicados e resumo ao lado do arquivo de entrada"""
+    return write_outputs_beside(input_path, result.store())
@@ -0,0 +1,252 @@
+"""
+Detecção em Memória Externa - Analisador de Artigos v2.0
+Duplicados em listas maiores que a memória, com partições de chaves em disco
+"""
+
+import math
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analysis import (
+    AnalysisError, detect_columns, format_rows, no_match_error, remember_columns
+)
+from dedupe import DOI_PREFIX, ISBN_PREFIX, TEXT_PREFIX, build_keys
+from exporters import (
+    ALL_TITLES_COLUMN, DUPLICATES_COLUMN, DUPLICATES_SUFFIX, LIST_SUFFIX,
+    TitleListWriter, build_summary, output_path, write_summary
+)
+from filters import FilterError
+from loaders import (
+    ENCODINGS, REFERENCE_PARSERS, LoadInfo, available_memory, iter_table_chunks, note_filter
+)
+from store import MISSING_AUTHOR
+
+
+ROW_OVERHEAD_BYTES = 200      # Custo em memória de uma linha além do texto (objetos, índices)
+MIN_CHUNK_ROWS = 1_000
+MAX_CHUNK_ROWS = 1_000_000
+SAMPLE_BYTES = 1024 * 1024    # Trecho inicial usado para estimar o tamanho médio da linha
+
+_MEMORY_SIZE = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*([KMGT]?)i?B?\s*$', re.IGNORECASE)
+_MEMORY_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_memory(text):
+    """Converte '2G', '512M', '1.5GB' etc. em bytes"""
+    match = _MEMORY_SIZE.match(str(text))
+    if not match:
+        raise ValueError(f"Tamanho de memória inválido: {text}")
+    number, unit = match.groups()
+    return int(float(number.replace(',', '.')) * _MEMORY_UNITS[unit.upper()])
+
+
+def supports_external(file_path):
+    """Formatos que podem ser lidos em blocos (CSV, BibTeX e RIS)"""
+    suffix = Path(file_path).suffix.lower()
+    return suffix == '.csv' or suffix in REFERENCE_PARSERS
+
+
+def _average_row_bytes(file_path):
+    """Tamanho médio de uma linha, estimado pelo início do arquivo"""
+    with open(file_path, 'rb') as f:
+        sample = f.read(SAMPLE_BYTES)
+    return max(1, len(sample) // max(1, sample.count(b'\n')))
+
+
+def plan_budget(file_path, max_memory):
+    """
+    Divide o orçamento de memória entre leitura e partições
+
+    Retorna (linhas por bloco, número de partições): um bloco de leitura
+    usa no máximo um quarto do orçamento e cada partição, carregada
+    sozinha na segunda etapa, no máximo metade.
+    """
+    row_bytes = _average_row_bytes(file_path) + ROW_OVERHEAD_BYTES
+    chunk_rows = int(min(MAX_CHUNK_ROWS, max(MIN_CHUNK_ROWS, max_memory // 4 // row_bytes)))
+    estimated_rows = os.path.getsize(file_path) // max(1, row_bytes - ROW_OVERHEAD_BYTES) + 1
+    partitions = max(1, math.ceil(estimated_rows * row_bytes / (max_memory // 2)))
+    return chunk_rows, partitions
+
+
+class KeySpill:
+    """
+    Partições de chaves gravadas em disco
+
+    Cada bloco lido grava, em cada partição, as posições das suas linhas e
+    as chaves correspondentes. Chaves iguais caem sempre na mesma partição
+    (hash da chave), então cada uma pode ser agrupada sozinha na memória.
+    """
+
+    def __init__(self, folder, partitions):
+        self.folder = Path(folder)
+        self.partitions = partitions
+
+    def _path(self, partition):
+        return self.folder / f'chaves-{partition:05d}.pkl'
+
+    def add(self, positions, keys):
+        """Grava um bloco de chaves distribuído entre as partições"""
+        values = keys.to_numpy(dtype=object)
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        shard_of = hashes % np.uint64(self.partitions)
+        for partition in np.unique(shard_of):
+            selected = shard_of == partition
+            with open(self._path(int(partition)), 'ab') as f:
+                pickle.dump((positions[selected], values[selected]), f, pickle.HIGHEST_PROTOCOL)
+
+    def load(self, partition):
+        """Lê todos os blocos gravados de uma partição"""
+        path = self._path(partition)
+        if not path.exists():
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+
+        positions, values = [], []
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    run_positions, run_values = pickle.load(f)
+                except EOFError:
+                    break
+                positions.append(run_positions)
+                values.append(run_values)
+        return np.concatenate(positions), np.concatenate(values)
+
+    def clear(self):
+        """Remove as partições gravadas (nova tentativa com outro encoding)"""
+        for partition in range(self.partitions):
+            self._path(partition).unlink(missing_ok=True)
+
+
+def _spill_keys(file_path, encoding, chunk_rows, spill, normalize_author, row_filter=None):
+    """
+    Primeira etapa: lê o arquivo em blocos e grava as chaves nas partições
+
+    Retorna (cabeçalho, papéis, linhas do arquivo, linhas com título).
+    """
+    columns = roles = None
+    row_count = 0
+    kept = 0
+    for chunk in iter_table_chunks(file_path, encoding, chunk_rows, row_filter):
+        row_count += chunk.attrs.get('rows_read', len(chunk))
+        if chunk.empty:
+            # Bloco todo excluído pelo filtro
+            continue
+        if roles is None:
+            columns = chunk.columns
+            roles = detect_columns(chunk)
+        title_col, author_col, doi_col, isbn_col = roles
+
+        chunk = chunk.dropna(subset=[title_col])
+        kept += len(chunk)
+        if len(chunk):
+            keys = build_keys(chunk, title_col, author_col, doi_col, isbn_col, normalize_author)
+            spill.add(chunk.index.to_numpy(dtype=np.int64), keys)
+
+    if roles is None:
+        if row_filter and row_count:
+            raise no_match_error(row_filter)
+        raise AnalysisError(
+            "Arquivo Inválido",
+            "O arquivo não parece conter uma lista válida de artigos ou livros acadêmicos."
+        )
+    return columns, roles, row_count, kept
+
+
+def _mark_duplicates(spill, row_count):
+    """
+    Segunda etapa: agrupa cada partição e marca as linhas duplicadas
+
+    Retorna a máscara por linha do arquivo e a contagem por camada.
+    """
+    duplicated = np.zeros(row_count, dtype=bool)
+    tiers = {'doi': 0, 'isbn': 0, 'texto': 0}
+    prefixes = {'doi': DOI_PREFIX, 'isbn': ISBN_PREFIX, 'texto': TEXT_PREFIX}
+
+    for partition in range(spill.partitions):
+        positions, values = spill.load(partition)
+        if not len(values):
+            continue
+        codes, uniques = pd.factorize(values)
+        counts = np.bincount(codes, minlength=len(uniques))
+        is_duplicate = counts[codes] > 1
+        duplicated[positions[is_duplicate]] = True
+
+        duplicate_keys = pd.Series(values[is_duplicate], dtype=object)
+        for tier, prefix in prefixes.items():
+            tiers[tier] += int(duplicate_keys.str.startswith(prefix).sum())
+    return duplicated, tiers
+
+
+def _write_lists(file_path, encoding, chunk_rows, roles, duplicated, total, duplicate_count,
+                 row_filter=None):
+    """Terceira etapa: relê o arquivo gravando a lista completa e os duplicados"""
+    title_col, author_col, _, _ = roles
+    all_titles = TitleListWriter(output_path(file_path, LIST_SUFFIX), ALL_TITLES_COLUMN)
+    duplicates = TitleListWriter(output_path(file_path, DUPLICATES_SUFFIX), DUPLICATES_COLUMN)
+
+    for chunk in iter_table_chunks(file_path, encoding, chunk_rows, row_filter):
+        chunk = chunk.dropna(subset=[title_col])
+        all_titles.write(format_rows(chunk, title_col, author_col))
+        marked = chunk[duplicated[chunk.index.to_numpy()]]
+        duplicates.write(format_rows(marked, title_col, author_col, MISSING_AUTHOR))
+
+    all_titles.close(f"Total de {total} registros")
+    duplicates.close(f"Total de {duplicate_count} duplicados")
+
+
+def analyze_external(file_path, max_memory, normalize_author=True, spill_dir=None,
+                     row_filter=None):
+    """
+    Analisa um arquivo maior que a memória e grava os resultados ao lado dele
+
+    Três passadas em blocos: gravação das chaves em partições no disco,
+    agrupamento de uma partição por vez e releitura para gravar as listas.
+    Os grupos de duplicados são os mesmos da análise em memória; a
+    memória usada fica em torno de max_memory, mais um byte por linha do
+    arquivo para a marcação de duplicados. Com row_filter, as duas
+    leituras descartam as linhas excluídas em cada bloco.
+    """
+    chunk_rows, partitions = plan_budget(file_path, max_memory)
+    folder = tempfile.mkdtemp(prefix='analisador-', dir=spill_dir)
+    spill = KeySpill(folder, partitions)
+
+    try:
+        for encoding in ENCODINGS:
+            try:
+                columns, roles, row_count, total = _spill_keys(
+                    file_path, encoding, chunk_rows, spill, normalize_author, row_filter
+                )
+                break
+            except UnicodeDecodeError:
+                spill.clear()
+            except FilterError as e:
+                raise AnalysisError("Filtro", str(e))
+        else:
+            raise AnalysisError("Erro de Codificação", "Não foi possível ler o arquivo")
+
+        duplicated, tiers = _mark_duplicates(spill, row_count)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    duplicate_count = int(duplicated.sum())
+    _write_lists(
+        file_path, encoding, chunk_rows, roles, duplicated, total, duplicate_count, row_filter
+    )
+
+    info = LoadInfo(
+        'externo', f"{partitions} partições em disco, blocos de {chunk_rows:,} linhas",
+        os.path.getsize(file_path), available_memory(), os.cpu_count() or 1, encoding
+    )
+    if row_filter:
+        note_filter(info, row_filter, total, row_count)
+    summary = build_summary(total, duplicate_count, roles, tiers, info)
+    write_summary(file_path, summary)
+    remember_columns(columns, roles)
+    return summary
@@ -0,0 +1,258 @@
+"""
+Filtros de Leitura - Analisador de Artigos v2.0
+Ano, tipo de documento e idioma aplicados durante a leitura, antes da análise
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from accents import strip_accents
+from columns import find_language_column, find_type_column, find_year_column
+
+
+# Tipos de documento: nome usado no filtro -> trechos reconhecidos no valor da
+# coluna (Scopus, Web of Science, tipos RIS e BibTeX). A ordem decide os casos
+# ambíguos: 'Book Chapter' é capítulo, 'Review Article' é revisão.
+DOCUMENT_TYPES = {
+    'revisao': ('review', 'revisao'),
+    'capitulo': ('chapter', 'chap', 'incollection', 'inbook', 'capitulo'),
+    'conferencia': ('conf', 'proceedings', 'cpaper', 'congress', 'meeting', 'symposium',
+                    'evento'),
+    'tese': ('thesis', 'thes', 'tese', 'disserta'),
+    'relatorio': ('report', 'rprt', 'relatorio'),
+    'artigo': ('article', 'artigo', 'articulo', 'jour'),
+    'livro': ('book', 'livro', 'monograph'),
+}
+
+# Idiomas: código usado no filtro -> nomes e códigos aceitos (valor inteiro)
+LANGUAGES = {
+    'en': ('english', 'ingles', 'eng'),
+    'pt': ('portuguese', 'portugues', 'por', 'pt-br', 'pt-pt'),
+    'es': ('spanish', 'espanhol', 'espanol', 'castellano', 'spa'),
+    'fr': ('french', 'frances', 'francais', 'fre', 'fra'),
+    'de': ('german', 'alemao', 'deutsch', 'ger', 'deu'),
+    'it': ('italian', 'italiano', 'ita'),
+    'zh': ('chinese', 'chines', 'chi', 'zho'),
+    'ja': ('japanese', 'japones', 'jpn'),
+    'ru': ('russian', 'russo', 'rus'),
+}
+_LANGUAGE_ALIASES = {
+    alias: code for code, aliases in LANGUAGES.items() for alias in (code,) + aliases
+}
+
+FILTER_FIELDS = {
+    'ano': 'ano', 'year': 'ano',
+    'tipo': 'tipo', 'type': 'tipo',
+    'idioma': 'idioma', 'language': 'idioma', 'lingua': 'idioma',
+}
+
+_VALUE_SEPARATORS = re.compile(r'[;,/|]')
+_YEAR = re.compile(r'\d{4}')
+_YEAR_RANGE = re.compile(r'^(\d{4})?\s*-\s*(\d{4})?$|^(\d{4})$')
+_FILTER_TERM = re.compile(r'(\w+):(\S+)')
+
+
+class FilterError(ValueError):
+    """Filtro mal escrito ou que usa uma coluna ausente no arquivo"""
+
+
+def _fold(text):
+    """Minúsculas, sem acentos e sem espaços nas pontas"""
+    return strip_accents(str(text).strip().lower())
+
+
+@lru_cache(maxsize=4096)
+def document_types(value):
+    """
+    Tipos de um valor da coluna de tipo, como conjunto de nomes do filtro
+
+    Valores com vários tipos ('Article; Proceedings Paper') têm um por
+    parte; partes não reconhecidas valem pelo próprio texto ('editorial').
+    """
+    types = set()
+    for part in _VALUE_SEPARATORS.split(_fold(value)):
+        part = part.strip()
+        if not part:
+            continue
+        types.add(next(
+            (name for name, words in DOCUMENT_TYPES.items() if any(word in part for word in words)),
+            part
+        ))
+    return frozenset(types)
+
+
+@lru_cache(maxsize=4096)
+def languages(value):
+    """Idiomas de um valor da coluna de idioma, como conjunto de códigos"""
+    codes = set()
+    for part in _VALUE_SEPARATORS.split(_fold(value)):
+        part = part.strip()
+        if not part:
+            continue
+        # 'en-US' e 'pt_BR' valem pelo idioma
+        code = _LANGUAGE_ALIASES.get(part) or _LANGUAGE_ALIASES.get(re.split(r'[-_]', part)[0])
+        codes.add(code or part)
+    return frozenset(codes)
+
+
+def _year(value):
+    match = _YEAR.search(str(value))
+    return int(match.group(0)) if match else None
+
+
+@dataclass(frozen=True)
+class RowFilter:
+    """
+    Critérios aplicados às linhas durante a leitura
+
+    Uma linha sem o valor usado por um critério (ano vazio, tipo ausente)
+    não o atende. Os tipos e idiomas são guardados como nomes do filtro
+    ('artigo', 'en'), então 'article' e 'artigo' pedem a mesma coisa.
+    """
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    types: tuple = ()
+    languages: tuple = ()
+
+    def __bool__(self):
+        return bool(self.year_from or self.year_to or self.types or self.languages)
+
+    def describe(self):
+        """Texto do filtro na mesma sintaxe aceita por parse_filter"""
+        parts = []
+        if self.year_from or self.year_to:
+            if self.year_from == self.year_to:
+                parts.append(f"ano:{self.year_from}")
+            else:
+                parts.append(f"ano:{self.year_from or ''}-{self.year_to or ''}")
+        if self.types:
+            parts.append(f"tipo:{','.join(self.types)}")
+        if self.languages:
+            parts.append(f"idioma:{','.join(self.languages)}")
+        return ' '.join(parts)
+
+    def accepts_year(self, value):
+        if pd.isna(value):
+            return False
+        year = _year(value)
+        if year is None:
+            return False
+        return (self.year_from is None or year >= self.year_from) and \
+            (self.year_to is None or year <= self.year_to)
+
+    def accepts_type(self, value):
+        if pd.isna(value):
+            return False
+        return not document_types(value).isdisjoint(self.types)
+
+    def accepts_language(self, value):
+        if pd.isna(value):
+            return False
+        return not languages(value).isdisjoint(self.languages)
+
+    def checks(self, columns):
+        """
+        (coluna, teste) de cada critério ativo, com a coluna achada pelo nome
+
+        Levanta FilterError se o arquivo não tem a coluna de um critério.
+        """
+        criteria = []
+        if self.year_from or self.year_to:
+            criteria.append(('ano de publicação', find_year_column(columns), self.accepts_year))
+        if self.types:
+            criteria.append(('tipo de documento', find_type_column(columns), self.accepts_type))
+        if self.languages:
+            criteria.append(('idioma', find_language_column(columns), self.accepts_language))
+
+        missing = [label for label, column, _ in criteria if column is None]
+        if missing:
+            raise FilterError(
+                f"O filtro usa {', '.join(missing)}, mas o arquivo não tem essa coluna."
+            )
+        return [(column, accept) for _, column, accept in criteria]
+
+    def mask(self, df):
+        """
+        Máscara das linhas que atendem a todos os critérios
+
+        Cada teste roda uma vez por valor distinto da coluna (anos, tipos e
+        idiomas se repetem muito), não uma vez por linha.
+        """
+        keep = np.ones(len(df), dtype=bool)
+        for column, accept in self.checks(df.columns):
+            codes, uniques = pd.factorize(df[column])
+            accepted = np.fromiter((accept(value) for value in uniques), dtype=bool,
+                                   count=len(uniques))
+            # Código -1 (vazio) cai no False acrescentado no fim
+            keep &= np.append(accepted, False)[codes]
+        return keep
+
+    def apply(self, df):
+        """Linhas da tabela que atendem ao filtro (sem filtro, a própria tabela)"""
+        return df[self.mask(df)] if self else df
+
+
+def parse_years(text):
+    """Converte '2015-2024', '2015-', '-2024' ou '2020' em (início, fim)"""
+    match = _YEAR_RANGE.match(text.strip())
+    if not match:
+        raise FilterError(f"Período inválido: '{text}' (use 2015-2024, 2015- ou -2024).")
+    start, end, single = match.groups()
+    if single:
+        return int(single), int(single)
+    if not start and not end:
+        raise FilterError(f"Período inválido: '{text}'.")
+    start, end = (int(start) if start else None), (int(end) if end else None)
+    if start and end and start > end:
+        raise FilterError(f"Período invertido: '{text}'.")
+    return start, end
+
+
+def _names(text, classify):
+    """Lista de nomes do filtro, na ordem informada e sem repetições"""
+    names = []
+    for part in text.split(','):
+        for name in sorted(classify(part)):
+            if name not in names:
+                names.append(name)
+    if not names:
+        raise FilterError(f"Valor vazio no filtro: '{text}'.")
+    return tuple(names)
+
+
+def parse_filter(text):
+    """
+    Lê um filtro como 'ano:2015-2024 tipo:artigo,revisao idioma:en'
+
+    Campos aceitos: ano (ou year), tipo (type) e idioma (language);
+    vários valores de um campo separados por vírgula. Texto vazio não
+    filtra nada (retorna None).
+    """
+    text = (text or '').strip()
+    if not text:
+        return None
+
+    values = {}
+    leftover = _FILTER_TERM.sub(' ', text).strip()
+    if leftover:
+        raise FilterError(
+            f"Trecho não reconhecido no filtro: '{leftover}' "
+            "(use ano:2015-2024 tipo:artigo idioma:en)."
+        )
+    for field, value in _FILTER_TERM.findall(text):
+        name = FILTER_FIELDS.get(_fold(field))
+        if name is None:
+            raise FilterError(f"Campo de filtro desconhecido: '{field}' (use ano, tipo ou idioma).")
+        values[name] = value
+
+    year_from, year_to = parse_years(values['ano']) if 'ano' in values else (None, None)
+    return RowFilter(
+        year_from, year_to,
+        _names(values['tipo'], document_types) if 'tipo' in values else (),
+        _names(values['idioma'], languages) if 'idioma' in values else (),
+    )
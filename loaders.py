@@ -0,0 +1,760 @@
+"""
+Carregamento de Arquivos - Analisador de Artigos v2.0
+Seleção automática do motor de leitura e importação de BibTeX, RIS e Excel
+"""
+
+import contextlib
+import io
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+from columns import find_identifier_columns, is_academic_column
+from profiler import is_header_row, unnamed_columns
+
+
+# Limiares de seleção do motor: estimativas para listas acadêmicas típicas
+# (títulos longos, poucas colunas numéricas), não medições; ajuste aqui
+SMALL_FILE_BYTES = 16 * 1024 * 1024    # Abaixo disso o motor C tem menor latência
+PYARROW_MIN_CORES = 2                  # pyarrow só compensa com leitura paralela
+MEMORY_EXPANSION_FACTOR = 6            # DataFrame ocupa ~6x o tamanho do CSV em RAM
+MEMORY_SAFETY_RATIO = 0.5              # Nunca planeja usar mais da metade da RAM livre
+CHUNK_ROWS = 200_000                   # Linhas por bloco na leitura com filtro
+
+ENCODINGS = ('utf-8', 'latin1')
+
+
+@dataclass
+class LoadInfo:
+    """Registro de como um arquivo foi carregado"""
+    engine: str
+    reason: str
+    file_size: int
+    available_memory: Optional[int]
+    cpu_count: int
+    encoding: Optional[str] = None
+    rows_read: Optional[int] = None   # Linhas lidas antes do filtro (None: sem filtro)
+
+    def describe(self):
+        """Descrição curta para exibição na interface"""
+        return f"{self.engine} ({self.reason})"
+
+
+def available_memory():
+    """Retorna a memória livre em bytes, ou None se não for possível medir"""
+    if psutil is not None:
+        try:
+            return psutil.virtual_memory().available
+        except Exception:
+            pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_budget(free_memory):
+    """Memória que uma análise planeja usar, dada a memória livre"""
+    return int(free_memory * MEMORY_SAFETY_RATIO)
+
+
+def exceeds_memory(file_size, free_memory):
+    """
+    Indica se a tabela lida de um CSV desse tamanho não cabe no orçamento
+
+    Ler em blocos não resolve: juntar os blocos em uma tabela ocupa o
+    dobro de uma leitura direta. Listas assim vão para a análise em
+    memória externa (external.analyze_external).
+    """
+    if free_memory is None:
+        return False
+    return file_size * MEMORY_EXPANSION_FACTOR > memory_budget(free_memory)
+
+
+def choose_engine(file_size, free_memory, cpu_count, has_pyarrow=HAS_PYARROW):
+    """Escolhe o motor de leitura e retorna (motor, motivo)"""
+    size_mb = file_size / (1024 * 1024)
+
+    if file_size < SMALL_FILE_BYTES:
+        return 'c', f"arquivo pequeno ({size_mb:.1f} MB)"
+
+    if exceeds_memory(file_size, free_memory):
+        # O motor C não guarda cópias intermediárias da tabela
+        free_mb = free_memory / (1024 * 1024)
+        return 'c', f"{size_mb:.0f} MB pode exceder a memória livre ({free_mb:.0f} MB)"
+
+    if not has_pyarrow:
+        return 'c', f"arquivo grande ({size_mb:.0f} MB), pyarrow não instalado"
+
+    if cpu_count < PYARROW_MIN_CORES:
+        return 'c', f"arquivo grande ({size_mb:.0f} MB), apenas {cpu_count} núcleo"
+
+    return 'pyarrow', f"arquivo grande ({size_mb:.0f} MB), {cpu_count} núcleos"
+
+
+def _source_size(source):
+    """Tamanho em bytes de um caminho ou de um conteúdo já lido"""
+    return len(source) if isinstance(source, bytes) else os.path.getsize(source)
+
+
+def _binary_input(source):
+    """Entrada binária nova a cada chamada (permite tentar outro encoding)"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _text_input(source, encoding):
+    """Abre um caminho ou conteúdo já lido como texto"""
+    if isinstance(source, bytes):
+        return io.TextIOWrapper(io.BytesIO(source), encoding=encoding, newline='')
+    return open(source, encoding=encoding, newline='')
+
+
+def note_filter(info, row_filter, kept, total):
+    """Registra no LoadInfo quantas linhas o filtro excluiu"""
+    info.rows_read = total
+    info.reason = (
+        f"{info.reason}; filtro {row_filter.describe()}: "
+        f"{total - kept:,} de {total:,} registros excluídos"
+    )
+
+
+def concat_filtered(chunks, row_filter, columns=None):
+    """
+    Junta os blocos mantendo só as linhas que atendem ao filtro
+
+    Cada bloco é filtrado assim que é lido, então as linhas excluídas
+    nunca chegam à tabela completa nem à detecção de duplicados. columns
+    descarta colunas lidas só para o filtro. Retorna a tabela (com o
+    índice das linhas no arquivo) e o total de linhas lidas.
+    """
+    kept, total = [], 0
+    for chunk in chunks:
+        total += len(chunk)
+        chunk = chunk[row_filter.mask(chunk)]
+        kept.append(chunk if columns is None else chunk[list(columns)])
+    if not kept:
+        return pd.DataFrame(columns=list(columns or ())), total
+    return pd.concat(kept), total
+
+
+def _first_row(source, encoding):
+    """Valores da primeira linha do CSV (None se o arquivo está vazio)"""
+    try:
+        first = pd.read_csv(_binary_input(source), encoding=encoding, header=None, nrows=1,
+                            dtype=str)
+    except pd.errors.EmptyDataError:
+        return None
+    return None if first.empty else first.iloc[0].tolist()
+
+
+def csv_layout(source, encoding):
+    """
+    Argumentos de leitura conforme a primeira linha do CSV
+
+    Quando ela é cabeçalho, as colunas de DOI e ISBN são lidas como texto
+    (com tipo inferido, um ISBN vira float na coluna com células vazias e
+    perde o zero à esquerda); quando ela já é um registro (exportação sem
+    cabeçalho), header=None e nomes coluna_N. Só essa linha é lida.
+    """
+    first = _first_row(source, encoding)
+    if first is None:
+        return {}
+    if is_header_row(first):
+        identifiers = [col for col in find_identifier_columns(first) if col is not None]
+        return {'dtype': dict.fromkeys(identifiers, str)} if identifiers else {}
+    return {'header': None, 'names': unnamed_columns(len(first))}
+
+
+def read_csv_header(source):
+    """
+    Nomes das colunas do CSV, lendo só a primeira linha
+
+    None quando o arquivo está vazio, não tem cabeçalho ou não pode ser
+    decodificado.
+    """
+    for encoding in ENCODINGS:
+        try:
+            first = _first_row(source, encoding)
+        except UnicodeDecodeError:
+            continue
+        if first is None or not is_header_row(first):
+            return None
+        # Mesmos nomes que o pandas dá ao ler o arquivo inteiro
+        return list(pd.read_csv(_binary_input(source), encoding=encoding, nrows=0).columns)
+    return None
+
+
+def _read_with_engine(source, engine, encoding, columns=None):
+    """Lê o CSV com o motor e encoding informados (columns: só essas colunas)"""
+    layout = csv_layout(source, encoding)
+    if columns is not None:
+        layout['usecols'] = columns
+    source = _binary_input(source)
+    if engine == 'pyarrow':
+        return pd.read_csv(source, encoding=encoding, engine='pyarrow', **layout)
+    return pd.read_csv(source, encoding=encoding, **layout)
+
+
+def _read_filtered(source, encoding, row_filter, columns=None):
+    """Lê o CSV em blocos, filtrando cada um; retorna a tabela e as linhas lidas"""
+    chunks = pd.read_csv(_binary_input(source), encoding=encoding, chunksize=CHUNK_ROWS,
+                         usecols=columns, **csv_layout(source, encoding))
+    return concat_filtered(chunks, row_filter)
+
+
+def read_csv_auto(source, engine=None, row_filter=None, columns=None):
+    """
+    Lê um CSV escolhendo automaticamente o motor de leitura
+
+    source é um caminho ou o conteúdo do arquivo em bytes. Retorna o
+    DataFrame e um LoadInfo com o motor usado e o motivo da escolha.
+    Com row_filter (filters.RowFilter), o arquivo é lido em blocos e só
+    as linhas que atendem ao filtro são mantidas. columns restringe a
+    leitura a essas colunas (as demais nem são convertidas).
+    """
+    file_size = _source_size(source)
+    free_memory = available_memory()
+    cpu_count = os.cpu_count() or 1
+
+    if engine:
+        reason = "escolhido manualmente"
+    else:
+        engine, reason = choose_engine(file_size, free_memory, cpu_count)
+
+    info = LoadInfo(engine, reason, file_size, free_memory, cpu_count)
+
+    if row_filter:
+        info.engine = 'chunked'
+        info.reason = f"blocos de {CHUNK_ROWS:,} linhas filtrados na leitura"
+
+    last_error = None
+    for encoding in ENCODINGS:
+        if row_filter:
+            try:
+                df, total = _read_filtered(source, encoding, row_filter, columns)
+            except UnicodeDecodeError as e:
+                last_error = e
+                continue
+            info.encoding = encoding
+            note_filter(info, row_filter, len(df), total)
+            return df, info
+
+        try:
+            df = _read_with_engine(source, info.engine, encoding, columns)
+        except UnicodeDecodeError as e:
+            last_error = e
+            continue
+        except Exception as e:
+            if info.engine != 'pyarrow':
+                raise
+            # pyarrow é mais restrito (ex.: UTF-8 inválido); volta ao motor C
+            info.engine = 'c'
+            info.reason = f"pyarrow falhou ({type(e).__name__}), usando motor C"
+            try:
+                df = _read_with_engine(source, info.engine, encoding, columns)
+            except UnicodeDecodeError as e:
+                last_error = e
+                continue
+
+        info.encoding = encoding
+        return df, info
+
+    raise last_error
+
+
+# ---------------------------------------------------------------------------
+# Formatos de gerenciadores de referências (BibTeX e RIS)
+# ---------------------------------------------------------------------------
+
+REFERENCE_COLUMNS = ('title', 'author', 'year', 'doi')
+REFERENCE_FILTER_COLUMNS = ('type', 'language')   # Lidas só quando há filtro
+REFERENCE_BATCH_ROWS = 50_000
+
+_BIB_ENTRY_BOUNDARY = re.compile(r'\n(?=[ \t]*@)')
+_BIB_ENTRY_START = re.compile(r'\s*@\s*(\w+)\s*\{')
+# Captura direto valores simples ({...}, "..." ou número); os aninhados vão para _bib_value
+_BIB_FIELD = re.compile(
+    r',\s*(title|author|year|doi|language)\s*=\s*(?:\{([^{}]*)\}|"([^"{}]*)"|(\d+))?',
+    re.IGNORECASE
+)
+_BIB_AUTHOR_SEPARATOR = re.compile(r'\s+and\s+')
+_BIB_BARE_VALUE = re.compile(r'[^,}#\s]+')
+_BIB_MAX_ENTRY_CHARS = 1024 * 1024    # Entrada desbalanceada não consome o arquivo todo
+_BIB_SKIPPED_TYPES = {'comment', 'preamble', 'string'}
+_LATEX_ACCENT = re.compile(r'''\\([`'^"~c=.])\s*\{?([A-Za-z])\}?''')
+_LATEX_ACCENT_MARKS = {
+    '`': '\u0300', "'": '\u0301', '^': '\u0302', '~': '\u0303',
+    '=': '\u0304', '.': '\u0307', '"': '\u0308', 'c': '\u0327',
+}
+_YEAR = re.compile(r'\d{4}')
+_RIS_LINE = re.compile(r'^([A-Z][A-Z0-9])  -(?: (.*))?$')
+_RIS_TAGS = {
+    'TI': 'title', 'T1': 'title', 'CT': 'title', 'BT': 'title',
+    'AU': 'author', 'A1': 'author',
+    'PY': 'year', 'Y1': 'year', 'DA': 'year',
+    'DO': 'doi',
+    'LA': 'language',
+}
+
+
+def _clean_latex(value):
+    """Converte acentos LaTeX comuns e remove chaves de proteção"""
+    if '\\' in value:
+        value = _LATEX_ACCENT.sub(
+            lambda m: m.group(2) + _LATEX_ACCENT_MARKS[m.group(1)], value
+        )
+        value = unicodedata.normalize('NFC', value)
+    if '{' in value:
+        value = value.replace('{', '').replace('}', '')
+    return ' '.join(value.split())
+
+
+def _bib_value(body, pos):
+    """Extrai o valor de um campo BibTeX a partir da posição informada"""
+    if pos >= len(body):
+        return ''
+
+    opener = body[pos]
+    if opener == '{':
+        # Caso mais comum: valor sem chaves internas
+        next_close = body.find('}', pos)
+        next_open = body.find('{', pos + 1)
+        if next_open == -1 or next_open > next_close:
+            return body[pos + 1:next_close] if next_close != -1 else body[pos + 1:]
+
+        depth = 0
+        i = pos
+        while True:
+            next_open = body.find('{', i)
+            next_close = body.find('}', i)
+            if next_close == -1:
+                return body[pos + 1:]
+            if next_open != -1 and next_open < next_close:
+                depth += 1
+                i = next_open + 1
+            else:
+                depth -= 1
+                i = next_close + 1
+                if depth == 0:
+                    return body[pos + 1:next_close]
+
+    if opener == '"':
+        depth = 0
+        for i in range(pos + 1, len(body)):
+            char = body[i]
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            elif char == '"' and depth == 0:
+                return body[pos + 1:i]
+        return body[pos + 1:]
+
+    match = _BIB_BARE_VALUE.match(body, pos)
+    return match.group(0) if match else ''
+
+
+def _parse_bib_entry(body, entry_type=None):
+    """Lê título, autor, ano, DOI, idioma e tipo do corpo de uma entrada BibTeX"""
+    record = dict.fromkeys(REFERENCE_COLUMNS + REFERENCE_FILTER_COLUMNS)
+    record['type'] = entry_type
+    depth = 0
+    last = 0
+
+    for match in _BIB_FIELD.finditer(body):
+        start = match.start()
+        # Só aceita campos no nível da entrada, nunca dentro de outro valor
+        depth += body.count('{', last, start) - body.count('}', last, start)
+        last = start
+        if depth != 0:
+            continue
+
+        field = match.group(1).lower()
+        if record[field] is None:
+            _, braced, quoted, number = match.groups()
+            value = braced if braced is not None else quoted if quoted is not None else number
+            record[field] = value if value is not None else _bib_value(body, match.end())
+
+    if record['title'] is not None:
+        record['title'] = _clean_latex(record['title'])
+    if record['author'] is not None:
+        authors = _BIB_AUTHOR_SEPARATOR.split(_clean_latex(record['author']))
+        record['author'] = '; '.join(author for author in authors if author)
+    if record['year'] is not None:
+        year = _YEAR.search(record['year'])
+        record['year'] = year.group(0) if year else None
+    if record['doi'] is not None:
+        record['doi'] = _clean_latex(record['doi'])
+    if record['language'] is not None:
+        record['language'] = _clean_latex(record['language'])
+
+    return record
+
+
+def _split_bib_blocks(handle, block_size):
+    """Lê o arquivo em blocos e gera trechos que começam em '@' no início da linha"""
+    carry = ''
+    while True:
+        block = handle.read(block_size)
+        if not block:
+            break
+        pieces = _BIB_ENTRY_BOUNDARY.split(carry + block)
+        carry = pieces.pop()
+        yield from pieces
+    if carry:
+        yield carry
+
+
+def iter_bibtex(handle, block_size=1024 * 1024):
+    """
+    Percorre entradas BibTeX em blocos, sem carregar o arquivo inteiro
+
+    Gera um dicionário por entrada com as chaves title, author, year e doi,
+    além de type (tipo da entrada) e language.
+    """
+    pending = ''
+    for piece in _split_bib_blocks(handle, block_size):
+        if pending:
+            # Um '@' no início de linha dentro de um valor quebrou a entrada
+            piece = pending + '\n' + piece
+            pending = ''
+
+        match = _BIB_ENTRY_START.match(piece)
+        if not match:
+            continue
+
+        body = piece[match.end():]
+        if body.count('{') - body.count('}') >= 0 and len(piece) < _BIB_MAX_ENTRY_CHARS:
+            pending = piece
+            continue
+
+        if match.group(1).lower() not in _BIB_SKIPPED_TYPES:
+            # Remove a chave de fechamento da entrada
+            yield _parse_bib_entry(body[:body.rfind('}')], match.group(1).lower())
+
+    if pending:
+        match = _BIB_ENTRY_START.match(pending)
+        if match.group(1).lower() not in _BIB_SKIPPED_TYPES:
+            yield _parse_bib_entry(pending[match.end():], match.group(1).lower())
+
+
+def iter_ris(lines):
+    """
+    Percorre registros RIS linha a linha, sem carregar o arquivo inteiro
+
+    Gera um dicionário por registro com as chaves title, author, year e doi,
+    além de type (campo TY) e language (LA).
+    """
+    record = None
+    authors = []
+    last_field = None
+
+    for line in lines:
+        line = line.rstrip('\r\n').lstrip('\ufeff')
+        match = _RIS_LINE.match(line)
+
+        if not match:
+            # Linha de continuação do campo anterior
+            if record is not None and last_field in ('title', 'doi') and record[last_field] and line.strip():
+                record[last_field] = f"{record[last_field]} {line.strip()}"
+            continue
+
+        tag, value = match.group(1), (match.group(2) or '').strip()
+
+        if tag == 'TY':
+            record = dict.fromkeys(REFERENCE_COLUMNS + REFERENCE_FILTER_COLUMNS)
+            record['type'] = value or None
+            authors = []
+            last_field = None
+            continue
+
+        if record is None:
+            continue
+
+        if tag == 'ER':
+            record['author'] = '; '.join(authors) if authors else None
+            yield record
+            record = None
+            continue
+
+        field = _RIS_TAGS.get(tag)
+        last_field = field
+        if field is None or not value:
+            continue
+
+        if field == 'author':
+            authors.append(value)
+        elif field == 'year':
+            year = _YEAR.search(value)
+            if record['year'] is None and year:
+                record['year'] = year.group(0)
+        elif record[field] is None:
+            record[field] = value
+
+
+REFERENCE_PARSERS = {
+    '.bib': ('bibtex', iter_bibtex),
+    '.ris': ('ris', iter_ris),
+}
+
+
+def iter_reference_batches(source, suffix, batch_rows=REFERENCE_BATCH_ROWS, encoding='utf-8',
+                           fields=REFERENCE_COLUMNS):
+    """
+    Gera DataFrames de até batch_rows registros lidos de um arquivo .bib ou .ris
+
+    fields escolhe as colunas; REFERENCE_FILTER_COLUMNS traz também tipo
+    e idioma, usados pelos filtros de leitura.
+    """
+    _, parser = REFERENCE_PARSERS[suffix]
+    columns = {name: [] for name in fields}
+
+    with _text_input(source, encoding) as handle:
+        for record in parser(handle):
+            for name in fields:
+                columns[name].append(record[name])
+
+            if len(columns['title']) >= batch_rows:
+                yield pd.DataFrame(columns)
+                columns = {name: [] for name in fields}
+
+    if columns['title']:
+        yield pd.DataFrame(columns)
+
+
+def _filter_fields(row_filter):
+    """Colunas lidas das referências: com filtro, também tipo e idioma"""
+    return REFERENCE_COLUMNS + REFERENCE_FILTER_COLUMNS if row_filter else REFERENCE_COLUMNS
+
+
+def read_references(source, suffix, row_filter=None):
+    """
+    Lê um arquivo BibTeX ou RIS e retorna o DataFrame e o LoadInfo
+
+    Com row_filter, cada lote de registros é filtrado assim que é lido.
+    """
+    engine, _ = REFERENCE_PARSERS[suffix]
+    info = LoadInfo(
+        engine, "leitura em fluxo de referências",
+        _source_size(source), available_memory(), os.cpu_count() or 1
+    )
+
+    last_error = None
+    for encoding in ENCODINGS:
+        try:
+            if row_filter:
+                df, total = concat_filtered(
+                    _indexed_batches(iter_reference_batches(
+                        source, suffix, encoding=encoding, fields=_filter_fields(row_filter)
+                    )),
+                    row_filter, REFERENCE_COLUMNS
+                )
+            else:
+                batches = list(iter_reference_batches(source, suffix, encoding=encoding))
+        except UnicodeDecodeError as e:
+            last_error = e
+            continue
+
+        info.encoding = encoding
+        if row_filter:
+            note_filter(info, row_filter, len(df), total)
+            return df, info
+        if not batches:
+            return pd.DataFrame(columns=list(REFERENCE_COLUMNS)), info
+        return pd.concat(batches, ignore_index=True), info
+
+    raise last_error
+
+
+# ---------------------------------------------------------------------------
+# Planilhas Excel (.xlsx)
+# ---------------------------------------------------------------------------
+
+def iter_table_chunks(file_path, encoding, chunk_rows, row_filter=None):
+    """
+    Lê um CSV, BibTeX ou RIS em blocos de até chunk_rows linhas
+
+    O índice de cada bloco continua o do anterior (posição da linha no
+    arquivo). Com row_filter, cada bloco traz só as linhas que atendem ao
+    filtro (pode vir vazio) e guarda em attrs['rows_read'] quantas linhas
+    foram lidas antes dele.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix in REFERENCE_PARSERS:
+        chunks = _indexed_batches(iter_reference_batches(
+            file_path, suffix, chunk_rows, encoding, _filter_fields(row_filter)
+        ))
+        columns = list(REFERENCE_COLUMNS)
+    else:
+        # Texto em todas as colunas: a inferência de tipos variaria de um bloco para outro
+        layout = {**csv_layout(file_path, encoding), 'dtype': str}
+        chunks = pd.read_csv(file_path, encoding=encoding, chunksize=chunk_rows, **layout)
+        columns = None
+
+    with contextlib.closing(chunks):
+        if not row_filter:
+            yield from chunks
+            return
+        for chunk in chunks:
+            rows_read = len(chunk)
+            chunk = chunk[row_filter.mask(chunk)]
+            if columns is not None:
+                chunk = chunk[columns]
+            chunk.attrs['rows_read'] = rows_read
+            yield chunk
+
+
+def _indexed_batches(batches):
+    """Lotes de referências com índice contínuo (posição do registro no arquivo)"""
+    start = 0
+    for batch in batches:
+        batch.index = pd.RangeIndex(start, start + len(batch))
+        start += len(batch)
+        yield batch
+
+
+EXCEL_SUFFIXES = ('.xlsx', '.xlsm')
+
+
+def _open_workbook(source):
+    """Abre a pasta de trabalho em modo somente leitura (linhas sob demanda)"""
+    if openpyxl is None:
+        raise ImportError(
+            "A leitura de planilhas .xlsx requer o pacote openpyxl "
+            "(pip install openpyxl)."
+        )
+    return openpyxl.load_workbook(_binary_input(source), read_only=True, data_only=True)
+
+
+def list_excel_sheets(file_path):
+    """Retorna os nomes das planilhas de um arquivo .xlsx"""
+    workbook = _open_workbook(file_path)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_excel_stream(source, sheet=None, columns=None, row_filter=None):
+    """
+    Lê uma planilha .xlsx linha a linha, mantendo só as colunas relevantes
+
+    Por padrão mantém apenas as colunas com cabeçalho acadêmico (título,
+    autor, DOI, ano...); sem nenhuma, mantém todas e a detecção usa o
+    conteúdo. Uma primeira linha que já é registro vira dado, com colunas
+    coluna_1, coluna_2... Com row_filter, cada linha é testada enquanto é
+    lida e só as que atendem ao filtro são guardadas. Retorna o DataFrame
+    e o LoadInfo.
+    """
+    workbook = _open_workbook(source)
+    try:
+        if sheet and sheet not in workbook.sheetnames:
+            raise ValueError(f"Planilha '{sheet}' não encontrada no arquivo.")
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        # Dimensões gravadas por alguns programas são incorretas
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame(), _excel_info(source, worksheet.title)
+
+        names = ['' if cell is None else str(cell).strip() for cell in header]
+        first_row = 2
+        if columns is None and not is_header_row(header):
+            names, first_row = unnamed_columns(len(header)), 1
+        if columns is None:
+            wanted = [i for i, name in enumerate(names) if name and is_academic_column(name)]
+            if not wanted:
+                wanted = [i for i, name in enumerate(names) if name]
+        else:
+            wanted = [i for i, name in enumerate(names) if name in columns]
+
+        # Cabeçalhos repetidos: mantém a primeira ocorrência
+        wanted = [i for i in wanted if names.index(names[i]) == i]
+
+        if not wanted:
+            return pd.DataFrame(columns=[name for name in names if name]), _excel_info(source, worksheet.title)
+
+        # Colunas do filtro são lidas mesmo fora das selecionadas
+        checks = row_filter.checks([name for name in names if name]) if row_filter else []
+        check_columns = [names.index(column) for column, _ in checks]
+
+        # Limita a leitura ao intervalo de colunas selecionadas
+        first, last = min(wanted + check_columns), max(wanted + check_columns)
+        rows = worksheet.iter_rows(
+            min_row=first_row, min_col=first + 1, max_col=last + 1, values_only=True
+        )
+        offsets = [i - first for i in wanted]
+        data = {names[i]: [] for i in wanted}
+        targets = [data[names[i]] for i in wanted]
+        tests = [(i - first, accept) for i, (_, accept) in zip(check_columns, checks)]
+
+        total = 0
+        for row in rows:
+            if not any(row):
+                continue
+            total += 1
+            if tests and not all(
+                offset < len(row) and accept(row[offset]) for offset, accept in tests
+            ):
+                continue
+            for offset, target in zip(offsets, targets):
+                target.append(row[offset] if offset < len(row) else None)
+
+        info = _excel_info(source, worksheet.title)
+        df = pd.DataFrame(data)
+        if row_filter:
+            note_filter(info, row_filter, len(df), total)
+        return df, info
+    finally:
+        workbook.close()
+
+
+def _excel_info(source, sheet_name):
+    """Monta o LoadInfo de uma leitura de planilha"""
+    return LoadInfo(
+        'openpyxl', f"leitura em fluxo da planilha '{sheet_name}'",
+        _source_size(source), available_memory(), os.cpu_count() or 1
+    )
+
+
+def load_table(file_path, sheet=None, data=None, row_filter=None, columns=None):
+    """
+    Carrega qualquer formato suportado conforme a extensão do arquivo
+
+    Com data (conteúdo já lido em bytes), file_path só define o formato.
+    row_filter (filters.RowFilter) é aplicado durante a leitura: blocos
+    no CSV, lotes de registros no BibTeX e RIS e linhas no Excel.
+    columns lê só essas colunas de um CSV (os demais formatos já
+    carregam apenas as colunas acadêmicas).
+    """
+    source = file_path if data is None else data
+    suffix = Path(file_path).suffix.lower()
+    if suffix in REFERENCE_PARSERS:
+        return read_references(source, suffix, row_filter)
+    if suffix in EXCEL_SUFFIXES:
+        return read_excel_stream(source, sheet=sheet, row_filter=row_filter)
+    return read_csv_auto(source, row_filter=row_filter, columns=columns)
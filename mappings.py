@@ -0,0 +1,183 @@
+"""
+Mapeamentos de Colunas - Analisador de Artigos v2.0
+Papéis das colunas guardados por layout de cabeçalho, reaproveitados nas próximas importações
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from accents import strip_accents
+from profiler import UNNAMED_PREFIX
+from storage import app_data_dir, file_lock
+
+
+MAPPINGS_VERSION = 1
+MAPPINGS_FILE = 'colunas.json'
+MAX_MAPPINGS = 200          # Layouts guardados; os menos recentes saem primeiro
+SHORT_SIGNATURE = 10        # Início da assinatura mostrado na listagem
+ROLES = ('titulo', 'autor', 'doi', 'isbn')
+SOURCE_DETECTED = 'detectado'
+SOURCE_USER = 'usuario'
+
+
+def _normalize_name(name):
+    """Nome da coluna sem acentos, minúsculo e com espaços simples"""
+    return ' '.join(strip_accents(str(name)).lower().split())
+
+
+def header_signature(columns):
+    """
+    Assinatura do layout: hash da lista de nomes normalizados, em ordem
+
+    Exportações da mesma base (Scopus, Web of Science, Lattes) têm sempre
+    a mesma assinatura, mesmo com diferenças de acento ou maiúsculas.
+    """
+    joined = '\x1f'.join(_normalize_name(name) for name in columns)
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()
+
+
+def _mappings_path():
+    return app_data_dir('perfis') / MAPPINGS_FILE
+
+
+def _read_all():
+    """Todos os mapeamentos gravados; arquivo ausente ou corrompido vale vazio"""
+    try:
+        with open(_mappings_path(), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != MAPPINGS_VERSION:
+        return {}
+    return data.get('layouts', {})
+
+
+def _write_all(layouts):
+    """Grava os mapeamentos de uma vez (arquivo temporário e troca atômica)"""
+    path = _mappings_path()
+    temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump({'version': MAPPINGS_VERSION, 'layouts': layouts}, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+
+
+def _is_unnamed(columns):
+    """Colunas nomeadas pelo leitor (arquivo sem cabeçalho) não identificam um layout"""
+    return all(str(name).startswith(UNNAMED_PREFIX) for name in columns)
+
+
+def load_mapping(columns):
+    """
+    Papéis (título, autor, doi, isbn) salvos para este cabeçalho, ou None
+
+    Os papéis vêm com os nomes deste cabeçalho ('TITLE' onde foi salvo
+    'Title'). Um mapeamento sem coluna de títulos é ignorado.
+    """
+    columns = list(columns)
+    if not columns or _is_unnamed(columns):
+        return None
+    entry = _read_all().get(header_signature(columns))
+    if entry is None or not entry.get('titulo'):
+        return None
+    by_name = {_normalize_name(name): name for name in columns}
+    return tuple(
+        by_name.get(_normalize_name(entry[role])) if entry.get(role) else None for role in ROLES
+    )
+
+
+def save_mapping(columns, roles, source=SOURCE_DETECTED):
+    """
+    Guarda os papéis das colunas deste cabeçalho
+
+    Um mapeamento corrigido pelo usuário não é substituído por uma
+    detecção automática. Retorna True quando o arquivo foi alterado.
+    A leitura e a gravação ficam sob trava, para que processos simultâneos
+    (janela, watch, serve, batch) não percam os layouts uns dos outros.
+    """
+    columns = list(columns)
+    if not columns or _is_unnamed(columns):
+        return False
+    with file_lock(_mappings_path()):
+        return _update(columns, roles, source)
+
+
+def _update(columns, roles, source):
+    """Lê, altera e grava os mapeamentos (chamada com a trava obtida)"""
+    layouts = _read_all()
+    signature = header_signature(columns)
+    current = layouts.get(signature)
+    mapping = dict(zip(ROLES, roles))
+    if current is not None:
+        if source == SOURCE_DETECTED and current.get('origem') == SOURCE_USER:
+            return False
+        if all(current.get(role) == mapping[role] for role in ROLES) and \
+                current.get('origem') == source:
+            return False
+
+    layouts[signature] = {
+        **mapping,
+        'origem': source,
+        'colunas': [str(name) for name in columns],
+        'atualizado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    if len(layouts) > MAX_MAPPINGS:
+        oldest = sorted(layouts, key=lambda key: layouts[key]['atualizado_em'])
+        for key in oldest[:len(layouts) - MAX_MAPPINGS]:
+            del layouts[key]
+    _write_all(layouts)
+    return True
+
+
+def save_mapping_quietly(columns, roles, source=SOURCE_DETECTED):
+    """Grava o mapeamento; uma falha aqui (disco, permissão) não afeta a análise"""
+    try:
+        return save_mapping(columns, roles, source)
+    except OSError:
+        return False
+
+
+def clear_mappings():
+    """Apaga todos os mapeamentos; retorna quantos havia"""
+    with file_lock(_mappings_path()):
+        count = len(_read_all())
+        _mappings_path().unlink(missing_ok=True)
+    return count
+
+
+def forget_mapping(signature):
+    """
+    Apaga o mapeamento de um layout; retorna as colunas dele ou None
+
+    signature pode ser só o início da assinatura, como mostrado em
+    describe_mappings, desde que não sirva para mais de um layout.
+    """
+    signature = signature.strip().lower()
+    if not signature:
+        return None
+    with file_lock(_mappings_path()):
+        layouts = _read_all()
+        matches = [key for key in layouts if key.startswith(signature)]
+        if len(matches) != 1:
+            return None
+        entry = layouts.pop(matches[0])
+        _write_all(layouts)
+    return entry['colunas']
+
+
+def describe_mappings():
+    """Texto com os layouts salvos, do mais para o menos recente"""
+    layouts = sorted(
+        _read_all().items(), key=lambda item: item[1]['atualizado_em'], reverse=True
+    )
+    if not layouts:
+        return "Nenhum mapeamento de colunas salvo."
+    lines = [f"{len(layouts)} layouts salvos em {_mappings_path()}"]
+    for signature, entry in layouts:
+        roles = ', '.join(f"{role}={entry[role]}" for role in ROLES if entry.get(role))
+        lines.append(
+            f"- {signature[:SHORT_SIGNATURE]}: {len(entry['colunas'])} colunas "
+            f"({entry['origem']}, {entry['atualizado_em']}): {roles}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,200 @@
+"""
+Processamento em Lote - Analisador de Artigos v2.0
+Pipeline assíncrono que sobrepõe análise e gravação de vários arquivos
+"""
+
+import asyncio
+import bz2
+import gzip
+import logging
+import lzma
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from analysis import AnalysisError, analyze_dataframe, read_mapped_table
+from exporters import (
+    ERROR_SUFFIX, is_output_file, output_path, write_outputs_beside
+)
+from watcher import is_candidate
+
+
+# Arquivos compactados são descompactados pelo próprio processo de análise
+DECOMPRESSORS = {
+    '.gz': gzip.decompress,
+    '.bz2': bz2.decompress,
+    '.xz': lzma.decompress,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def logical_name(path):
+    """Nome do arquivo sem a extensão de compactação (define o formato)"""
+    path = Path(path)
+    if path.suffix.lower() in DECOMPRESSORS:
+        return path.stem
+    return path.name
+
+
+def is_batch_candidate(path):
+    """Indica se o arquivo (compactado ou não) pode ser analisado em lote"""
+    return not is_output_file(path) and is_candidate(logical_name(path))
+
+
+def expand_paths(paths):
+    """Lista os arquivos a processar; pastas são expandidas (sem recursão)"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(
+                str(child) for child in sorted(path.iterdir())
+                if child.is_file() and is_batch_candidate(child)
+            )
+        else:
+            files.append(str(path))
+    return files
+
+
+def read_input(path):
+    """Lê o arquivo inteiro, descompactando se necessário"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    decompress = DECOMPRESSORS.get(Path(path).suffix.lower())
+    return decompress(data) if decompress else data
+
+
+def analyze_file(path):
+    """
+    Lê e analisa um arquivo (executa no pool de processos)
+
+    Retorna (ResultStore, None) ou (None, mensagem de erro). Só o caminho
+    vai ao processo de análise, que lê o arquivo do disco; o conteúdo
+    nunca passa pelo processo principal. Arquivos compactados são
+    descompactados em memória; os demais são lidos direto do caminho.
+    O resultado compacto volta como arrays e um bloco de texto, sem a
+    tabela lida. CSVs de layout conhecido têm só as colunas mapeadas lidas.
+    """
+    try:
+        data = None
+        if Path(path).suffix.lower() in DECOMPRESSORS:
+            data = read_input(path)
+    except Exception as e:
+        return None, f"Erro ao ler arquivo: {e}"
+
+    try:
+        if data is None:
+            df, load_info, roles = read_mapped_table(path)
+        else:
+            df, load_info, roles = read_mapped_table(logical_name(path), data=data)
+        del data
+        result = analyze_dataframe(df, load_info, workers=1, roles=roles)
+    except AnalysisError as e:
+        return None, f"{e.title}: {e.message}"
+    except Exception as e:
+        return None, f"Erro ao processar arquivo: {e}"
+    return result.store(), None
+
+
+def write_outputs(path, store, error):
+    """
+    Grava os resultados ou o arquivo de erro ao lado da entrada (executa em thread)
+
+    Retorna o resumo, ou None quando a análise falhou.
+    """
+    error_file = output_path(path, ERROR_SUFFIX)
+    if error:
+        error_file.write_text(error + "\n", encoding='utf-8')
+        return None
+
+    summary = write_outputs_beside(path, store)
+    if error_file.exists():
+        error_file.unlink()
+    return summary
+
+
+async def _feeder(paths, analyze_queue, analyzers):
+    """Distribui os caminhos entre as tarefas de análise"""
+    for path in paths:
+        await analyze_queue.put(path)
+
+    for _ in range(analyzers):
+        await analyze_queue.put(None)
+
+
+async def _analyzer(executor, analyze_queue, write_queue):
+    """Envia cada arquivo ao pool de processos"""
+    loop = asyncio.get_running_loop()
+    while True:
+        path = await analyze_queue.get()
+        if path is None:
+            return
+
+        store = None
+        try:
+            store, error = await loop.run_in_executor(executor, analyze_file, path)
+        except Exception as e:
+            error = str(e)
+        await write_queue.put((path, store, error))
+
+
+async def _writer(write_queue, results):
+    """Grava os resultados de arquivos anteriores enquanto os próximos são analisados"""
+    while True:
+        item = await write_queue.get()
+        if item is None:
+            return
+
+        path, store, error = item
+        summary = None
+        try:
+            summary = await asyncio.to_thread(write_outputs, path, store, error)
+        except OSError as e:
+            error = f"Erro ao gravar resultados: {e}"
+        del store, item
+
+        results.append((path, summary, error))
+        if error:
+            logger.error("Falha ao analisar %s: %s", path, error)
+        else:
+            logger.info(
+                "Analisado %s: %s registros, %s duplicados",
+                path, summary['total'], summary['duplicados']
+            )
+
+
+async def run_pipeline_async(paths, workers=None):
+    """
+    Processa os arquivos em duas etapas concorrentes
+
+    A leitura e a análise rodam no pool de processos, a gravação numa
+    thread. Cada processo recebe só o caminho e lê o arquivo por conta
+    própria, então no máximo workers arquivos estão na memória ao mesmo
+    tempo; a fila de gravação, também limitada a workers, guarda apenas
+    os resultados compactos.
+    """
+    workers = workers or os.cpu_count() or 1
+    analyze_queue = asyncio.Queue(maxsize=workers)
+    write_queue = asyncio.Queue(maxsize=workers)
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = asyncio.create_task(_writer(write_queue, results))
+        await asyncio.gather(
+            _feeder(paths, analyze_queue, workers),
+            *(_analyzer(executor, analyze_queue, write_queue) for _ in range(workers))
+        )
+        await write_queue.put(None)
+        await writer
+    return results
+
+
+def run_pipeline(paths, workers=None):
+    """Processa arquivos e pastas em lote; retorna (caminho, resumo, erro) por arquivo"""
+    files = expand_paths(paths)
+    started = time.perf_counter()
+    results = asyncio.run(run_pipeline_async(files, workers))
+    logger.info("%s arquivos processados em %.1fs", len(results), time.perf_counter() - started)
+    return results
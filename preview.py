@@ -0,0 +1,184 @@
+"""
+Prévia Rápida - Analisador de Artigos v2.0
+Estimativa de registros distintos e de registros excedentes com memória fixa (HyperLogLog)
+"""
+
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analysis import AnalysisError, detect_columns
+from dedupe import DOI_PREFIX, ISBN_PREFIX, build_keys
+from loaders import ENCODINGS, REFERENCE_PARSERS, iter_table_chunks
+
+
+PREVIEW_PRECISION = 14        # 2^14 registradores (16 KB): erro padrão de ~0,8%
+PREVIEW_CHUNK_ROWS = 50_000   # Linhas lidas por vez; define a memória usada na leitura
+CONFIDENCE_Z = 1.96           # Intervalo de 95%
+
+
+class HyperLogLog:
+    """
+    Estimador de cardinalidade com memória fixa
+
+    Cada hash de 64 bits escolhe um registrador pelos primeiros bits e
+    guarda a maior posição do primeiro bit 1 nos bits restantes. A
+    estimativa tem erro padrão de 1,04 / sqrt(registradores).
+    """
+
+    def __init__(self, precision=PREVIEW_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = np.zeros(self.size, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.size)
+
+    def add_hashes(self, hashes):
+        """Acrescenta um vetor de hashes uint64"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.intp)
+        rest = (hashes & np.uint64((1 << rest_bits) - 1)).astype(np.float64)
+        # frexp devolve o número de bits significativos sem erro de arredondamento
+        _, bit_length = np.frexp(rest)
+        rank = (rest_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self):
+        """Número estimado de valores distintos"""
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Poucos valores: contagem linear é mais precisa
+            return m * math.log(m / zeros)
+        return raw
+
+
+def _tier_counts(keys):
+    """Linhas por camada da chave (doi, isbn, texto)"""
+    doi = int(keys.str.startswith(DOI_PREFIX).sum())
+    isbn = int(keys.str.startswith(ISBN_PREFIX).sum())
+    return {'doi': doi, 'isbn': isbn, 'texto': len(keys) - doi - isbn}
+
+
+def _preview_chunks(file_path, encoding, max_rows):
+    """Blocos lidos para a prévia, parando em max_rows linhas"""
+    read = 0
+    for chunk in iter_table_chunks(file_path, encoding, PREVIEW_CHUNK_ROWS):
+        if max_rows is not None and read + len(chunk) >= max_rows:
+            yield chunk.iloc[:max_rows - read]
+            return
+        read += len(chunk)
+        yield chunk
+
+
+def _sketch_file(file_path, encoding, normalize_author, max_rows):
+    """Lê o arquivo uma vez alimentando o estimador com as chaves de comparação"""
+    sketch = HyperLogLog()
+    roles = None
+    rows = 0
+    tiers = {'doi': 0, 'isbn': 0, 'texto': 0}
+
+    for chunk in _preview_chunks(file_path, encoding, max_rows):
+        if roles is None:
+            roles = detect_columns(chunk)
+        title_col, author_col, doi_col, isbn_col = roles
+
+        chunk = chunk.dropna(subset=[title_col])
+        if not len(chunk):
+            continue
+        keys = build_keys(chunk, title_col, author_col, doi_col, isbn_col, normalize_author)
+        sketch.add_hashes(pd.util.hash_pandas_object(keys, index=False).to_numpy())
+        rows += len(keys)
+        for tier, count in _tier_counts(keys).items():
+            tiers[tier] += count
+
+    if roles is None:
+        raise AnalysisError(
+            "Arquivo Inválido",
+            "O arquivo não parece conter uma lista válida de artigos ou livros acadêmicos."
+        )
+    return sketch, roles, rows, tiers
+
+
+def quick_preview(file_path, normalize_author=True, max_rows=None):
+    """
+    Prévia da sujeira da lista sem a análise completa
+
+    Percorre o arquivo (ou as primeiras max_rows linhas) uma única vez e
+    estima os registros distintos com HyperLogLog; a memória usada não
+    depende do tamanho do arquivo. A taxa de excedentes é a fração de
+    registros que repetem uma chave já vista (1 - distintos / registros),
+    com intervalo de 95%. Não é a taxa de duplicação da análise completa,
+    que conta todas as linhas dos grupos, inclusive a primeira.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix != '.csv' and suffix not in REFERENCE_PARSERS:
+        raise AnalysisError("Erro", "A prévia rápida aceita arquivos CSV, BibTeX e RIS.")
+
+    started = time.perf_counter()
+    for encoding in ENCODINGS:
+        try:
+            sketch, roles, rows, tiers = _sketch_file(
+                file_path, encoding, normalize_author, max_rows
+            )
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise AnalysisError("Erro de Codificação", "Não foi possível ler o arquivo")
+
+    margin = CONFIDENCE_Z * sketch.relative_error
+    estimate = min(sketch.estimate(), rows)
+    unique_low = max(0.0, estimate * (1 - margin))
+    unique_high = min(float(rows), estimate * (1 + margin))
+
+    def surplus_rate(unique):
+        return 1 - unique / rows if rows else 0.0
+
+    title_col, author_col, doi_col, isbn_col = roles
+    return {
+        'registros': rows,
+        'unicos_estimados': int(round(estimate)),
+        'unicos_intervalo': (int(unique_low), int(math.ceil(unique_high))),
+        'taxa_excedentes': surplus_rate(estimate),
+        'taxa_excedentes_intervalo': (surplus_rate(unique_high), surplus_rate(unique_low)),
+        'registros_por_camada': tiers,
+        'coluna_titulo': title_col,
+        'coluna_autor': author_col,
+        'coluna_doi': doi_col,
+        'coluna_isbn': isbn_col,
+        'amostra': max_rows is not None,
+        'segundos': time.perf_counter() - started,
+    }
+
+
+def describe_preview(preview):
+    """Texto da prévia para o usuário"""
+    low, high = preview['taxa_excedentes_intervalo']
+    unique_low, unique_high = preview['unicos_intervalo']
+    scope = "primeiras linhas" if preview['amostra'] else "arquivo inteiro"
+    lines = [
+        f"Registros lidos ({scope}): {preview['registros']:,}",
+        f"Únicos estimados: {preview['unicos_estimados']:,} (entre {unique_low:,} e {unique_high:,})",
+        f"Excedentes estimados: {preview['taxa_excedentes']:.1%} "
+        f"(entre {low:.1%} e {high:.1%}, 95% de confiança)",
+        "  cópias além da primeira de cada registro; a taxa de duplicação da "
+        "análise completa conta também a primeira",
+        f"Coluna de títulos: '{preview['coluna_titulo']}'",
+    ]
+    if preview['coluna_autor']:
+        lines.append(f"Coluna de autores: '{preview['coluna_autor']}'")
+    if preview['coluna_doi']:
+        lines.append(f"Coluna de DOI: '{preview['coluna_doi']}'")
+    if preview['coluna_isbn']:
+        lines.append(f"Coluna de ISBN: '{preview['coluna_isbn']}'")
+    lines.append(f"Tempo: {preview['segundos']:.1f}s")
+    return "\n".join(lines)
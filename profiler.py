@@ -0,0 +1,173 @@
+"""
+Perfil de Colunas - Analisador de Artigos v2.0
+Papéis das colunas inferidos pelo conteúdo de uma amostra, para arquivos sem cabeçalho útil
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from columns import is_academic_column
+from dedupe import normalize_doi, normalize_isbn
+
+
+PROFILE_SAMPLE_ROWS = 1_000   # Linhas sorteadas por tabela; o custo não cresce com o arquivo
+PROFILE_MAX_CHARS = 500       # Trecho de cada valor considerado (resumos longos não pesam)
+MIN_ROLE_SCORE = 0.5          # Pontuação mínima para uma coluna assumir um papel
+TITLE_WORDS = (3, 40)         # Palavras de um título típico (mais que isso é resumo)
+UNNAMED_PREFIX = 'coluna_'    # Nomes dados às colunas de arquivos sem cabeçalho
+
+_AUTHOR_LIST_SEPARATORS = re.compile(r'\s*;\s*|\s+(?:and|e|&)\s+', re.IGNORECASE)
+_NAME_PATTERNS = (
+    re.compile(r"^[^\W\d_][\w'\- ]{0,40},\s*[^\W\d_]"),            # Silva, J. / Silva, João
+    re.compile(r"^(?:[^\W\d_]\.\s*)+[^\W\d_][\w'\-]+$"),           # J. Silva / J.A. Silva
+    re.compile(r"^[^\W\d_][\w'\-]+(?:\s+[\w'\-]+)*\s+[A-Z]{1,3}$"),  # Silva JA
+    re.compile(r"^[A-ZÀ-Ý][\w'\-]+(?:\s+(?:[A-ZÀ-Ý][\w'\-]+|d[aeo]s?|van|von)){1,3}$"),  # João da Silva
+)
+# Do primeiro separador da lista em diante: o que sobra é o primeiro nome
+_AFTER_FIRST_AUTHOR = re.compile(
+    rf'(?:{_AUTHOR_LIST_SEPARATORS.pattern}).*', re.IGNORECASE | re.DOTALL
+)
+_ANY_NAME_PATTERN = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in _NAME_PATTERNS))
+_YEAR_VALUE = re.compile(r'^\s*(\d{4})(?:\.0+)?(?:\s*[-/.].*)?\s*$')
+# Só dígitos, X, separadores e o prefixo 'ISBN': os demais valores nem são convertidos
+_ISBN_CHARS = re.compile(r'^[\d\s\-:xisbn]+$', re.IGNORECASE)
+
+
+def unnamed_columns(count):
+    """Nomes para as colunas de um arquivo sem cabeçalho (coluna_1, coluna_2...)"""
+    return [f"{UNNAMED_PREFIX}{i + 1}" for i in range(count)]
+
+
+def sample_rows(df, size=PROFILE_SAMPLE_ROWS, seed=0):
+    """
+    Amostra aleatória de até size linhas, na ordem do arquivo
+
+    A semente é fixa: o mesmo arquivo recebe sempre os mesmos papéis.
+    """
+    if len(df) <= size:
+        return df
+    positions = np.random.default_rng(seed).choice(len(df), size=size, replace=False)
+    return df.iloc[np.sort(positions)]
+
+
+def _is_year(values):
+    """Valores que são um ano plausível ('2019', '2019.0', '2019-05')"""
+    years = pd.to_numeric(values.str.extract(_YEAR_VALUE, expand=False), errors='coerce')
+    return years.between(1500, 2100)
+
+
+def _is_isbn(values):
+    """ISBNs válidos; só os valores com cara de ISBN são convertidos"""
+    shaped = values.str.match(_ISBN_CHARS).fillna(False).astype(bool)
+    return normalize_isbn(values[shaped]).reindex(values.index).notna()
+
+
+def _is_name(values):
+    """Valores cujo primeiro nome da lista tem forma de nome de autor"""
+    first = values.str.replace(_AFTER_FIRST_AUTHOR, '', n=1, regex=True).str.strip()
+    short = first[first.str.len().between(1, 60)]
+    return short.str.match(_ANY_NAME_PATTERN).reindex(values.index, fill_value=False)
+
+
+class ColumnProfile:
+    """
+    Medidas de uma coluna na amostra e pontuação de cada papel
+
+    As proporções (doi, isbn, year, name, title_like, listed) são sobre os
+    valores preenchidos da amostra; filled é sobre todas as linhas dela.
+    """
+
+    def __init__(self, column, values):
+        self.column = column
+        present = values.dropna().astype(str).str.strip().str.slice(0, PROFILE_MAX_CHARS)
+        present = present[present != '']
+        self.filled = len(present) / len(values) if len(values) else 0.0
+        self.count = len(present)
+        if not self.count:
+            self.avg_length = self.avg_words = 0.0
+            self.doi = self.isbn = self.year = self.name = self.title_like = 0.0
+            self.listed = self.distinct = 0.0
+            return
+
+        words = present.str.split().str.len()
+        self.avg_length = float(present.str.len().mean())
+        self.avg_words = float(words.mean())
+        self.distinct = present.nunique() / self.count
+        self.doi = float(normalize_doi(present).notna().mean())
+        self.isbn = float(_is_isbn(present).mean())
+        self.year = float(_is_year(present).mean())
+        self.name = float(_is_name(present).mean())
+        self.listed = float(present.str.contains(';', regex=False).mean())
+        self.title_like = float(words.between(*TITLE_WORDS).mean())
+
+    def scores(self):
+        """Pontuação de 0 a 1 para cada papel (titulo, autor, doi, isbn, ano)"""
+        if not self.count:
+            return dict.fromkeys(('titulo', 'autor', 'doi', 'isbn', 'ano'), 0.0)
+        identifier = max(self.doi, self.isbn, self.year)
+        # Títulos e autores variam muito mais que periódicos e palavras-chave,
+        # que também têm cara de frase ou de nome próprio
+        variety = 0.5 + 0.5 * self.distinct
+        title = (
+            self.title_like * (1 - self.name) * (1 - identifier) * (1 - self.listed) * variety
+        ) if self.avg_length > 10 else 0.0
+        return {
+            'titulo': title,
+            'autor': self.name * (1 - identifier) * variety,
+            'doi': self.doi,
+            'isbn': self.isbn,
+            'ano': self.year,
+        }
+
+    def __repr__(self):
+        scores = ', '.join(f"{role}={score:.2f}" for role, score in self.scores().items())
+        return f"ColumnProfile({self.column!r}, {scores})"
+
+
+def profile_columns(df, size=PROFILE_SAMPLE_ROWS):
+    """Perfil de cada coluna, medido em uma amostra de até size linhas"""
+    sample = sample_rows(df, size)
+    return {column: ColumnProfile(column, sample[column]) for column in df.columns}
+
+
+def infer_columns(df, size=PROFILE_SAMPLE_ROWS):
+    """
+    Papéis das colunas pelo conteúdo: (título, autor, doi, isbn, ano)
+
+    Cada coluna assume no máximo um papel; identificadores e ano são
+    escolhidos primeiro, pois seus formatos são inequívocos. Papéis sem
+    coluna com pontuação mínima ficam None.
+    """
+    scores = {column: profile.scores() for column, profile in profile_columns(df, size).items()}
+    chosen = {}
+    for role in ('doi', 'isbn', 'ano', 'titulo', 'autor'):
+        candidates = [
+            (score[role], column) for column, score in scores.items()
+            if column not in chosen.values() and score[role] >= MIN_ROLE_SCORE
+        ]
+        if candidates:
+            # Empate: a coluna mais à esquerda
+            chosen[role] = max(candidates, key=lambda item: item[0])[1]
+    return tuple(chosen.get(role) for role in ('titulo', 'autor', 'doi', 'isbn', 'ano'))
+
+
+def is_header_row(values):
+    """
+    Indica se a primeira linha é cabeçalho ou já é um registro
+
+    DOI, ano ou ISBN nunca são nomes de coluna; um nome curto com palavra
+    acadêmica ('title', 'autor') confirma o cabeçalho; frases longas e
+    nomes de autor ('Silva, J.') indicam arquivo sem cabeçalho.
+    """
+    texts = [str(value).strip() for value in values if not pd.isna(value) and str(value).strip()]
+    if not texts:
+        return True
+    texts = pd.Series(texts, dtype=object)
+    if (_is_year(texts) | _is_isbn(texts)).any() or normalize_doi(texts).notna().any():
+        return False
+    words = texts.str.split().str.len()
+    if any(count <= 4 and is_academic_column(text) for text, count in zip(texts, words)):
+        return True
+    return not ((words >= 5) | (_is_name(texts) & texts.str.contains(',', regex=False))).any()
@@ -0,0 +1,148 @@
+"""
+Resolução de Duplicados - Analisador de Artigos v2.0
+Uma linha canônica por grupo, com campos completados pelas demais, gravada em disco
+"""
+
+import numpy as np
+import pandas as pd
+
+from columns import find_year_column
+
+
+# Regras de escolha da linha canônica, da mais para a menos importante
+RESOLVE_RULES = {
+    'primeiro': "primeira ocorrência no arquivo",
+    'completo': "registro com mais campos preenchidos",
+    'doi': "registro com DOI informado",
+    'recente': "ano de publicação mais recente",
+}
+DEFAULT_RULES = ('doi', 'completo', 'primeiro')
+WRITE_BLOCK_ROWS = 200_000   # Linhas gravadas por vez no arquivo limpo
+
+
+def parse_rules(text):
+    """Converte 'doi,completo,recente' na tupla de regras, validando os nomes"""
+    rules = tuple(rule.strip().lower() for rule in text.split(',') if rule.strip())
+    unknown = [rule for rule in rules if rule not in RESOLVE_RULES]
+    if unknown:
+        raise ValueError(
+            f"Regra desconhecida: {', '.join(unknown)} (use {', '.join(RESOLVE_RULES)})"
+        )
+    return rules
+
+
+def _rule_scores(df, rule, doi_col):
+    """Pontuação por linha para uma regra; maior é melhor"""
+    if rule == 'completo':
+        return df.notna().sum(axis=1).to_numpy()
+    if rule == 'doi':
+        if not doi_col:
+            return np.zeros(len(df), dtype=np.int64)
+        return df[doi_col].notna().to_numpy().astype(np.int64)
+    if rule == 'recente':
+        year_col = find_year_column(df.columns)
+        if not year_col:
+            return np.zeros(len(df), dtype=np.int64)
+        years = df[year_col].astype(str).str.extract(r'(\d{4})', expand=False)
+        return pd.to_numeric(years, errors='coerce').fillna(0).astype(np.int64).to_numpy()
+    # 'primeiro': a ordem original já desempata no fim
+    return np.zeros(len(df), dtype=np.int64)
+
+
+def priority_order(df, codes, rules, doi_col=None):
+    """
+    Ordem das linhas: por grupo e, dentro dele, da melhor para a pior
+
+    np.lexsort usa a última chave como principal: grupo, depois as regras
+    na ordem informada e, por último, a posição original.
+    """
+    sort_keys = [np.arange(len(df))]
+    for rule in reversed(rules):
+        sort_keys.append(-_rule_scores(df, rule, doi_col))
+    sort_keys.append(codes)
+    return np.lexsort(sort_keys)
+
+
+def resolve_duplicates(result, rules=DEFAULT_RULES, merge_fields=True):
+    """
+    Tabela limpa com uma linha por grupo de duplicados
+
+    A linha canônica de cada grupo é a melhor segundo as regras; com
+    merge_fields, campos vazios nela são preenchidos com o primeiro valor
+    não vazio das outras linhas do grupo, na mesma ordem de prioridade.
+    As linhas sem título (fora da detecção) passam sem alteração. As
+    linhas saem na ordem do arquivo, cada grupo na posição da sua primeira
+    ocorrência, com todas as colunas originais.
+    """
+    df = result.df
+    codes = np.asarray(result.codes)
+    duplicated = result.duplicated.to_numpy()
+    # Posição no arquivo (rótulo da linha) da primeira ocorrência de cada grupo
+    _, first_rows = np.unique(codes, return_index=True)
+    first_labels = df.index.to_numpy()[first_rows]
+
+    # Linhas sem duplicado passam direto; só os grupos são resolvidos
+    singles = df[~duplicated]
+    single_codes = codes[~duplicated]
+
+    group_rows = df[duplicated]
+    group_codes = codes[duplicated]
+    order = priority_order(group_rows, group_codes, rules, result.doi_col)
+    ordered = group_rows.iloc[order]
+    ordered_codes = group_codes[order]
+
+    if merge_fields:
+        # groupby().first() pega o primeiro valor não vazio de cada coluna
+        resolved = ordered.groupby(ordered_codes, sort=False).first()
+        resolved_codes = resolved.index.to_numpy()
+    else:
+        first = np.concatenate([[True], ordered_codes[1:] != ordered_codes[:-1]]) \
+            if len(ordered_codes) else np.zeros(0, dtype=bool)
+        resolved = ordered[first]
+        resolved_codes = ordered_codes[first]
+
+    cleaned = pd.concat(
+        [singles, resolved.set_axis(range(len(resolved))), result.untitled], ignore_index=True
+    )
+    positions = np.concatenate([
+        first_labels[single_codes], first_labels[resolved_codes],
+        result.untitled.index.to_numpy(),
+    ])
+    return cleaned.iloc[np.argsort(positions, kind='stable')].reset_index(drop=True)
+
+
+def _restore_integers(df):
+    """
+    Volta a inteiro as colunas numéricas que só viraram float por ter vazios
+
+    Sem isso um ano '2019' lido de uma coluna com células vazias seria
+    gravado como '2019.0'.
+    """
+    df = df.copy()
+    for col in df.columns:
+        values = df[col]
+        if values.dtype.kind == 'f':
+            present = values.dropna()
+            if len(present) and (present % 1 == 0).all():
+                df[col] = values.astype('Int64')
+    return df
+
+
+def write_dataset(df, file_path, encoding='utf-8'):
+    """Grava a tabela em blocos, com todas as colunas"""
+    df = _restore_integers(df)
+    with open(file_path, 'w', encoding=encoding, newline='') as f:
+        for start in range(0, max(len(df), 1), WRITE_BLOCK_ROWS):
+            df.iloc[start:start + WRITE_BLOCK_ROWS].to_csv(f, index=False, header=start == 0)
+
+
+def resolve_to_file(result, file_path, rules=DEFAULT_RULES, merge_fields=True):
+    """
+    Resolve os duplicados e grava a tabela limpa; retorna (linhas antes, linhas depois)
+
+    As duas contagens incluem as linhas sem título, então a diferença é
+    exatamente o número de duplicados removidos.
+    """
+    cleaned = resolve_duplicates(result, rules, merge_fields)
+    write_dataset(cleaned, file_path)
+    return len(result.df) + result.untitled_count, len(cleaned)
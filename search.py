@@ -0,0 +1,161 @@
+"""
+Busca nos Resultados - Analisador de Artigos v2.0
+Índice invertido de palavras montado uma vez por análise
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from accents import strip_accents_series
+from columns import find_year_column
+
+
+SUBSTRING_MIN_CHARS = 3        # Termos menores só casam com o início das palavras
+
+_TOKEN = re.compile(r'\w+')
+_SEPARATORS = re.compile(r'\W+')
+_QUERY_FIELD = re.compile(r'(autor|author|ano|year):(\S+)', re.IGNORECASE)
+_YEAR_RANGE = re.compile(r'^(\d{4})(?:-(\d{4}))?$')
+
+
+def fold_series(values):
+    """Minúsculas e sem acentos, para comparar 'Análise' com 'analise'"""
+    values = pd.Series(values, dtype=object).fillna('').astype(str).str.lower()
+    return strip_accents_series(values)
+
+
+def fold_text(text):
+    return fold_series([text]).iloc[0]
+
+
+class TokenIndex:
+    """
+    Índice invertido palavra -> linhas, em formato compacto
+
+    Os textos repetidos (autores, sobretudo) são indexados uma única vez.
+    As palavras distintas ficam em ordem alfabética em vocabulary e os
+    textos de cada palavra ficam contíguos em postings, entre offsets[i] e
+    offsets[i+1]. O vocabulário também é guardado como uma única string,
+    onde uma busca por trecho encontra as palavras sem percorrê-las uma a uma.
+    """
+
+    def __init__(self, texts):
+        self.row_codes, unique_texts = pd.factorize(pd.Series(texts, dtype=object).fillna(''))
+        tokens = fold_series(unique_texts).str.split(_SEPARATORS).explode()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+
+        token_codes, vocabulary = pd.factorize(tokens)
+        vocabulary = np.asarray(vocabulary, dtype=object)
+        alphabetical = np.argsort(vocabulary)
+        rank = np.empty(len(vocabulary), dtype=np.intp)
+        rank[alphabetical] = np.arange(len(vocabulary))
+        token_codes = rank[token_codes]
+
+        order = np.argsort(token_codes, kind='stable')
+        self.vocabulary = vocabulary[alphabetical]
+        self.postings = tokens.index.to_numpy()[order]
+        self.offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(token_codes, minlength=len(vocabulary)))]
+        )
+        self.text_count = len(unique_texts)
+
+        # Palavras separadas por '\n': a posição de um trecho na string
+        # indica a palavra que o contém
+        self._joined = '\n'.join(self.vocabulary) + '\n'
+        lengths = np.fromiter((len(token) + 1 for token in self.vocabulary), dtype=np.int64,
+                              count=len(self.vocabulary))
+        self._starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    def _tokens_containing(self, term):
+        """Ids das palavras que contêm o termo"""
+        if len(term) < SUBSTRING_MIN_CHARS:
+            # Busca binária no vocabulário ordenado
+            start = np.searchsorted(self.vocabulary, term)
+            end = np.searchsorted(self.vocabulary, term + '\uffff')
+            return np.arange(start, end)
+
+        found = [match.start() for match in re.finditer(re.escape(term), self._joined)]
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.searchsorted(self._starts, found, side='right') - 1)
+
+    def rows_matching(self, term):
+        """Máscara das linhas com alguma palavra que contém o termo (já normalizado)"""
+        token_ids = self._tokens_containing(term)
+        starts = self.offsets[token_ids]
+        lengths = self.offsets[token_ids + 1] - starts
+        # Concatena os trechos de postings de todas as palavras sem laço em Python
+        steps = np.ones(int(lengths.sum()), dtype=np.int64)
+        boundaries = np.cumsum(lengths)[:-1]
+        steps[0:1] = starts[:1]
+        steps[boundaries] = starts[1:] - (starts[:-1] + lengths[:-1]) + 1
+        texts = np.zeros(self.text_count, dtype=bool)
+        texts[self.postings[np.cumsum(steps)]] = True
+        return texts[self.row_codes]
+
+
+class ResultSearch:
+    """
+    Busca na lista completa e nos duplicados de uma análise
+
+    A consulta aceita palavras livres (título ou autor) e os filtros
+    'autor:silva' e 'ano:2020' ou 'ano:2018-2020'; todos os critérios
+    precisam ser atendidos.
+    """
+
+    def __init__(self, result, titles=None):
+        self.titles = result.all_titles() if titles is None else titles
+        self.duplicated = result.duplicated.to_numpy()
+        self._duplicate_rank = np.cumsum(self.duplicated) - 1
+        self.title_index = TokenIndex(result.df[result.title_col])
+        self.author_index = TokenIndex(result.df[result.author_col]) if result.author_col else None
+
+        year_col = find_year_column(result.df.columns)
+        self.years = None
+        if year_col:
+            years = result.df[year_col].astype(str).str.extract(r'(\d{4})', expand=False)
+            self.years = pd.to_numeric(years, errors='coerce').fillna(0).astype(int).to_numpy()
+
+    def _year_rows(self, text):
+        """Máscara das linhas com ano no intervalo ('2020' ou '2018-2020')"""
+        match = _YEAR_RANGE.match(text)
+        if not match or self.years is None:
+            return np.zeros(len(self.titles), dtype=bool)
+        first = int(match.group(1))
+        last = int(match.group(2) or first)
+        return (self.years >= first) & (self.years <= last)
+
+    def search(self, query):
+        """Posições (na lista completa) das linhas que atendem à consulta, ou None sem consulta"""
+        criteria = []
+        for field, value in _QUERY_FIELD.findall(query):
+            if field.lower() in ('ano', 'year'):
+                criteria.append(self._year_rows(value))
+            elif self.author_index is not None:
+                for term in _TOKEN.findall(fold_text(value)):
+                    criteria.append(self.author_index.rows_matching(term))
+            else:
+                criteria.append(np.zeros(len(self.titles), dtype=bool))
+
+        for term in _TOKEN.findall(fold_text(_QUERY_FIELD.sub(' ', query))):
+            matched = self.title_index.rows_matching(term)
+            if self.author_index is not None:
+                matched |= self.author_index.rows_matching(term)
+            criteria.append(matched)
+
+        if not criteria:
+            return None
+        matched = criteria[0]
+        for other in criteria[1:]:
+            matched = matched & other
+        return np.flatnonzero(matched)
+
+    def split(self, rows):
+        """
+        Separa as posições encontradas nas duas listas
+
+        Retorna (posições na lista completa, posições na lista de duplicados).
+        """
+        return rows, self._duplicate_rank[rows[self.duplicated[rows]]]
@@ -0,0 +1,408 @@
+"""
+Serviço HTTP Local - Analisador de Artigos v2.0
+Expõe o motor de análise para outras ferramentas, com fila de tarefas limitada
+
+Rotas:
+    POST   /jobs?nome=lista.csv        envia o arquivo (corpo da requisição)
+    GET    /jobs/<id>                  situação da tarefa
+    GET    /jobs/<id>/lista.csv        lista completa
+    GET    /jobs/<id>/duplicados.csv   duplicados
+    GET    /jobs/<id>/resumo.json      resumo da análise
+    DELETE /jobs/<id>                  remove a tarefa e seus arquivos
+    GET    /health                     situação do serviço
+"""
+
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from exporters import DUPLICATES_SUFFIX, LIST_SUFFIX, SUMMARY_SUFFIX, output_path
+from watcher import SUPPORTED_SUFFIXES, process_file
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 64
+JOB_TTL_SECONDS = 60 * 60     # Tarefas concluídas (e seus arquivos) ficam disponíveis por 1 hora
+MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+STREAM_CHUNK = 64 * 1024
+DOWNLOADS = {
+    'lista.csv': (LIST_SUFFIX, 'text/csv; charset=utf-8'),
+    'duplicados.csv': (DUPLICATES_SUFFIX, 'text/csv; charset=utf-8'),
+    'resumo.json': (SUMMARY_SUFFIX, 'application/json; charset=utf-8'),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """A fila de tarefas atingiu o limite"""
+
+
+class Job:
+    """Uma análise enviada ao serviço"""
+
+    def __init__(self, job_id, folder, filename):
+        self.id = job_id
+        self.folder = Path(folder)
+        self.input_path = self.folder / filename
+        self.status = 'na_fila'
+        self.summary = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'arquivo': self.input_path.name,
+            'status': self.status,
+            'resumo': self.summary,
+            'erro': self.error,
+            'criado_em': self.created_at,
+            'concluido_em': self.finished_at,
+        }
+
+
+class AnalysisService:
+    """
+    Fila de tarefas com pool de processos
+
+    Cada tarefa ocupa uma vaga desde o envio até o término; com todas as
+    vagas ocupadas, novos envios são recusados em vez de acumular trabalho.
+    Tarefas concluídas há mais de job_ttl segundos são removidas com seus
+    arquivos. Um processo do pool encerrado à força (ex.: falta de
+    memória) faz o pool ser recriado; só a tarefa afetada falha.
+    """
+
+    def __init__(self, work_dir=None, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 max_upload=MAX_UPLOAD_BYTES, job_ttl=JOB_TTL_SECONDS):
+        self.work_dir = Path(work_dir or tempfile.mkdtemp(prefix='analisador-'))
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_upload = max_upload
+        self.job_ttl = job_ttl
+
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._queue = queue.Queue()
+        self._executor = None
+        self._threads = []
+
+    def start(self):
+        """Inicia o pool de processos e as threads que consomem a fila"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Encerra as threads e o pool"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def reserve(self):
+        """Reserva uma vaga na fila; levanta QueueFull se não houver"""
+        self.expire_jobs()
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull()
+
+    def release(self):
+        """Libera uma vaga reservada"""
+        self._slots.release()
+
+    def create_job(self, filename, stream, length):
+        """Grava o arquivo enviado em blocos e coloca a tarefa na fila (vaga já reservada)"""
+        job_id = uuid.uuid4().hex
+        folder = self.work_dir / job_id
+        folder.mkdir()
+        job = Job(job_id, folder, filename)
+
+        remaining = length
+        with open(job.input_path, 'wb') as f:
+            while remaining > 0:
+                chunk = stream.read(min(STREAM_CHUNK, remaining))
+                if not chunk:
+                    shutil.rmtree(folder, ignore_errors=True)
+                    raise ConnectionError("Envio interrompido antes do fim do arquivo")
+                f.write(chunk)
+                remaining -= len(chunk)
+
+        with self._lock:
+            self._jobs[job_id] = job
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id):
+        self.expire_jobs()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def expire_jobs(self, now=None):
+        """Remove as tarefas concluídas há mais de job_ttl segundos; retorna quantas"""
+        limit = (time.time() if now is None else now) - self.job_ttl
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and job.finished_at <= limit
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(job.folder, ignore_errors=True)
+        return len(expired)
+
+    def delete(self, job_id):
+        """Remove uma tarefa concluída e seus arquivos"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in ('na_fila', 'processando'):
+                return False
+            del self._jobs[job_id]
+        shutil.rmtree(job.folder, ignore_errors=True)
+        return True
+
+    def stats(self):
+        self.expire_jobs()
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'tarefas': len(statuses),
+            'na_fila': statuses.count('na_fila'),
+            'processando': statuses.count('processando'),
+            'processos': self.workers,
+            'limite_fila': self.queue_size,
+        }
+
+    def _worker(self):
+        """Consome a fila executando cada análise no pool de processos"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            job.status = 'processando'
+            try:
+                _, summary, error = self._run(job)
+            except Exception as e:
+                summary, error = None, str(e)
+
+            job.summary = summary
+            job.error = error
+            job.status = 'erro' if error else 'concluido'
+            job.finished_at = time.time()
+            self.release()
+            logger.info("Tarefa %s: %s", job.id, job.status)
+
+    def _run(self, job):
+        """
+        Executa a análise da tarefa no pool de processos
+
+        Quando um processo morre, as tarefas em andamento no pool recebem
+        BrokenProcessPool. A primeira a perceber recria o pool e falha; as
+        demais, e as enviadas a um pool que já estava quebrado, são
+        reenviadas ao pool novo.
+        """
+        for attempt in range(2):
+            executor = self._executor
+            try:
+                future = executor.submit(process_file, str(job.input_path), False)
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+                continue
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                if self._replace_executor(executor) or attempt:
+                    break
+        logger.error("Processo de análise encerrado na tarefa %s; pool recriado", job.id)
+        return None, None, "O processo de análise foi encerrado (memória insuficiente?)"
+
+    def _replace_executor(self, broken):
+        """Troca o pool quebrado por um novo; False se outra thread já o trocou"""
+        with self._lock:
+            if self._executor is not broken:
+                return False
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        broken.shutdown(wait=False)
+        return True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Rotas HTTP do serviço"""
+
+    server_version = 'AnalisadorArtigos/2.0'
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, headers=None):
+        self._send_json(status, {'erro': message}, headers)
+
+    def _send_file(self, path, content_type):
+        size = os.path.getsize(path)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, STREAM_CHUNK)
+
+    def _route(self):
+        """Partes do caminho da URL, sem a query"""
+        return [part for part in urlparse(self.path).path.split('/') if part]
+
+    def do_GET(self):
+        parts = self._route()
+
+        if parts == ['health']:
+            self._send_json(200, {'status': 'ok', **self.service.stats()})
+            return
+
+        if len(parts) < 2 or parts[0] != 'jobs':
+            self._send_error(404, "Rota não encontrada")
+            return
+
+        job = self.service.get(parts[1])
+        if job is None:
+            self._send_error(404, "Tarefa não encontrada")
+            return
+
+        if len(parts) == 2:
+            self._send_json(200, job.to_dict())
+            return
+
+        download = DOWNLOADS.get(parts[2]) if len(parts) == 3 else None
+        if download is None:
+            self._send_error(404, "Rota não encontrada")
+            return
+        if job.status != 'concluido':
+            self._send_error(409, f"Tarefa ainda não concluída (status: {job.status})")
+            return
+
+        suffix, content_type = download
+        self._send_file(output_path(job.input_path, suffix), content_type)
+
+    def do_POST(self):
+        if self._route() != ['jobs']:
+            self._send_error(404, "Rota não encontrada")
+            return
+
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self.close_connection = True
+            self._send_error(411, "Informe o cabeçalho Content-Length")
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_error(400, "Content-Length inválido")
+            return
+
+        name = parse_qs(urlparse(self.path).query).get('nome', ['lista.csv'])[0]
+        filename = Path(name).name
+        if not filename.lower().endswith(SUPPORTED_SUFFIXES):
+            self.close_connection = True
+            self._send_error(400, f"Formato não suportado: {filename}")
+            return
+        if length > self.service.max_upload:
+            self.close_connection = True
+            self._send_error(413, "Arquivo maior que o limite do serviço")
+            return
+
+        try:
+            self.service.reserve()
+        except QueueFull:
+            # O corpo não é lido: a conexão é encerrada após a resposta
+            self.close_connection = True
+            self._send_error(503, "Fila de tarefas cheia, tente novamente", {'Retry-After': '5'})
+            return
+
+        try:
+            job = self.service.create_job(filename, self.rfile, length)
+        except Exception as e:
+            self.service.release()
+            self.close_connection = True
+            self._send_error(400, f"Erro ao receber arquivo: {e}")
+            return
+
+        self._send_json(202, job.to_dict(), {'Location': f'/jobs/{job.id}'})
+
+    def do_DELETE(self):
+        parts = self._route()
+        if len(parts) != 2 or parts[0] != 'jobs':
+            self._send_error(404, "Rota não encontrada")
+            return
+        if self.service.get(parts[1]) is None:
+            self._send_error(404, "Tarefa não encontrada")
+            return
+        if not self.service.delete(parts[1]):
+            self._send_error(409, "Tarefa em andamento não pode ser removida")
+            return
+        self._send_json(200, {'removido': parts[1]})
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """Servidor HTTP com referência ao serviço de análise"""
+
+    daemon_threads = True
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), _RequestHandler)
+        self.service = service
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+          work_dir=None, job_ttl=JOB_TTL_SECONDS):
+    """Executa o serviço até ser interrompido"""
+    service = AnalysisService(
+        work_dir=work_dir, workers=workers, queue_size=queue_size, job_ttl=job_ttl
+    )
+    service.start()
+    server = AnalysisServer(service, host, port)
+    logger.info(
+        "Serviço em http://%s:%s (%s processos, fila de %s tarefas, pasta %s)",
+        host, server.server_address[1], service.workers, queue_size, service.work_dir
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.stop()
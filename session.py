@@ -0,0 +1,205 @@
+"""
+Sessões Salvas - Analisador de Artigos v2.0
+Grava uma análise concluída em pasta colunar e a reabre sem reler o arquivo original
+"""
+
+import json
+import shutil
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analysis import AnalysisResult
+from bibliometrics import BibliometricStats
+from loaders import HAS_PYARROW, LoadInfo
+
+
+SESSION_VERSION = 2      # Versão 1 gravava pickle, que não é mais aberto
+SESSION_SUFFIX = '.sessao'
+MANIFEST_NAME = 'manifesto.json'
+
+
+class SessionError(Exception):
+    """Pasta de sessão ausente, incompleta ou de versão diferente"""
+
+
+def _write_frame(df, folder, name):
+    """
+    Grava uma tabela em Parquet, ou em CSV quando o pyarrow não está
+    instalado ou não aceita os tipos da coluna; retorna o nome do arquivo
+
+    Nunca em pickle: abrir uma sessão recebida de outra pessoa não pode
+    executar código.
+    """
+    if HAS_PYARROW:
+        try:
+            df.to_parquet(folder / f'{name}.parquet', index=False)
+            return f'{name}.parquet'
+        except (TypeError, ValueError):
+            # Colunas com tipos misturados (comuns no Excel)
+            pass
+    df.to_csv(folder / f'{name}.csv', index=False, encoding='utf-8')
+    return f'{name}.csv'
+
+
+def _read_frame(folder, file_name):
+    """Lê uma tabela gravada por _write_frame (CSV volta com colunas de texto)"""
+    path = folder / file_name
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    if path.suffix == '.csv':
+        return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[''],
+                           encoding='utf-8')
+    raise SessionError(f"Formato de tabela não aceito na sessão: {file_name}")
+
+
+def _clear_folder(folder):
+    """
+    Esvazia a pasta de uma sessão que será regravada
+
+    Só apaga pastas que são sessões (com manifesto) ou estão vazias; uma
+    pasta qualquer terminada em .sessao não é removida.
+    """
+    if not folder.exists():
+        return
+    if not folder.is_dir() or not ((folder / MANIFEST_NAME).is_file() or not any(folder.iterdir())):
+        raise SessionError(
+            f"{folder.name} já existe e não é uma sessão salva; escolha outro nome."
+        )
+    shutil.rmtree(folder)
+
+
+def session_path(path):
+    """Caminho da pasta de sessão, com a extensão .sessao"""
+    path = Path(path)
+    return path if path.suffix == SESSION_SUFFIX else path.with_name(path.name + SESSION_SUFFIX)
+
+
+def save_session(result, path, source_path=None, options=None):
+    """
+    Grava o estado da análise em uma pasta de sessão
+
+    A tabela e as chaves distintas ficam em Parquet (ou CSV); códigos e
+    contagens do índice em .npy e as estatísticas em JSON; as linhas sem
+    título, quando há, em uma tabela à parte. As chaves por linha não são
+    gravadas: são refeitas a partir dos códigos. O manifesto é gravado
+    por último, então uma pasta sem ele é uma gravação interrompida.
+    """
+    folder = session_path(path)
+    _clear_folder(folder)
+    folder.mkdir(parents=True)
+
+    files = {
+        'tabela': _write_frame(result.df, folder, 'tabela'),
+        'chaves': _write_frame(pd.DataFrame({'chave': np.asarray(result.uniques, dtype=object)}),
+                               folder, 'chaves'),
+        'linhas': 'linhas.npy',
+        'codigos': 'codigos.npy',
+        'contagens': 'contagens.npy',
+    }
+    # Rótulos originais das linhas (as sem título foram removidas na análise)
+    np.save(folder / files['linhas'], result.df.index.to_numpy(dtype=np.int64))
+    np.save(folder / files['codigos'], np.asarray(result.codes))
+    np.save(folder / files['contagens'], np.asarray(result.counts))
+    if result.untitled_count:
+        # Linhas sem título: fora da detecção, mas voltam na tabela limpa
+        files['sem_titulo'] = _write_frame(result.untitled, folder, 'sem_titulo')
+        files['linhas_sem_titulo'] = 'linhas_sem_titulo.npy'
+        np.save(folder / files['linhas_sem_titulo'], result.untitled.index.to_numpy(dtype=np.int64))
+    if result.has_statistics:
+        files['estatisticas'] = 'estatisticas.json'
+        with open(folder / files['estatisticas'], 'w', encoding='utf-8') as f:
+            json.dump(result.statistics().to_dict(), f, ensure_ascii=False)
+
+    manifest = {
+        'version': SESSION_VERSION,
+        'criada_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'arquivo': str(source_path) if source_path else None,
+        'opcoes': options or {},
+        'colunas': {
+            'titulo': result.title_col,
+            'autor': result.author_col,
+            'doi': result.doi_col,
+            'isbn': result.isbn_col,
+        },
+        'row_count': result.row_count,
+        'total': result.total_count,
+        'duplicados': result.duplicate_count,
+        'load_info': asdict(result.load_info) if result.load_info else None,
+        'arquivos': files,
+    }
+    with open(folder / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return folder
+
+
+def read_manifest(path):
+    """Lê e valida o manifesto de uma pasta de sessão"""
+    folder = Path(path)
+    try:
+        with open(folder / MANIFEST_NAME, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise SessionError(f"{folder.name} não é uma sessão salva (manifesto ausente).")
+    except ValueError:
+        raise SessionError(f"O manifesto de {folder.name} está corrompido.")
+
+    if manifest.get('version') != SESSION_VERSION:
+        raise SessionError(f"{folder.name} foi salva por outra versão do analisador.")
+    return manifest
+
+
+def load_session(path):
+    """
+    Reabre uma sessão salva; retorna (resultado, manifesto)
+
+    Códigos e contagens são mapeados do disco (np.load com mmap) e as
+    chaves por linha são refeitas a partir deles; o arquivo original não
+    é aberto. Nenhum arquivo da pasta é lido com pickle.
+    """
+    folder = Path(path)
+    manifest = read_manifest(folder)
+    files = manifest['arquivos']
+
+    df = _read_frame(folder, files['tabela'])
+    df.index = pd.Index(np.load(folder / files['linhas'], allow_pickle=False))
+    uniques = pd.Index(_read_frame(folder, files['chaves'])['chave'].to_numpy(dtype=object))
+    codes = np.load(folder / files['codigos'], mmap_mode='r', allow_pickle=False)
+    counts = np.load(folder / files['contagens'], mmap_mode='r', allow_pickle=False)
+    keys = pd.Series(np.asarray(uniques, dtype=object)[codes], index=df.index, dtype=object)
+
+    roles = manifest['colunas']
+    info = manifest['load_info']
+    load_info = LoadInfo(
+        'sessão', f"salva em {manifest['criada_em']}",
+        info['file_size'] if info else 0,
+        info['available_memory'] if info else None,
+        info['cpu_count'] if info else 1,
+        info['encoding'] if info else None
+    )
+    statistics = None
+    if 'estatisticas' in files:
+        with open(folder / files['estatisticas'], encoding='utf-8') as f:
+            statistics = BibliometricStats.from_dict(json.load(f))
+    untitled = None
+    if 'sem_titulo' in files:
+        untitled = _read_frame(folder, files['sem_titulo'])
+        untitled.index = pd.Index(np.load(folder / files['linhas_sem_titulo'], allow_pickle=False))
+    result = AnalysisResult(
+        df, roles['titulo'], roles['autor'], roles['doi'], roles['isbn'],
+        keys, codes, uniques, counts, load_info, manifest['row_count'],
+        statistics=statistics, untitled=untitled
+    )
+    return result, manifest
+
+
+def describe_session(manifest):
+    """Texto curto sobre a sessão para o usuário"""
+    source = manifest['arquivo'] or "arquivo não informado"
+    return (
+        f"Sessão de {manifest['criada_em']}: {source}\n"
+        f"{manifest['total']:,} registros, {manifest['duplicados']:,} duplicados"
+    )
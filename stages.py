@@ -0,0 +1,181 @@
+"""
+Grafo de Estágios - Analisador de Artigos v2.0
+Análise em estágios memorizados: ao mudar uma opção, só o que depende dela é refeito
+"""
+
+import os
+from collections import OrderedDict
+
+from analysis import (
+    AnalysisResult, detect_columns, read_table, remember_columns, split_untitled
+)
+from authors import normalize_authors
+from bibliometrics import compute_statistics
+from dedupe import combine_keys, index_keys, join_text, normalize_doi, normalize_isbn
+from store import RowTexts
+
+
+MEMO_PER_STAGE = 2     # Resultados guardados por estágio (ex.: com e sem normalização)
+# Estágios que guardam a tabela inteira: só a última fica na memória
+MEMO_LIMITS = {'carregar': 1, 'linhas': 1}
+AUTO = 'auto'          # Coluna de autores detectada automaticamente
+
+# Ordem dos estágios; cada um depende apenas dos anteriores
+STAGES = (
+    'carregar', 'colunas', 'linhas', 'titulos', 'autores', 'identificadores',
+    'chaves', 'duplicados', 'formatar', 'estatisticas', 'resultado',
+)
+
+
+def source_token(file_path, sheet=None, row_filter=None):
+    """
+    Identifica o conteúdo lido: caminho, aba, tamanho, data de modificação
+    e filtro de leitura (outro filtro é outra tabela)
+    """
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), sheet, stat.st_size, stat.st_mtime_ns, row_filter or None)
+
+
+class StageGraph:
+    """
+    Análise como uma cadeia de estágios com intermediários memorizados
+
+    carregar → colunas (validação e detecção) → linhas → títulos, autores
+    e identificadores normalizados → chaves → duplicados → formatar.
+    Cada estágio guarda seus últimos resultados chaveados pelas entradas
+    (arquivo, colunas e opções que o afetam); run() só executa os
+    estágios cujas entradas mudaram. Trocar a normalização de autores, por
+    exemplo, refaz autores, chaves e duplicados, mas não relê o arquivo
+    nem recodifica os títulos.
+    """
+
+    def __init__(self):
+        self._memo = {stage: OrderedDict() for stage in STAGES}
+        self.last_run = []   # Estágios executados na última chamada de run()
+
+    def _stage(self, stage, inputs, compute):
+        memo = self._memo[stage]
+        if inputs in memo:
+            memo.move_to_end(inputs)
+            return memo[inputs]
+        value = compute()
+        self._store(stage, inputs, value)
+        self.last_run.append(stage)
+        return value
+
+    def _store(self, stage, inputs, value):
+        memo = self._memo[stage]
+        if stage == 'resultado':
+            # Cada resultado prende a sua tabela; os de outra tabela saem
+            for key in [key for key, kept in memo.items() if kept.df is not value.df]:
+                del memo[key]
+        memo[inputs] = value
+        memo.move_to_end(inputs)
+        while len(memo) > MEMO_LIMITS.get(stage, MEMO_PER_STAGE):
+            memo.popitem(last=False)
+
+    def clear(self):
+        for memo in self._memo.values():
+            memo.clear()
+
+    def seed(self, result, file_path, sheet=None, normalize_author=True, row_filter=None):
+        """
+        Registra uma análise feita fora do grafo (ex.: a análise com progresso)
+
+        As próximas chamadas de run() para o mesmo arquivo partem das
+        linhas já lidas, sem reler nem revalidar o arquivo.
+        """
+        source = source_token(file_path, sheet, row_filter)
+        roles = (result.title_col, result.author_col, result.doi_col, result.isbn_col)
+        self._store('colunas', source, roles)
+        rows = (source, result.title_col)
+        self._store(
+            'linhas', rows, (result.df, result.untitled, result.load_info, result.row_count)
+        )
+        self._store('formatar', (rows, result.author_col), result.texts())
+        if result.has_statistics:
+            self._store('estatisticas', (rows, result.author_col), result.statistics())
+        self._store('resultado', (source, roles, normalize_author), result)
+
+    def detected_columns(self, file_path, sheet=None, row_filter=None):
+        """Colunas detectadas (título, autor, doi, isbn) do arquivo"""
+        source = source_token(file_path, sheet, row_filter)
+        return self._stage('colunas', source, lambda: detect_columns(self._load(source)[0]))
+
+    def _load(self, source):
+        file_path, sheet, row_filter = source[0], source[1], source[4]
+        return self._stage('carregar', source, lambda: read_table(file_path, sheet, row_filter))
+
+    def _rows(self, source, title_col):
+        def compute():
+            df, load_info = self._load(source)
+            row_count = len(df) if load_info.rows_read is None else load_info.rows_read
+            untitled, titled = split_untitled(df, title_col)
+            return titled, untitled, load_info, row_count
+        return self._stage('linhas', (source, title_col), compute)
+
+    def run(self, file_path, sheet=None, normalize_author=True, author_col=AUTO, row_filter=None):
+        """
+        Analisa o arquivo reaproveitando os estágios já calculados
+
+        author_col troca a coluna de autores detectada (None: sem autores).
+        Trocar row_filter relê o arquivo: o filtro é aplicado na leitura.
+        """
+        self.last_run = []
+        source = source_token(file_path, sheet, row_filter)
+        detected = self.detected_columns(file_path, sheet, row_filter)
+        title_col, detected_author, doi_col, isbn_col = detected
+        if author_col == AUTO:
+            author_col = detected_author
+        roles = (title_col, author_col, doi_col, isbn_col)
+
+        cached = self._memo['resultado'].get((source, roles, normalize_author))
+        if cached is not None:
+            return cached
+
+        df, untitled, load_info, row_count = self._rows(source, title_col)
+        rows = (source, title_col)
+
+        titles = self._stage(
+            'titulos', rows, lambda: df[title_col].fillna('').astype(str).str.strip()
+        )
+
+        def compute_authors():
+            if not author_col:
+                return None
+            if normalize_author:
+                return normalize_authors(df[author_col])
+            return df[author_col].fillna('').astype(str).str.strip()
+        authors = self._stage('autores', (rows, author_col, normalize_author), compute_authors)
+
+        doi, isbn = self._stage('identificadores', (rows, doi_col, isbn_col), lambda: (
+            normalize_doi(df[doi_col]) if doi_col else None,
+            normalize_isbn(df[isbn_col]) if isbn_col else None,
+        ))
+
+        key_inputs = (rows, roles, normalize_author)
+        keys = self._stage('chaves', key_inputs, lambda: combine_keys(
+            df.index, doi, isbn,
+            lambda missing: join_text(
+                titles[missing], None if authors is None else authors[missing]
+            )
+        ))
+        codes, uniques, counts = self._stage('duplicados', key_inputs, lambda: index_keys(keys))
+
+        texts = self._stage(
+            'formatar', (rows, author_col), lambda: RowTexts(df, title_col, author_col)
+        )
+        statistics = self._stage(
+            'estatisticas', (rows, author_col), lambda: compute_statistics(df, author_col)
+        )
+
+        result = AnalysisResult(
+            df, title_col, author_col, doi_col, isbn_col,
+            keys, codes, uniques, counts, load_info, row_count,
+            texts=texts, statistics=statistics, untitled=untitled
+        )
+        self._store('resultado', (source, roles, normalize_author), result)
+        self.last_run.append('resultado')
+        if roles == detected:
+            remember_columns(df.columns, roles)
+        return result
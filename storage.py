@@ -0,0 +1,60 @@
+"""
+Armazenamento Local - Analisador de Artigos v2.0
+Pasta de dados da aplicação (checkpoints, perfis e caches)
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+APP_DIR_NAME = 'AnalisadorArtigos'
+
+
+def app_data_dir(*parts):
+    """
+    Retorna (e cria) uma subpasta da área de dados da aplicação
+
+    Usa ANALISADOR_DATA_DIR quando definida; no Windows, %APPDATA%; nos
+    demais sistemas, ~/.local/share.
+    """
+    base = os.environ.get('ANALISADOR_DATA_DIR')
+    if not base:
+        if os.name == 'nt' and os.environ.get('APPDATA'):
+            base = Path(os.environ['APPDATA']) / APP_DIR_NAME
+        else:
+            base = Path.home() / '.local' / 'share' / APP_DIR_NAME
+
+    path = Path(base, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Trava exclusiva entre processos para ler-modificar-gravar um arquivo
+
+    Usa um arquivo .lock ao lado do original; a trava é do sistema
+    operacional e some sozinha se o processo morrer.
+    """
+    lock_path = Path(path).with_name(Path(path).name + '.lock')
+    with open(lock_path, 'a+b') as f:
+        if os.name == 'nt':
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,311 @@
+"""
+Resultado Compacto - Analisador de Artigos v2.0
+Resultado da análise em arrays NumPy, compartilhado por interface, exportação e linha de comando
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from dedupe import DOI_PREFIX, ISBN_PREFIX
+
+
+MISSING_AUTHOR = "Autor não informado"
+FORMAT_BLOCK_ROWS = 100_000    # Linhas formatadas por vez ao percorrer uma lista
+TIERS = ('doi', 'isbn', 'texto')
+NO_TIER = -1                   # Grupo sem duplicados: nenhuma camada casou registros
+_SEPARATOR = '\x00'            # Fecha cada texto no bloco UTF-8
+
+# Marcadores por linha em ResultStore.flags
+FLAG_DUPLICATED = 1   # Linha de um grupo com mais de um registro
+FLAG_FIRST = 2        # Primeira ocorrência do seu grupo
+FLAG_AUTHOR = 4       # Autor informado
+
+
+def index_dtype(limit):
+    """Menor tipo inteiro com sinal que guarda valores até limit"""
+    return np.int32 if limit < np.iinfo(np.int32).max else np.int64
+
+
+class LazyRows:
+    """
+    Base das listas 'título — autor' formatadas sob demanda
+
+    As subclasses informam o total de linhas (_length) e formatam um bloco
+    de linhas (_format); positions restringe a lista a algumas delas.
+    Aceita len(), índices, fatias e iteração como uma lista comum.
+    """
+
+    def __init__(self, positions=None, missing_author=None):
+        self.positions = positions
+        self.missing_author = missing_author
+
+    def _length(self):
+        raise NotImplementedError
+
+    def _format(self, rows):
+        raise NotImplementedError
+
+    def __len__(self):
+        return self._length() if self.positions is None else len(self.positions)
+
+    def _rows(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        return indices if self.positions is None else self.positions[indices]
+
+    def take(self, indices):
+        """Itens formatados nas posições indicadas, em uma única chamada"""
+        return self._format(self._rows(indices))
+
+    def subset(self, indices):
+        """Outra lista sob demanda com apenas os itens indicados"""
+        rows = copy.copy(self)
+        rows.positions = self._rows(indices)
+        return rows
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.take(range(len(self))[item])
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError(item)
+        return self.take([item])[0]
+
+    def blocks(self, size=FORMAT_BLOCK_ROWS):
+        """Percorre a lista em blocos formatados de até size itens"""
+        for start in range(0, len(self), size):
+            yield self.take(range(start, min(start + size, len(self))))
+
+    def __iter__(self):
+        for block in self.blocks():
+            yield from block
+
+
+class TextColumn:
+    """
+    Textos de uma coluna em um único bloco UTF-8
+
+    Cada texto presente ocupa data[offsets[i]:offsets[i+1]], seguido de um
+    separador; valores ausentes têm trecho vazio e ficam marcados em
+    present. Ocupa o tamanho dos textos mais um inteiro por linha (32 bits
+    enquanto o bloco tiver menos de 2 GB), sem um objeto str para cada
+    valor, e é serializado (pickle) como um único bloco de bytes.
+    """
+
+    def __init__(self, values):
+        self.present = values.notna().to_numpy()
+        texts = values[self.present].astype(str).str.strip().tolist()
+        joined = _SEPARATOR.join(texts) + _SEPARATOR if texts else ''
+        self.data = joined.encode('utf-8')
+
+        # Codificado de uma vez; os limites de cada texto são os separadores,
+        # a menos que algum texto contenha o próprio separador
+        if joined.count(_SEPARATOR) == len(texts):
+            ends = np.flatnonzero(np.frombuffer(self.data, dtype=np.uint8) == 0) + 1
+        else:
+            ends = np.cumsum([len(text.encode('utf-8')) + 1 for text in texts], dtype=np.int64)
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        offsets[1:][self.present] = np.diff(ends, prepend=0)
+        offsets = np.cumsum(offsets)
+        self.offsets = offsets.astype(index_dtype(offsets[-1]))
+
+    def __len__(self):
+        return len(self.present)
+
+    def take(self, rows, missing=None):
+        """Textos das linhas indicadas; missing no lugar dos ausentes"""
+        data = self.data
+        return [
+            data[start:end - 1].decode('utf-8') if present else missing
+            for start, end, present in zip(
+                self.offsets[rows].tolist(), self.offsets[rows + 1].tolist(),
+                self.present[rows].tolist()
+            )
+        ]
+
+
+class RowTexts:
+    """Títulos e autores de cada linha, usados para montar as listas"""
+
+    def __init__(self, df, title_col, author_col=None):
+        self.titles = TextColumn(df[title_col])
+        self.authors = TextColumn(df[author_col]) if author_col else None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def format(self, rows, missing_author=None):
+        """Linhas formatadas como 'título — autor', como analysis.format_rows"""
+        titles = self.titles.take(rows)
+        if self.authors is None:
+            return titles
+        authors = self.authors.take(rows, missing_author)
+        return [
+            title if author is None else f"{title} — {author}"
+            for title, author in zip(titles, authors)
+        ]
+
+
+class StoredRows(LazyRows):
+    """Lista sob demanda lida dos textos de um ResultStore"""
+
+    def __init__(self, texts, positions=None, missing_author=None):
+        super().__init__(positions, missing_author)
+        self.texts = texts
+
+    def _length(self):
+        return len(self.texts)
+
+    def _format(self, rows):
+        return self.texts.format(rows, self.missing_author)
+
+
+class GroupRecord:
+    """Metadados de um grupo de registros com a mesma chave"""
+
+    __slots__ = ('group', 'tier', 'size', 'positions', 'row_ids')
+
+    def __init__(self, group, tier, size, positions, row_ids):
+        self.group = group
+        self.tier = tier
+        self.size = size
+        self.positions = positions   # Posições na lista completa
+        self.row_ids = row_ids       # Linhas correspondentes na tabela lida
+
+    def __repr__(self):
+        return f"GroupRecord(grupo={self.group}, camada={self.tier!r}, registros={self.size})"
+
+
+def key_tiers(uniques, counts):
+    """
+    Camada de cada grupo, como índice em TIERS
+
+    Só as chaves de grupos com duplicados são consultadas; os demais
+    grupos ficam com NO_TIER.
+    """
+    tiers = np.full(len(counts), NO_TIER, dtype=np.int8)
+    matched = np.flatnonzero(np.asarray(counts) > 1)
+    keys = pd.Series(np.asarray(uniques, dtype=object)[matched], dtype=object)
+    tiers[matched] = TIERS.index('texto')
+    tiers[matched[keys.str.startswith(DOI_PREFIX).to_numpy(dtype=bool)]] = TIERS.index('doi')
+    tiers[matched[keys.str.startswith(ISBN_PREFIX).to_numpy(dtype=bool)]] = TIERS.index('isbn')
+    return tiers
+
+
+def tier_name(tier):
+    """Nome da camada ('doi', 'isbn', 'texto'), ou None para NO_TIER"""
+    return None if tier == NO_TIER else TIERS[tier]
+
+
+class ResultStore:
+    """
+    Resultado de uma análise em arrays, sem a tabela original
+
+    Por linha: row_ids (rótulo na tabela lida), group_ids (grupo de chave)
+    e flags (FLAG_*). Por grupo: group_sizes e group_tiers (NO_TIER nos
+    grupos de um registro só). Títulos e
+    autores ficam em RowTexts. É o que a interface exibe, o que os
+    exportadores gravam e o que os processos da análise em lote devolvem;
+    o tamanho depende só do número de linhas e do texto dos títulos.
+    """
+
+    def __init__(self, texts, row_ids, group_ids, group_sizes, group_tiers, roles,
+                 load_info=None, row_count=None):
+        self.texts = texts
+        self.row_ids = row_ids
+        self.group_ids = group_ids
+        self.group_sizes = group_sizes
+        self.group_tiers = group_tiers
+        self.title_col, self.author_col, self.doi_col, self.isbn_col = roles
+        self.load_info = load_info
+        self.row_count = len(row_ids) if row_count is None else row_count
+
+        duplicated = group_sizes[group_ids] > 1
+        first = ~pd.Series(group_ids).duplicated().to_numpy()
+        self.flags = (
+            duplicated * FLAG_DUPLICATED + first * FLAG_FIRST
+            + (texts.authors.present * FLAG_AUTHOR if texts.authors is not None else 0)
+        ).astype(np.uint8)
+        self._all_titles = None
+        self._duplicate_titles = None
+
+    @classmethod
+    def from_result(cls, result, texts=None):
+        """Monta o resultado compacto a partir de um AnalysisResult"""
+        if texts is None:
+            texts = RowTexts(result.df, result.title_col, result.author_col)
+        row_ids = result.df.index.to_numpy(dtype=np.int64)
+        return cls(
+            texts,
+            row_ids.astype(index_dtype(row_ids.max() if len(row_ids) else 0)),
+            np.asarray(result.codes).astype(index_dtype(len(result.counts))),
+            np.asarray(result.counts).astype(index_dtype(len(row_ids))),
+            key_tiers(result.uniques, result.counts),
+            (result.title_col, result.author_col, result.doi_col, result.isbn_col),
+            result.load_info, result.row_count
+        )
+
+    @property
+    def duplicated(self):
+        return (self.flags & FLAG_DUPLICATED).astype(bool)
+
+    @property
+    def total_count(self):
+        return len(self.group_ids)
+
+    @property
+    def duplicate_count(self):
+        return int(np.count_nonzero(self.flags & FLAG_DUPLICATED))
+
+    @property
+    def duplicate_group_count(self):
+        return int(np.count_nonzero(self.group_sizes > 1))
+
+    @property
+    def tiers(self):
+        """Duplicados encontrados por camada (doi, isbn, texto)"""
+        tiers = np.bincount(
+            self.group_tiers[self.group_ids[self.duplicated]], minlength=len(TIERS)
+        )
+        return {name: int(count) for name, count in zip(TIERS, tiers)}
+
+    def all_titles(self):
+        """Lista completa, formatada sob demanda"""
+        if self._all_titles is None:
+            self._all_titles = StoredRows(self.texts)
+        return self._all_titles
+
+    def duplicate_titles(self):
+        """Lista apenas dos registros duplicados, formatada sob demanda"""
+        if self._duplicate_titles is None:
+            self._duplicate_titles = StoredRows(
+                self.texts, np.flatnonzero(self.duplicated), MISSING_AUTHOR
+            )
+        return self._duplicate_titles
+
+    def group(self, group_id):
+        """Registro do grupo com as posições das suas linhas"""
+        positions = np.flatnonzero(self.group_ids == group_id)
+        return GroupRecord(
+            int(group_id), tier_name(self.group_tiers[group_id]), int(self.group_sizes[group_id]),
+            positions, self.row_ids[positions]
+        )
+
+    def duplicate_groups(self):
+        """Grupos com mais de um registro, na ordem da primeira ocorrência"""
+        positions = np.flatnonzero(self.duplicated)
+        order = positions[np.argsort(self.group_ids[positions], kind='stable')]
+        bounds = np.flatnonzero(np.diff(self.group_ids[order])) + 1
+        for rows in np.split(order, bounds) if len(order) else []:
+            group_id = int(self.group_ids[rows[0]])
+            yield GroupRecord(
+                group_id, tier_name(self.group_tiers[group_id]), len(rows), rows, self.row_ids[rows]
+            )
+
+    def largest_groups(self, n):
+        """Os n maiores grupos de duplicados, do maior para o menor"""
+        sizes = np.where(self.group_sizes > 1, self.group_sizes, 0)
+        top = np.argsort(-sizes, kind='stable')[:n]
+        return [self.group(group_id) for group_id in top if sizes[group_id] > 1]
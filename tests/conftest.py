@@ -0,0 +1,19 @@
+"""
+Configuração dos Testes - Analisador de Artigos v2.0
+Módulos da raiz no caminho de importação e pasta de dados isolada por teste
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Checkpoints e mapeamentos de colunas gravados em uma pasta temporária"""
+    folder = tmp_path / 'dados'
+    monkeypatch.setenv('ANALISADOR_DATA_DIR', str(folder))
+    return folder
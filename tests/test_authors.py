@@ -0,0 +1,33 @@
+"""
+Testes de Autores - Analisador de Artigos v2.0
+Sobrenomes compostos com 'e' e iniciais no estilo Vancouver
+"""
+
+import pytest
+
+from authors import normalize_author_list, parse_author_name, split_author_list
+
+
+@pytest.mark.parametrize('raw, names', [
+    ("Maria Silva e Souza", ["Maria Silva e Souza"]),
+    ("Silva e Souza, M.", ["Silva e Souza, M."]),
+    ("J. Silva e M. Souza", ["J. Silva", "M. Souza"]),
+    ("Silva, J. e Souza, M.", ["Silva, J.", "Souza, M."]),
+    ("Ana Silva e Souza e Pedro Lima", ["Ana Silva e Souza", "Pedro Lima"]),
+])
+def test_split_on_e_only_between_full_names(raw, names):
+    assert split_author_list(raw) == names
+
+
+@pytest.mark.parametrize('name, parsed', [
+    ("Maria Silva e Souza", ('silva e souza', 'm')),
+    ("Joao LI", ('li', 'j')),
+    ("Smith J", ('smith', 'j')),
+    ("van der Berg JA", ('van der berg', 'j')),
+])
+def test_parse_author_name(name, parsed):
+    assert parse_author_name(name) == parsed
+
+
+def test_compound_surname_matches_inverted_form():
+    assert normalize_author_list("Maria Silva e Souza") == normalize_author_list("Silva e Souza, M.")
@@ -0,0 +1,41 @@
+"""
+Testes de Checkpoint - Analisador de Artigos v2.0
+Retomada com linhas acrescentadas: mesmo resultado da análise completa, gravando só a parte nova
+"""
+
+import numpy as np
+
+from analysis import analyze_path
+from checkpoint import MANIFEST_NAME, checkpoint_folder
+
+
+def rows(start, count):
+    return [
+        f'"Estudo número {i % 7} sobre redes complexas","Silva, J.",10.1000/{i % 5}\n'
+        for i in range(start, start + count)
+    ]
+
+
+def test_resume_matches_full_analysis(tmp_path):
+    path = tmp_path / 'lista.csv'
+    path.write_text("Title,Author,DOI\n" + ''.join(rows(0, 30)), encoding='utf-8')
+    analyze_path(str(path), incremental=True)
+    folder = checkpoint_folder(path)
+    first_part = (folder / 'parte_1.pkl').stat()
+
+    for start in (30, 40):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.writelines(rows(start, 10))
+        resumed = analyze_path(str(path), incremental=True)
+        assert resumed.load_info.engine == 'incremental'
+
+    full = analyze_path(str(path))
+    assert np.array_equal(np.asarray(resumed.codes), full.codes)
+    assert np.array_equal(resumed.counts, full.counts)
+    assert resumed.keys.equals(full.keys)
+    assert resumed.df.equals(full.df)
+
+    # As partes antigas não são regravadas; cada retomada acrescenta uma
+    names = sorted(path.name for path in folder.iterdir())
+    assert names == ['contagens_3.npy', MANIFEST_NAME, 'parte_1.pkl', 'parte_2.pkl', 'parte_3.pkl']
+    assert (folder / 'parte_1.pkl').stat().st_mtime_ns == first_part.st_mtime_ns
@@ -0,0 +1,55 @@
+"""
+Testes de ISBN - Analisador de Artigos v2.0
+ISBNs numéricos (coluna com células vazias, zero à esquerda perdido) nos dois caminhos de leitura
+"""
+
+import pytest
+
+from analysis import analyze_path
+from dedupe import isbn_to_13
+
+
+ROWS = [
+    ("Introdução às redes complexas", "Silva, J."),
+    ("Redes complexas: uma introdução", "Souza, M."),
+    ("Métodos de análise bibliométrica", "Lima, A."),
+]
+
+
+def write_csv(path, isbns):
+    lines = ["Title,Author,ISBN"]
+    lines += [f'"{title}","{author}",{isbn}' for (title, author), isbn in zip(ROWS, isbns)]
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('value', [9780306406157.0, 306406152, '978-0-306-40615-7', '0306406152'])
+def test_isbn_to_13_accepts_numeric_cells(value):
+    assert isbn_to_13(value) == '9780306406157'
+
+
+@pytest.mark.parametrize('value', [float('nan'), 9780306406157.5, -306406152, True])
+def test_isbn_to_13_rejects_invalid_numbers(value):
+    assert isbn_to_13(value) is None
+
+
+@pytest.mark.parametrize('isbn', ['9780306406157', '0306406152'])
+def test_blank_isbn_cell_gives_same_result_on_both_paths(tmp_path, isbn):
+    path = write_csv(tmp_path / 'lista.csv', [isbn, isbn, ''])
+
+    plain = analyze_path(str(path))
+    progress = analyze_path(str(path), on_progress=lambda progress: None)
+
+    assert plain.duplicate_count == progress.duplicate_count == 2
+    assert plain.store().tiers == progress.store().tiers == {'doi': 0, 'isbn': 2, 'texto': 0}
+
+
+def test_appended_rows_keep_isbn_as_text(tmp_path):
+    path = write_csv(tmp_path / 'lista.csv', ['9780306406157', '', ''])
+    analyze_path(str(path), incremental=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('"Análise de citações em periódicos","Costa, R.",0306406152\n')
+
+    resumed = analyze_path(str(path), incremental=True)
+    assert resumed.load_info.engine == 'incremental'
+    assert resumed.df['ISBN'].iloc[-1] == '0306406152'
@@ -0,0 +1,66 @@
+"""
+Testes de Mapeamentos - Analisador de Artigos v2.0
+Layouts salvos só após análises completas, sem se perder entre processos
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from analysis import analyze_dataframe, analyze_path
+from mappings import (
+    SHORT_SIGNATURE, _read_all, forget_mapping, header_signature, load_mapping, save_mapping
+)
+from preview import quick_preview
+
+
+LAYOUTS = 24
+
+
+def layout(index):
+    return [f'Titulo {index}', f'Autor {index}', 'DOI']
+
+
+def save_layout(index):
+    columns = layout(index)
+    return save_mapping(columns, (columns[0], columns[1], 'DOI', None))
+
+
+def test_concurrent_saves_keep_every_layout():
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        assert all(executor.map(save_layout, range(LAYOUTS)))
+
+    layouts = _read_all()
+    assert len(layouts) == LAYOUTS
+    for index in range(LAYOUTS):
+        assert header_signature(layout(index)) in layouts
+        assert load_mapping(layout(index)) == (f'Titulo {index}', f'Autor {index}', 'DOI', None)
+
+
+def test_only_complete_analysis_saves_named_roles(tmp_path):
+    path = tmp_path / 'lista.csv'
+    path.write_text('Title,Author\n"Estudo sobre redes complexas","Silva, J."\n', encoding='utf-8')
+    quick_preview(str(path))
+    assert _read_all() == {}
+
+    analyze_path(str(path))
+    assert load_mapping(['Title', 'Author']) == ('Title', 'Author', None, None)
+
+
+def test_profiler_roles_are_not_saved(tmp_path):
+    columns = ['TI', 'AU']
+    df = pd.DataFrame({
+        'TI': [f"Estudo número {i} sobre redes complexas e grafos aleatórios" for i in range(20)],
+        'AU': ["Silva, J.; Souza, M."] * 20,
+    })
+    analyze_dataframe(df)
+    assert load_mapping(columns) is None
+
+
+def test_forget_one_layout():
+    for index in range(2):
+        save_layout(index)
+    assert forget_mapping(header_signature(layout(0))[:SHORT_SIGNATURE]) == layout(0)
+    assert load_mapping(layout(0)) is None
+    assert load_mapping(layout(1)) is not None
+    assert forget_mapping('') is None
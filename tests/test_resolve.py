@@ -0,0 +1,42 @@
+"""
+Testes da Resolução - Analisador de Artigos v2.0
+Linhas sem título passam para a tabela limpa, na posição original
+"""
+
+import pandas as pd
+
+from analysis import analyze_path
+from resolve import resolve_to_file
+from session import load_session, save_session
+
+
+def write_csv(path):
+    lines = ["Title,Author,Year"]
+    for i in range(3):
+        title = f'"Estudo sobre redes complexas número {i}","Silva, J."'
+        lines += [f"{title},20{i:02d}", f"{title},"]
+    lines.insert(3, ',"Souza, M.",2001')
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return path
+
+
+def test_untitled_rows_pass_through(tmp_path):
+    result = analyze_path(str(write_csv(tmp_path / 'a.csv')))
+    assert result.untitled_count == 1
+    assert result.total_count == 6
+
+    target = tmp_path / 'limpo.csv'
+    before, after = resolve_to_file(result, target)
+    assert (before, after) == (7, 4)
+
+    cleaned = pd.read_csv(target, dtype=str)
+    assert cleaned['Author'].tolist() == ["Silva, J.", "Souza, M.", "Silva, J.", "Silva, J."]
+    assert cleaned['Title'].isna().tolist() == [False, True, False, False]
+
+
+def test_session_keeps_untitled_rows(tmp_path):
+    result = analyze_path(str(write_csv(tmp_path / 'a.csv')))
+    folder = save_session(result, tmp_path / 'a')
+    loaded, _ = load_session(folder)
+    assert loaded.untitled_count == 1
+    assert loaded.untitled.index.tolist() == result.untitled.index.tolist()
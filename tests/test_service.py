@@ -0,0 +1,112 @@
+"""
+Testes do Serviço HTTP - Analisador de Artigos v2.0
+Envio, situação e download de uma tarefa em um servidor em 127.0.0.1
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import service
+from service import AnalysisServer, AnalysisService
+from watcher import process_file
+
+
+CSV = (
+    "Title,Author\n"
+    "Introdução às redes complexas,\"Silva, J.\"\n"
+    "Introdução às redes complexas,\"Silva, J.\"\n"
+    "Métodos de análise bibliométrica,\"Lima, A.\"\n"
+)
+
+
+@pytest.fixture
+def server(tmp_path):
+    analysis = AnalysisService(work_dir=tmp_path / 'tarefas', workers=1, queue_size=4)
+    analysis.start()
+    httpd = AnalysisServer(analysis, '127.0.0.1', 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    analysis.stop()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def upload(server, name='lista.csv', body=CSV.encode('utf-8')):
+    status, payload = request(server, 'POST', f'/jobs?nome={name}', body)
+    assert status == 202
+    return json.loads(payload)['id']
+
+
+def wait_for(server, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status, payload = request(server, 'GET', f'/jobs/{job_id}')
+        job = json.loads(payload)
+        if job['status'] not in ('na_fila', 'processando'):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Tarefa {job_id} não terminou")
+
+
+def test_upload_status_and_results(server):
+    job = wait_for(server, upload(server))
+    assert job['status'] == 'concluido'
+    assert job['resumo']['total'] == 3
+    assert job['resumo']['duplicados'] == 2
+
+    status, summary = request(server, 'GET', f"/jobs/{job['id']}/resumo.json")
+    assert status == 200 and json.loads(summary)['duplicados'] == 2
+    status, listing = request(server, 'GET', f"/jobs/{job['id']}/duplicados.csv")
+    assert status == 200 and 'Introdução às redes complexas' in listing.decode('utf-8-sig')
+
+
+@pytest.mark.parametrize('length', ['abc', '-5'])
+def test_invalid_content_length_is_rejected(server, length):
+    status, payload = request(server, 'POST', '/jobs?nome=lista.csv', headers={'Content-Length': length})
+    assert status == 400
+    assert 'Content-Length' in json.loads(payload)['erro']
+
+
+def test_finished_jobs_expire_with_their_files(server):
+    job = wait_for(server, upload(server))
+    folder = server.service.work_dir / job['id']
+    assert folder.exists()
+
+    server.service.job_ttl = 0
+    status, _ = request(server, 'GET', f"/jobs/{job['id']}")
+    assert status == 404
+    assert not folder.exists()
+
+
+def crash_on_request(path, incremental=True):
+    """Simula um processo encerrado pelo sistema (ex.: falta de memória)"""
+    if 'quebra' in os.path.basename(path):
+        os._exit(1)
+    return process_file(path, incremental)
+
+
+def test_dead_worker_fails_only_its_job(server, monkeypatch):
+    monkeypatch.setattr(service, 'process_file', crash_on_request)
+
+    broken = wait_for(server, upload(server, 'quebra.csv'))
+    assert broken['status'] == 'erro'
+
+    job = wait_for(server, upload(server))
+    assert job['status'] == 'concluido'
+    assert job['resumo']['duplicados'] == 2
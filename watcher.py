@@ -0,0 +1,271 @@
+"""
+Pasta Monitorada - Analisador de Artigos v2.0
+Analisa automaticamente os arquivos colocados em uma pasta (modo sem interface)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from analysis import AnalysisError, analyze_path
+from exporters import (
+    ERROR_SUFFIX, SUMMARY_SUFFIX, is_output_file, output_path, write_results_beside
+)
+from loaders import EXCEL_SUFFIXES, REFERENCE_PARSERS
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+SUPPORTED_SUFFIXES = ('.csv',) + tuple(REFERENCE_PARSERS) + EXCEL_SUFFIXES
+SETTLE_SECONDS = 2.0       # Tempo sem mudança de tamanho para considerar o arquivo completo
+POLL_INTERVAL = 1.0        # Intervalo do agendador (e da varredura, sem watchdog)
+IN_FLIGHT_PER_WORKER = 2   # Arquivos enviados ao pool por processo, no máximo
+
+logger = logging.getLogger(__name__)
+
+
+def is_candidate(path):
+    """Indica se o arquivo deve ser analisado pela pasta monitorada"""
+    name = Path(path).name
+    if name.startswith(('.', '~$')) or is_output_file(name):
+        return False
+    return name.lower().endswith(SUPPORTED_SUFFIXES)
+
+
+def process_file(path, incremental=False):
+    """
+    Analisa um arquivo e grava os resultados ao lado dele (executa no pool)
+
+    Sem checkpoint por padrão: arquivos deixados uma vez na pasta (ou
+    enviados ao serviço) não devem acumular estados na pasta de dados.
+    """
+    try:
+        # O paralelismo aqui é entre arquivos: cada análise usa um só processo
+        result = analyze_path(path, incremental=incremental, workers=1)
+        summary = write_results_beside(path, result)
+    except AnalysisError as e:
+        output_path(path, ERROR_SUFFIX).write_text(f"{e.title}: {e.message}\n", encoding='utf-8')
+        return path, None, e.message
+    except Exception as e:
+        output_path(path, ERROR_SUFFIX).write_text(f"Erro ao processar arquivo: {e}\n", encoding='utf-8')
+        return path, None, str(e)
+
+    error_file = output_path(path, ERROR_SUFFIX)
+    if error_file.exists():
+        error_file.unlink()
+    return path, summary, None
+
+
+def _results_are_current(path, stat):
+    """Indica se o resumo gravado ao lado do arquivo é posterior a ele"""
+    try:
+        return os.stat(output_path(path, SUMMARY_SUFFIX)).st_mtime >= stat.st_mtime
+    except OSError:
+        return False
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Repassa eventos do watchdog ao monitor"""
+
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.dest_path)
+
+
+class FolderWatcher:
+    """
+    Monitora uma pasta e analisa cada arquivo novo ou alterado
+
+    Usa eventos do sistema (watchdog/inotify) quando disponível, senão
+    varredura periódica. Um arquivo só é enviado depois de ficar
+    SETTLE_SECONDS sem mudar de tamanho, e no máximo
+    workers * IN_FLIGHT_PER_WORKER arquivos ficam no pool ao mesmo tempo;
+    o restante aguarda em uma fila de caminhos. Com incremental, cada
+    análise guarda um checkpoint e um CSV que só cresceu tem apenas as
+    linhas novas lidas.
+    """
+
+    def __init__(self, folder, workers=None, settle_seconds=SETTLE_SECONDS,
+                 poll_interval=POLL_INTERVAL, use_events=True, incremental=False):
+        self.folder = Path(folder)
+        self.workers = workers or os.cpu_count() or 1
+        self.incremental = incremental
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.use_events = use_events and Observer is not None
+
+        self._lock = threading.RLock()
+        self._touched = set()
+        self._watching = {}     # caminho -> (tamanho, mtime, instante da última mudança)
+        self._ready = deque()   # caminhos completos aguardando vaga no pool
+        self._done = {}         # caminho -> (tamanho, mtime) já analisado
+        self._in_flight = set()
+        self._stop = threading.Event()
+        self._executor = None
+        self._observer = None
+
+    @property
+    def max_in_flight(self):
+        return self.workers * IN_FLIGHT_PER_WORKER
+
+    def touch(self, path):
+        """Registra que o arquivo foi criado ou alterado"""
+        if is_candidate(path):
+            with self._lock:
+                self._touched.add(os.path.abspath(path))
+
+    def scan(self):
+        """Varre a pasta registrando todos os arquivos candidatos"""
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    self.touch(entry.path)
+
+    def _check_settled(self, now):
+        """Move para a fila os arquivos que pararam de crescer"""
+        with self._lock:
+            touched, self._touched = self._touched, set()
+
+        for path in touched:
+            if path not in self._watching:
+                self._watching[path] = (None, None, now)
+
+        for path, (size, mtime, changed_at) in list(self._watching.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Arquivo removido ou renomeado antes de ficar completo
+                del self._watching[path]
+                continue
+
+            current = (stat.st_size, stat.st_mtime)
+            if current != (size, mtime):
+                self._watching[path] = (*current, now)
+                continue
+
+            if now - changed_at < self.settle_seconds:
+                continue
+
+            del self._watching[path]
+            with self._lock:
+                if self._done.get(path) == current or path in self._in_flight or path in self._ready:
+                    continue
+            if _results_are_current(path, stat):
+                self._done[path] = current
+                continue
+            self._ready.append(path)
+
+    def _dispatch(self):
+        """Envia arquivos da fila ao pool, respeitando o limite de vagas"""
+        while self._ready and len(self._in_flight) < self.max_in_flight:
+            path = self._ready.popleft()
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self._in_flight.add(path)
+            future = self._submit(path)
+            future.add_done_callback(
+                lambda f, path=path, mark=(stat.st_size, stat.st_mtime): self._finished(path, mark, f)
+            )
+
+    def _submit(self, path):
+        """
+        Envia o arquivo ao pool, recriando-o se estiver quebrado
+
+        Um processo encerrado pelo sistema (ex.: falta de memória) inutiliza
+        o pool inteiro; as análises que estavam nele falham e as próximas
+        vão para um pool novo, sem derrubar o monitor.
+        """
+        try:
+            return self._executor.submit(process_file, path, self.incremental)
+        except BrokenProcessPool:
+            logger.error("Processo de análise encerrado; recriando o pool")
+            self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor.submit(process_file, path, self.incremental)
+
+    def _finished(self, path, mark, future):
+        """Registra o término de uma análise"""
+        try:
+            _, summary, error = future.result()
+        except Exception as e:
+            summary, error = None, str(e)
+
+        with self._lock:
+            self._in_flight.discard(path)
+            self._done[path] = mark
+
+        if error:
+            logger.error("Falha ao analisar %s: %s", path, error)
+        else:
+            logger.info(
+                "Analisado %s: %s registros, %s duplicados",
+                path, summary['total'], summary['duplicados']
+            )
+
+    def start(self):
+        """Inicia o pool, o observador de eventos e a varredura inicial"""
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        if self.use_events:
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), str(self.folder), recursive=False)
+            self._observer.start()
+        self.scan()
+        logger.info(
+            "Monitorando %s (%s, %s processos)", self.folder,
+            "eventos do sistema" if self._observer else "varredura periódica", self.workers
+        )
+
+    def run_once(self):
+        """Uma rodada do agendador: varredura, estabilidade e envio"""
+        if self._observer is None:
+            self.scan()
+        self._check_settled(time.monotonic())
+        with self._lock:
+            self._dispatch()
+
+    def run_forever(self):
+        """Executa o agendador até stop() ser chamado"""
+        self.start()
+        try:
+            while not self._stop.wait(self.poll_interval):
+                self.run_once()
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """Solicita a parada do agendador"""
+        self._stop.set()
+
+    def shutdown(self):
+        """Encerra o observador e aguarda as análises em andamento"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None